@@ -0,0 +1,226 @@
+"""Benchmarks of the cost of logging with pipelog.
+
+Measures log_frame across frame sizes, widths and dtype families, the overhead of track() relative to the tracked
+function, and how the views of FrameLogCollection scale with the number of logs. Results are written to a JSON
+file, which can be compared with the results of another version:
+
+    python -m benchmarks.bench_pipelog --output new.json --compare old.json
+
+Use --quick for a smaller grid, e.g. to check that the benchmarks still run.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import warnings
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import pipelog
+from pipelog import PipeLogger
+
+AGG_FUNC = ["count", "nans", "min", "max", "mean"]
+
+
+def _numeric(n_rows: int, i: int) -> pd.Series:
+    values = np.arange(n_rows) % 1000
+    return pd.Series(values.astype(np.float64) if i % 2 else values.astype(np.int64))
+
+
+def _datetime(n_rows: int, i: int) -> pd.Series:
+    values = pd.Timestamp("2021-01-01") + pd.to_timedelta(np.arange(n_rows) % 1000, unit="s")
+    return pd.Series(values.tz_localize("UTC") if i % 2 else values)
+
+
+def _string(n_rows: int, i: int) -> pd.Series:
+    values = pd.Series(np.array(["one", "two", "three"], dtype=object)[np.arange(n_rows) % 3])
+    return values.astype(pd.StringDtype()) if i % 2 else values
+
+
+def _nullable(n_rows: int, i: int) -> pd.Series:
+    values = pd.Series(np.arange(n_rows) % 1000, dtype=pd.Int64Dtype())
+    values[::10] = pd.NA
+    return values.astype(pd.Float64Dtype()) if i % 2 else values
+
+
+def _sparse(n_rows: int, i: int) -> pd.Series:
+    return pd.Series(pd.arrays.SparseArray((np.arange(n_rows) % 10 == 0).astype(np.float64), fill_value=0.0))
+
+
+def _categorical(n_rows: int, i: int) -> pd.Series:
+    return pd.Series(pd.Categorical(np.arange(n_rows) % 10))
+
+
+def _interval(n_rows: int, i: int) -> pd.Series:
+    left = np.arange(n_rows) % 100
+    return pd.Series(pd.arrays.IntervalArray.from_arrays(left, left + 1))
+
+
+# The dtype families of the fixtures in tests/conftest.py
+FAMILIES: Dict[str, Callable[[int, int], pd.Series]] = {
+    "numeric": _numeric,
+    "datetime": _datetime,
+    "string": _string,
+    "nullable": _nullable,
+    "sparse": _sparse,
+    "categorical": _categorical,
+    "interval": _interval,
+}
+
+
+def make_frame(family: str, n_rows: int, n_cols: int) -> pd.DataFrame:
+    """Frame of n_cols columns of one dtype family."""
+    return pd.DataFrame({f"{family}_{i}": FAMILIES[family](n_rows, i) for i in range(n_cols)})
+
+
+def measure(func: Callable[[], object], repeat: int, setup: Callable[[], object] = None) -> List[float]:
+    """Wall times of repeat calls of func in seconds, each after calling setup outside of the measurement."""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _result(name: str, params: dict, times: List[float], **extra) -> dict:
+    return dict(name=name, params=params, min=min(times), median=statistics.median(times), times=times, **extra)
+
+
+def bench_log_frame(shapes: List[Tuple[int, int]], repeat: int) -> List[dict]:
+    """log_frame with aggregations, dtypes, shape and column names for every family and shape (n_rows, n_cols)."""
+    results = []
+    for family in FAMILIES:
+        for n_rows, n_cols in shapes:
+            df = make_frame(family, n_rows, n_cols)
+            tracker = PipeLogger(agg_func=AGG_FUNC, dtypes=True, shape=True, column_names=True)
+            times = measure(lambda: tracker.log_frame(df), repeat, setup=tracker.reset)
+            results.append(_result("log_frame", dict(family=family, n_rows=n_rows, n_cols=n_cols), times))
+    return results
+
+
+def bench_track(sizes: List[int], n_cols: int, repeat: int) -> List[dict]:
+    """Overhead of track() relative to calling the tracked function directly."""
+    results = []
+    for n_rows in sizes:
+        df = make_frame("numeric", n_rows, n_cols)
+        tracker = PipeLogger(agg_func=AGG_FUNC, dtypes=True, shape=True, column_names=True)
+
+        def step(df: pd.DataFrame) -> pd.DataFrame:
+            return df.assign(total=df.sum(axis=1)).query("total > 0")
+
+        tracked_step = tracker.track()(step)
+        plain = measure(lambda: step(df), repeat)
+        tracked = measure(lambda: tracked_step(df), repeat, setup=tracker.reset)
+        params = dict(n_rows=n_rows, n_cols=n_cols)
+        results.append(_result("track_plain", params, plain))
+        overhead = statistics.median(tracked) / statistics.median(plain)
+        results.append(_result("track", params, tracked, overhead=overhead))
+    return results
+
+
+def bench_views(n_logs_list: List[int], repeat: int) -> List[dict]:
+    """First and repeated calls of the views of collections with many logs, and calls after appending a log."""
+    results = []
+    df = make_frame("numeric", 100, 10)
+    views = {
+        "agg": lambda logs: logs.agg(),
+        "dtypes": lambda logs: logs.dtypes(),
+        "shape": lambda logs: logs.shape(),
+        "column_names": lambda logs: logs.column_names(),
+    }
+    for n_logs in n_logs_list:
+        tracker = PipeLogger(agg_func=AGG_FUNC, dtypes=True, shape=True, column_names=True)
+        for _ in range(n_logs):
+            tracker.log_frame(df)
+        logs = tracker.logs
+
+        for name, view in views.items():
+            params = dict(view=name, n_logs=n_logs)
+            # Overwriting a log invalidates all cached views
+            invalidate = lambda: logs.__setitem__(next(iter(logs)), logs[0])  # noqa: E731
+            results.append(_result("view_first", params, measure(lambda: view(logs), repeat, setup=invalidate)))
+            view(logs)
+            results.append(_result("view_repeat", params, measure(lambda: view(logs), repeat)))
+
+            def append() -> None:
+                view(logs)
+                tracker.log_frame(df)
+
+            results.append(_result("view_after_append", params, measure(lambda: view(logs), repeat, setup=append)))
+    return results
+
+
+def metadata() -> dict:
+    """Versions and platform the results were measured with."""
+    return dict(
+        pipelog=pipelog.__version__,
+        python=platform.python_version(),
+        pandas=pd.__version__,
+        numpy=np.__version__,
+        platform=platform.platform(),
+        timestamp=datetime.now(timezone.utc).isoformat(),
+    )
+
+
+def compare(results: List[dict], baseline: List[dict]) -> List[str]:
+    """Lines with the ratio of the median times of results and baseline, for all benchmarks in both."""
+
+    def _key(result: dict) -> str:
+        return result["name"] + json.dumps(result["params"], sort_keys=True)
+
+    baseline_medians = {_key(result): result["median"] for result in baseline}
+    lines = []
+    for result in results:
+        base = baseline_medians.get(_key(result))
+        if base:
+            params = ", ".join(f"{k}={v}" for k, v in result["params"].items())
+            lines.append(f"{result['median'] / base:6.2f}x  {result['name']}({params})")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="bench_results.json", help="JSON file to write the results to.")
+    parser.add_argument("--compare", help="JSON file of earlier results to compare with.")
+    parser.add_argument("--quick", action="store_true", help="Run a small grid with few repetitions.")
+    parser.add_argument("--large", action="store_true", help="Also log frames with 1_000_000 rows, which is slow.")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        sizes, widths, n_logs_list, repeat = [1_000], [10], [100], 2
+    else:
+        sizes, widths, n_logs_list, repeat = [1_000, 10_000, 100_000], [10, 100, 1_000], [100, 1_000, 5_000], 3
+    if args.large:
+        sizes.append(1_000_000)
+    # Sizes are measured with the narrowest frames, widths with 10_000 rows
+    shapes = [(n_rows, widths[0]) for n_rows in sizes] + [(10_000, n_cols) for n_cols in widths[1:]]
+
+    with warnings.catch_warnings():
+        # pandas warns about columns it can't aggregate, e.g. the mean of strings
+        warnings.simplefilter("ignore")
+        results = []
+        results += bench_log_frame(shapes, repeat)
+        results += bench_track(sizes, widths[0], repeat)
+        results += bench_views(n_logs_list, repeat)
+
+    report = dict(metadata=metadata(), results=results)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print("\n".join(compare(results, json.load(f)["results"])))
+    return report
+
+
+if __name__ == "__main__":
+    sys.exit(main() and 0)
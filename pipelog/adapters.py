@@ -0,0 +1,241 @@
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pipelog.agg_engine import FUSED_AGG_FUNCS
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = pc = None
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+
+class FrameAdapter:
+    """Base class for logging frames of other libraries than pandas with their own kernels.
+
+    Adapters compute shape, column names, dtypes and aggregations directly on the frame, so it is never converted
+    to pandas. Only copies are converted, as they copy the data anyway. Aggregations have the same layout as
+    DataFrame.agg, with one row per function and one column per column of the frame.
+    Add adapters of further libraries with register_adapter.
+    """
+
+    # Names of the aggregation functions that the adapter computes.
+    agg_funcs: Tuple[str, ...] = FUSED_AGG_FUNCS
+
+    def matches(self, frame: Any) -> bool:
+        """Whether frame is a frame of the adapter's library."""
+        raise NotImplementedError
+
+    def shape(self, frame: Any) -> Tuple[int, int]:
+        """Number of rows and columns of frame."""
+        raise NotImplementedError
+
+    def column_names(self, frame: Any) -> List[Hashable]:
+        """Names of all columns of frame."""
+        raise NotImplementedError
+
+    def dtypes(self, frame: Any) -> Dict[Hashable, Any]:
+        """Native dtype of each column of frame, by column name."""
+        raise NotImplementedError
+
+    def slice(self, frame: Any, indices: Optional[list], columns: Optional[list]) -> Any:
+        """Select rows by position and columns by name, None selects all of them. Missing ones are ignored."""
+        raise NotImplementedError
+
+    def aggregate(self, frame: Any, func_names: List[str]) -> pd.DataFrame:
+        """Aggregate all columns of frame with each function of func_names, a subset of agg_funcs."""
+        raise NotImplementedError
+
+    def to_pandas(self, frame: Any) -> pd.DataFrame:
+        """Convert frame to a pandas DataFrame, used for copies."""
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        """Show the adapter's class."""
+        return f"{type(self).__name__}()"
+
+
+def _present(columns: list, names: List[Hashable]) -> list:
+    """columns that are names of the frame, in the order of the frame like in PipeLogger._slice_df."""
+    selected = set(columns)
+    return [name for name in names if name in selected]
+
+
+def _positions(indices: list, n_rows: int) -> np.ndarray:
+    """Row positions of indices that are within the frame."""
+    positions = np.asarray(indices, dtype=np.int64)
+    return positions[(positions >= 0) & (positions < n_rows)]
+
+
+def _agg_frame(values: Dict[Hashable, list], func_names: List[str]) -> pd.DataFrame:
+    """DataFrame of aggregated values by column, with missing results as NaN like in DataFrame.agg."""
+    data = {i: [np.nan if value is None else value for value in column] for i, column in enumerate(values.values())}
+    agg = pd.DataFrame(data, index=func_names)
+    agg.columns = pd.Index(list(values), dtype=object)
+    return agg.infer_objects()
+
+
+class ArrowAdapter(FrameAdapter):
+    """Logs pyarrow Tables with the kernels of pyarrow.compute.
+
+    NaN values of floating point columns are counted as missing values like nulls, as they are in pandas. mean,
+    std and var of boolean columns are computed on their integer values like in pandas. Functions that pyarrow
+    doesn't support for the type of a column, e.g. the sum of strings, result in NaN.
+    """
+
+    def matches(self, frame: Any) -> bool:
+        """Whether frame is a pyarrow Table."""
+        return pa is not None and isinstance(frame, pa.Table)
+
+    def shape(self, frame: Any) -> Tuple[int, int]:
+        """Number of rows and columns of the table."""
+        return frame.num_rows, frame.num_columns
+
+    def column_names(self, frame: Any) -> List[Hashable]:
+        """Names of the table's columns."""
+        return list(frame.column_names)
+
+    def dtypes(self, frame: Any) -> Dict[Hashable, Any]:
+        """pyarrow DataType of each column."""
+        return dict(zip(frame.column_names, frame.schema.types))
+
+    def slice(self, frame: Any, indices: Optional[list], columns: Optional[list]) -> Any:
+        """Take rows by position and select columns by name."""
+        if columns is not None:
+            frame = frame.select(_present(columns, self.column_names(frame)))
+        if indices is not None:
+            frame = frame.take(pa.array(_positions(indices, self.shape(frame)[0])))
+        return frame
+
+    def aggregate(self, frame: Any, func_names: List[str]) -> pd.DataFrame:
+        """Aggregate each column with one pyarrow kernel per function."""
+        values = {}
+        for name, column in zip(frame.column_names, frame.columns):
+            if pa.types.is_floating(column.type):
+                # Kernels skip nulls, so NaN values are turned into nulls to skip them as well
+                column = pc.if_else(pc.is_nan(column), pa.scalar(None, column.type), column)
+            values[name] = [self._aggregate_column(column, func_name) for func_name in func_names]
+        return _agg_frame(values, func_names)
+
+    @staticmethod
+    def _aggregate_column(column: Any, func_name: str) -> Any:
+        n_missing = column.null_count
+        if func_name in ("count", "notnans"):
+            return len(column) - n_missing
+        if func_name == "nans":
+            return n_missing
+        if func_name in ("mean", "std", "var") and pa.types.is_boolean(column.type):
+            # stddev and variance reject booleans, pandas computes the moments of booleans on their integer values
+            column = pc.cast(column, pa.int8())
+        try:
+            if func_name == "sum":
+                result = pc.sum(column, min_count=0)
+            elif func_name == "mean":
+                result = pc.mean(column)
+            elif func_name in ("min", "max"):
+                result = pc.min_max(column)[func_name]
+            else:
+                result = (pc.stddev if func_name == "std" else pc.variance)(column, ddof=1)
+        except (pa.ArrowNotImplementedError, pa.ArrowInvalid, pa.ArrowTypeError):
+            return None
+        return result.as_py()
+
+    def to_pandas(self, frame: Any) -> pd.DataFrame:
+        """Convert the table with Table.to_pandas."""
+        return frame.to_pandas()
+
+
+class PolarsAdapter(FrameAdapter):
+    """Logs Polars DataFrames, with all aggregations of all columns computed in a single select.
+
+    NaN values of floating point columns are counted as missing values like nulls, as they are in pandas. sum, mean,
+    std and var of columns that are neither numeric nor boolean result in NaN.
+    """
+
+    def matches(self, frame: Any) -> bool:
+        """Whether frame is a Polars DataFrame."""
+        return pl is not None and isinstance(frame, pl.DataFrame)
+
+    def shape(self, frame: Any) -> Tuple[int, int]:
+        """Number of rows and columns of the frame."""
+        return frame.shape
+
+    def column_names(self, frame: Any) -> List[Hashable]:
+        """Names of the frame's columns."""
+        return list(frame.columns)
+
+    def dtypes(self, frame: Any) -> Dict[Hashable, Any]:
+        """Polars DataType of each column."""
+        return dict(zip(frame.columns, frame.dtypes))
+
+    def slice(self, frame: Any, indices: Optional[list], columns: Optional[list]) -> Any:
+        """Take rows by position and select columns by name."""
+        if columns is not None:
+            frame = frame.select(_present(columns, self.column_names(frame)))
+        if indices is not None:
+            frame = frame[_positions(indices, self.shape(frame)[0])]
+        return frame
+
+    def aggregate(self, frame: Any, func_names: List[str]) -> pd.DataFrame:
+        """Aggregate all columns with one expression per function and column, evaluated in one query."""
+        exprs = []
+        for i, (name, dtype) in enumerate(zip(frame.columns, frame.dtypes)):
+            column = pl.col(name)
+            if dtype in (pl.Float32, pl.Float64):
+                # Polars skips nulls, so NaN values are turned into nulls to skip them as well
+                column = column.fill_nan(None)
+            numeric = dtype.is_numeric() or dtype == pl.Boolean
+            exprs.extend(
+                self._aggregate_column(column, func_name, numeric).alias(f"{i}_{j}")
+                for j, func_name in enumerate(func_names)
+            )
+        row = frame.select(exprs).row(0) if exprs else ()
+        n_funcs = len(func_names)
+        values = {name: list(row[i * n_funcs : (i + 1) * n_funcs]) for i, name in enumerate(frame.columns)}
+        return _agg_frame(values, func_names)
+
+    @staticmethod
+    def _aggregate_column(column: Any, func_name: str, numeric: bool) -> Any:
+        if func_name in ("count", "notnans"):
+            return column.is_not_null().sum()
+        if func_name == "nans":
+            return column.is_null().sum()
+        if func_name in ("min", "max"):
+            return getattr(column, func_name)()
+        if not numeric:
+            return pl.lit(None)
+        if func_name in ("std", "var"):
+            return getattr(column, func_name)(ddof=1)
+        return getattr(column, func_name)()
+
+    def to_pandas(self, frame: Any) -> pd.DataFrame:
+        """Convert the frame with DataFrame.to_pandas."""
+        return frame.to_pandas()
+
+
+# Adapters that are tried in order for frames that aren't pandas DataFrames.
+_ADAPTERS: List[FrameAdapter] = [ArrowAdapter(), PolarsAdapter()]
+
+
+def register_adapter(adapter: FrameAdapter) -> None:
+    """Add an adapter, which is tried before all adapters that were registered earlier."""
+    _ADAPTERS.insert(0, adapter)
+
+
+def get_adapter(frame: Any) -> Optional[FrameAdapter]:
+    """Adapter of frame, None for pandas DataFrames and for frames without an adapter."""
+    if isinstance(frame, pd.DataFrame):
+        return None
+    return next((adapter for adapter in _ADAPTERS if adapter.matches(frame)), None)
+
+
+def is_frame(frame: Any) -> bool:
+    """Whether frame is a pandas DataFrame or a frame of a registered adapter."""
+    return isinstance(frame, pd.DataFrame) or get_adapter(frame) is not None
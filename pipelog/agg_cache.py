@@ -0,0 +1,132 @@
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from pipelog.agg_engine import aggregate, combine_parts
+from pipelog.fingerprint import buffer_fingerprint
+
+
+class ColumnAggCache:
+    """Aggregates frames column wise, and reuses the aggregations of columns that were aggregated before.
+
+    Columns are recognized by pipelog.fingerprint.buffer_fingerprint, so only columns backed by the very same
+    numpy buffer are reused, e.g. columns that a pipeline step passes on unchanged. Values that are changed in
+    place are not noticed unless they are among the sampled values of the fingerprint. The aggregations of at most
+    max_size columns are kept, the least recently used ones are dropped first.
+
+    Args:
+        max_size (int): Maximum number of cached column aggregations.
+    """
+
+    def __init__(self, max_size: int = 1024) -> None:
+        """Init empty cache."""
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of cached column aggregations."""
+        return len(self._cache)
+
+    def aggregate(
+        self, df: pd.DataFrame, func_list: Union[list, dict], axis: int = 0, aggregator: Callable = aggregate
+    ) -> pd.DataFrame:
+        """Same as pipelog.agg_engine.aggregate, but only aggregates columns without a cached aggregation.
+
+        Args:
+            aggregator (Callable): Aggregates the columns that are not cached, called like aggregate.
+        """
+        func_key = self._func_key(func_list)
+        if func_key is None or axis not in (0, "index") or len(df) == 0 or not df.columns.is_unique:
+            return aggregator(df, func_list, axis=axis)
+
+        keys, owners = self._fingerprints(df, func_key)
+        cached = {}
+        for i, (key, owner) in enumerate(zip(keys, owners)):
+            agg = self._get(key, owner) if key is not None else None
+            if agg is not None:
+                cached[i] = agg
+
+        missing = np.array([i for i in range(df.shape[1]) if i not in cached], dtype=np.intp)
+        self.hits += len(cached)
+        self.misses += len(missing)
+
+        if not cached:
+            computed = aggregator(df, func_list, axis=axis)
+            # Aggregating may consolidate the blocks of df, which moves its columns into new buffers.
+            keys, owners = self._fingerprints(df, func_key)
+        elif len(missing) > 0:
+            # Taking columns with iloc would consolidate df, so the frame of missing columns is built from Series.
+            df_missing = pd.DataFrame({j: df.iloc[:, i] for j, i in enumerate(missing)})
+            df_missing.columns = df.columns[missing]
+            computed = aggregator(df_missing, func_list, axis=axis)
+        else:
+            computed = None
+
+        if computed is not None:
+            if not computed.columns.equals(df.columns[missing]):
+                # pandas dropped columns it could not aggregate, let it decide about the whole frame instead
+                return computed if not cached else aggregator(df, func_list, axis=axis)
+            for i, column in zip(missing, computed.columns):
+                if keys[i] is not None:
+                    self._put(keys[i], owners[i], computed[[column]])
+            if not cached:
+                return computed
+
+        parts, positions = list(cached.values()), [np.array([i]) for i in cached]
+        if computed is not None:
+            parts.append(computed)
+            positions.append(missing)
+        result = combine_parts(parts, positions, list(parts[0].index))
+        # Cached aggregations may belong to columns with another name
+        result.columns = df.columns
+        return result
+
+    @staticmethod
+    def _fingerprints(df: pd.DataFrame, func_key: tuple) -> Tuple[List[Optional[tuple]], List[np.ndarray]]:
+        keys, owners = [], []
+        for i in range(df.shape[1]):
+            fingerprint = buffer_fingerprint(df.iloc[:, i])
+            keys.append(None if fingerprint is None else (fingerprint[0], func_key))
+            owners.append(None if fingerprint is None else fingerprint[1])
+        return keys, owners
+
+    @staticmethod
+    def _func_key(func_list: Union[list, dict]) -> Optional[tuple]:
+        if not isinstance(func_list, list):
+            return None
+        try:
+            hash(tuple(func_list))
+        except TypeError:
+            return None
+        return tuple(func_list)
+
+    def _get(self, key: Hashable, owner: np.ndarray) -> Optional[pd.DataFrame]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            owner_ref, agg = entry
+            if owner_ref() is not owner:
+                # The buffer was freed and its address reused by another array
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return agg
+
+    def _put(self, key: Hashable, owner: np.ndarray, agg: pd.DataFrame) -> None:
+        try:
+            owner_ref = weakref.ref(owner)
+        except TypeError:
+            return
+        with self._lock:
+            self._cache[key] = (owner_ref, agg)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
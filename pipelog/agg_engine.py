@@ -0,0 +1,427 @@
+from concurrent.futures import Executor
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from pipelog.custom_agg_funcs import CustomAggFuncs
+
+# Aggregations that can be derived from the partial statistics of a single pass over the data.
+FUSED_AGG_FUNCS = ("count", "nans", "notnans", "sum", "mean", "min", "max", "std", "var")
+
+# Aggregations that keep an integer result dtype, depending on the kind of the aggregated column.
+_INT_RESULT_FUNCS = {
+    "i": {"count", "nans", "notnans", "sum", "min", "max"},
+    "f": {"count", "nans", "notnans"},
+}
+_FUSED_DTYPES = (np.dtype(np.int64), np.dtype(np.float64))
+
+# Number of values that are processed at once. Small enough to keep temporary masks in the CPU cache.
+_BLOCK_SIZE = 2 ** 18
+
+# Minimal number of columns per concurrently aggregated range of columns.
+_MIN_PARALLEL_COLUMNS = 8
+
+_STAT_DEPENDENCIES = {
+    "count": (),
+    "nans": (),
+    "notnans": (),
+    "sum": ("total",),
+    "mean": ("mean",),
+    "min": ("minimum",),
+    "max": ("maximum",),
+    "std": ("mean", "m2"),
+    "var": ("mean", "m2"),
+}
+
+
+def resolve_func_names(func_list: Union[list, dict], allowed: Iterable[str] = FUSED_AGG_FUNCS) -> Optional[List[str]]:
+    """Returns the names of all aggregation functions if all of them are allowed, otherwise None.
+
+    Args:
+        func_list (Union[list, dict]): Parsed aggregation functions as returned by PipeLogger._parse_agg_func.
+        allowed (Iterable[str]): Names of allowed functions, by default all that can be fused.
+    """
+    if not isinstance(func_list, list) or len(func_list) == 0:
+        return None
+
+    custom_names = {member.value: member.name for member in CustomAggFuncs}
+    names = []
+    for func in func_list:
+        if isinstance(func, str):
+            name = func
+        else:
+            try:
+                name = custom_names.get(func)
+            except TypeError:  # Unhashable callable
+                return None
+        if name not in allowed:
+            return None
+        names.append(name)
+
+    return names if len(set(names)) == len(names) else None
+
+
+def required_stats(func_names: Iterable[str]) -> Tuple[str, ...]:
+    """Returns the partial statistics that are needed to compute all given aggregations."""
+    stats = set()
+    for name in func_names:
+        stats.update(_STAT_DEPENDENCIES[name])
+    return tuple(sorted(stats))
+
+
+class AggState:
+    """Mergeable partial statistics for a block of columns sharing one dtype.
+
+    Count and nan values are always tracked, all other statistics only if they were requested. Merging two
+    states follows the pairwise update of Chan et al., so the mean and the sum of squared deviations (m2) stay
+    numerically stable.
+    """
+
+    def __init__(
+        self,
+        columns: pd.Index,
+        dtype: np.dtype,
+        n_rows: int,
+        count: np.ndarray,
+        total: np.ndarray = None,
+        minimum: np.ndarray = None,
+        maximum: np.ndarray = None,
+        mean: np.ndarray = None,
+        m2: np.ndarray = None,
+    ) -> None:
+        """Init from already computed partial statistics."""
+        self.columns = columns
+        self.dtype = np.dtype(dtype)
+        self.n_rows = n_rows
+        self.count = count
+        self.total = total
+        self.minimum = minimum
+        self.maximum = maximum
+        self.mean = mean
+        self.m2 = m2
+
+    @property
+    def stats(self) -> Tuple[str, ...]:
+        """Names of the optional statistics this state keeps track of."""
+        return tuple(s for s in ("m2", "maximum", "mean", "minimum", "total") if getattr(self, s) is not None)
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, columns: pd.Index, stats: Iterable[str] = ()) -> "AggState":
+        """Compute the partial statistics of a 2D array with one column per entry of columns.
+
+        Rows are processed in blocks of bounded size, so temporary arrays stay small even for very long frames.
+        """
+        stats = tuple(stats)
+        n_rows, n_cols = values.shape
+        block_rows = max(_BLOCK_SIZE // max(n_cols, 1), 1)
+
+        state = None
+        for start in range(0, n_rows, block_rows):
+            block_state = cls._from_block(values[start : start + block_rows], columns, stats)
+            state = block_state if state is None else state.merge(block_state)
+
+        if state is None:
+            state = cls._from_block(values[:0], columns, stats)
+        return state
+
+    @classmethod
+    def _from_block(cls, values: np.ndarray, columns: pd.Index, stats: Tuple[str, ...]) -> "AggState":
+        """Compute the partial statistics of a block that fits into memory at once."""
+        n_rows, n_cols = values.shape
+        # pandas usually stores the values of a block column wise, so reducing along the rows of the transposed
+        # array runs over contiguous memory. Row wise stored blocks are copied once into this layout.
+        values = np.ascontiguousarray(values.T)
+        is_float = values.dtype.kind == "f"
+        need_moments = "mean" in stats or "m2" in stats
+
+        mask = np.isnan(values) if is_float else None
+        count = np.full(n_cols, n_rows, dtype=np.int64) if mask is None else n_rows - mask.sum(axis=1)
+        filled = values if mask is None else np.where(mask, 0, values)
+
+        total = filled.sum(axis=1) if "total" in stats else None
+
+        mean, m2 = None, None
+        if need_moments:
+            float_total = total if is_float and total is not None else filled.sum(axis=1, dtype=np.float64)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean = float_total / count
+            if "m2" in stats:
+                deviation = values - mean[:, None]
+                if mask is not None:
+                    deviation[mask] = 0
+                m2 = np.einsum("ij,ij->i", deviation, deviation)
+
+        minimum, maximum = None, None
+        if "minimum" in stats or "maximum" in stats:
+            if n_rows == 0:
+                minimum = np.full(n_cols, np.nan) if is_float else np.zeros(n_cols, dtype=values.dtype)
+                maximum = minimum.copy()
+            elif mask is None:
+                minimum, maximum = values.min(axis=1), values.max(axis=1)
+            else:
+                with np.errstate(invalid="ignore"):
+                    minimum = np.fmin.reduce(values, axis=1)
+                    maximum = np.fmax.reduce(values, axis=1)
+            minimum = minimum if "minimum" in stats else None
+            maximum = maximum if "maximum" in stats else None
+
+        return cls(columns, values.dtype, n_rows, count, total, minimum, maximum, mean, m2)
+
+    def merge(self, other: "AggState") -> "AggState":
+        """Combine two states of the same columns into the state of their concatenated data."""
+        if self.n_rows == 0:
+            return other
+        if other.n_rows == 0:
+            return self
+
+        count = self.count + other.count
+        total = self._combine(other, "total", np.add)
+        minimum = self._combine(other, "minimum", np.fmin)
+        maximum = self._combine(other, "maximum", np.fmax)
+
+        mean, m2 = None, None
+        if self.mean is not None and other.mean is not None:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                delta = other.mean - self.mean
+                weight = np.where(count > 0, other.count / np.maximum(count, 1), 0)
+                mean = np.where(self.count == 0, other.mean, self.mean + delta * weight)
+                mean = np.where(other.count == 0, self.mean, mean)
+                if self.m2 is not None and other.m2 is not None:
+                    correction = np.where(
+                        (self.count > 0) & (other.count > 0), delta ** 2 * self.count * weight, 0
+                    )
+                    m2 = self.m2 + other.m2 + correction
+
+        return AggState(self.columns, self.dtype, self.n_rows + other.n_rows, count, total, minimum, maximum, mean, m2)
+
+    def take(self, indices: np.ndarray) -> "AggState":
+        """State of the columns at indices."""
+        stats = {stat: getattr(self, stat)[indices] for stat in self.stats}
+        return AggState(self.columns[indices], self.dtype, self.n_rows, self.count[indices], **stats)
+
+    def astype(self, dtype: np.dtype) -> "AggState":
+        """State of the same values cast to dtype, which may only turn int64 into float64."""
+        dtype = np.dtype(dtype)
+        if dtype == self.dtype:
+            return self
+        if not (self.dtype.kind == "i" and dtype.kind == "f"):
+            raise ValueError(f"Can't cast a state of {self.dtype} columns to {dtype}.")
+        stats = {stat: getattr(self, stat) for stat in self.stats}
+        for stat in ("total", "minimum", "maximum"):
+            if stats.get(stat) is not None:
+                stats[stat] = stats[stat].astype(dtype)
+        return AggState(self.columns, dtype, self.n_rows, self.count, **stats)
+
+    @classmethod
+    def concat(cls, states: List["AggState"]) -> "AggState":
+        """State of the columns of all states, which need to share their dtype and rows."""
+        first = states[0]
+        if len(states) == 1:
+            return first
+        stats = {stat: np.concatenate([getattr(state, stat) for state in states]) for stat in first.stats}
+        columns = first.columns.append([state.columns for state in states[1:]])
+        count = np.concatenate([state.count for state in states])
+        return cls(columns, first.dtype, first.n_rows, count, **stats)
+
+    def _combine(self, other: "AggState", stat: str, ufunc: np.ufunc) -> Optional[np.ndarray]:
+        a, b = getattr(self, stat), getattr(other, stat)
+        return None if a is None or b is None else ufunc(a, b)
+
+    def finalize(self, func_names: List[str]) -> pd.DataFrame:
+        """Create the aggregation DataFrame with the same layout as DataFrame.agg(func_names)."""
+        int_funcs = _INT_RESULT_FUNCS.get(self.dtype.kind, set())
+        result_dtype = np.int64 if set(func_names) <= int_funcs else np.float64
+        result = np.empty((len(func_names), len(self.columns)), dtype=result_dtype)
+
+        for i, name in enumerate(func_names):
+            result[i] = self._finalize_func(name)
+
+        return pd.DataFrame(result, index=func_names, columns=self.columns)
+
+    def _finalize_func(self, name: str) -> np.ndarray:
+        if name in ("count", "notnans"):
+            return self.count
+        if name == "nans":
+            return self.n_rows - self.count
+        if name == "sum":
+            return self.total
+        if name == "min":
+            return self.minimum if self.n_rows > 0 else np.full(len(self.columns), np.nan)
+        if name == "max":
+            return self.maximum if self.n_rows > 0 else np.full(len(self.columns), np.nan)
+        if name == "mean":
+            return np.where(self.count > 0, self.mean, np.nan)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = np.where(self.count > 1, self.m2 / (self.count - 1), np.nan)
+        return np.sqrt(var) if name == "std" else var
+
+
+def fused_column_blocks(df: pd.DataFrame) -> Tuple[Dict[np.dtype, np.ndarray], np.ndarray]:
+    """Group column positions by fusable dtype.
+
+    Returns:
+        A dict mapping each fusable dtype to its column positions, and the positions of all other columns.
+    """
+    dtypes = df.dtypes.values
+    blocks = {}
+    for dtype in _FUSED_DTYPES:
+        positions = np.flatnonzero(dtypes == dtype)
+        if len(positions) > 0:
+            blocks[dtype] = positions
+    fused = np.concatenate(list(blocks.values())) if blocks else np.array([], dtype=np.intp)
+    others = np.setdiff1d(np.arange(len(dtypes)), fused)
+    return blocks, others
+
+
+def frame_agg_states(df: pd.DataFrame, stats: Iterable[str]) -> List[Tuple[np.ndarray, AggState]]:
+    """Compute one AggState for each fusable column block of df, together with the block's column positions."""
+    blocks, _ = fused_column_blocks(df)
+    states = []
+    for dtype, positions in blocks.items():
+        values = df.iloc[:, positions].to_numpy(dtype=dtype)
+        states.append((positions, AggState.from_values(values, df.columns[positions], stats)))
+    return states
+
+
+def align_states(
+    states: List[Tuple[np.ndarray, AggState]], blocks: Dict[np.dtype, np.ndarray]
+) -> List[Tuple[np.ndarray, AggState]]:
+    """Regroup the states of column blocks into the given blocks, as returned by fused_column_blocks.
+
+    Both need to cover the same column positions. States of int64 columns are cast to float64 where the column
+    is part of a float64 block, e.g. when a later chunk of a column contains missing values.
+    """
+    if len(states) == len(blocks) and all(
+        state.dtype in blocks and np.array_equal(positions, blocks[state.dtype]) for positions, state in states
+    ):
+        return states
+
+    aligned = []
+    for dtype, block_positions in blocks.items():
+        parts, part_positions = [], []
+        for positions, state in states:
+            in_block = np.isin(positions, block_positions)
+            if in_block.any():
+                parts.append(state.take(np.flatnonzero(in_block)).astype(dtype))
+                part_positions.append(positions[in_block])
+        # Block positions are sorted, so sorting the positions of the parts restores the order of the block
+        order = np.argsort(np.concatenate(part_positions), kind="stable")
+        aligned.append((block_positions, AggState.concat(parts).take(order)))
+    return aligned
+
+
+def aggregate(df: pd.DataFrame, func_list: Union[list, dict], axis: int = 0) -> pd.DataFrame:
+    """Aggregate df with the same result as df.agg(func_list, axis=axis).
+
+    Whenever possible, all requested aggregations of int64 and float64 columns are computed within a single
+    vectorized pass per column block, instead of one pass per function. Remaining columns, unknown functions and
+    row wise aggregations fall back to pandas.
+    """
+    func_names = resolve_func_names(func_list) if axis in (0, "index") else None
+    if func_names is None or len(df) == 0:
+        return df.agg(func=func_list, axis=axis)
+
+    blocks, others = fused_column_blocks(df)
+    if not blocks:
+        return df.agg(func=func_list, axis=axis)
+
+    stats = required_stats(func_names)
+    parts, positions = [], []
+    for block_positions, state in frame_agg_states(df, stats):
+        parts.append(state.finalize(func_names))
+        positions.append(block_positions)
+
+    if len(others) > 0:
+        try:
+            parts.append(df.iloc[:, others].agg(func=func_list, axis=axis))
+        except (TypeError, ValueError):
+            # Let pandas decide how to handle columns that can not be aggregated.
+            return df.agg(func=func_list, axis=axis)
+        positions.append(others)
+
+    return combine_parts(parts, positions, func_names)
+
+
+def combine_parts(parts: List[pd.DataFrame], positions: List[np.ndarray], func_names: List[str]) -> pd.DataFrame:
+    """Combine the aggregations of column subsets into one DataFrame, with the columns in their original order.
+
+    Args:
+        parts (List[pd.DataFrame]): Aggregations with one row per function name.
+        positions (List[np.ndarray]): Original column positions of the columns of each part.
+        func_names (List[str]): Order of the result rows.
+    """
+    result = pd.concat(parts, axis=1) if len(parts) > 1 else parts[0]
+    result = result.reindex(func_names) if len(parts) > 1 else result
+    return result.iloc[:, np.argsort(np.concatenate(positions), kind="stable")]
+
+
+def parallel_aggregate(
+    df: pd.DataFrame, func_list: Union[list, dict], executor: Executor, n_chunks: int, axis: int = 0
+) -> pd.DataFrame:
+    """Aggregate df like aggregate, but split its columns into up to n_chunks ranges aggregated on executor.
+
+    Column ranges of a consolidated frame are views, so chunks are not copied before they are aggregated. numpy
+    releases the GIL in its reductions, so a thread pool runs the fused aggregations on multiple cores.
+    Small frames, row wise aggregations and aggregations per column (dict) are not split.
+    """
+    n_cols = df.shape[1]
+    n_chunks = min(n_chunks, n_cols // _MIN_PARALLEL_COLUMNS)
+    if n_chunks < 2 or axis not in (0, "index") or isinstance(func_list, dict) or df.size < _BLOCK_SIZE:
+        return aggregate(df, func_list, axis=axis)
+
+    bounds = np.linspace(0, n_cols, n_chunks + 1).astype(np.intp)
+    futures = [
+        executor.submit(aggregate, df.iloc[:, start:stop], func_list, axis) for start, stop in zip(bounds, bounds[1:])
+    ]
+    parts = [future.result() for future in futures]
+
+    if any(not part.columns.equals(df.columns[start:stop]) for part, start, stop in zip(parts, bounds, bounds[1:])):
+        # pandas dropped columns it could not aggregate, let it decide about the whole frame instead
+        return aggregate(df, func_list, axis=axis)
+    positions = [np.arange(start, stop) for start, stop in zip(bounds, bounds[1:])]
+    return combine_parts(parts, positions, list(parts[0].index))
+
+
+def group_aggregate(df: pd.DataFrame, by: List[Hashable], func_list: list) -> pd.DataFrame:
+    """Aggregate every group of df.groupby(by) with func_list, without a pass over the frame per group.
+
+    Groups are factorized once, and every function is a single pass over all rows that aggregates all groups at
+    once. nans and notnans are derived from the group sizes and counts, so they don't call a Python function per
+    group and column. Other custom functions are called per group.
+
+    Args:
+        by (List[Hashable]): Labels of the columns to group by. They are not aggregated themselves.
+        func_list (list): Parsed aggregation functions as returned by PipeLogger._parse_agg_func.
+
+    Returns:
+        A DataFrame with a (group, function name) index, i.e. the result of df.agg(func_list) for each group, in
+        order of the first occurrence of each group. Groups of multiple columns are tuples.
+    """
+    if not isinstance(func_list, list):
+        raise ValueError("Groups can only be aggregated with a list of functions, not with a dict.")
+    grouped = df.groupby(by if len(by) > 1 else by[0], sort=False, observed=True, dropna=False)
+    sizes = grouped.size()
+    columns = df.columns.drop(by)
+    custom_names = {member.value: member.name for member in CustomAggFuncs}
+
+    func_names, parts, count = [], [], None
+    for func in func_list:
+        name = func if isinstance(func, str) else custom_names.get(func, getattr(func, "__name__", str(func)))
+        if name in ("nans", "notnans"):
+            count = grouped.count() if count is None else count
+            part = count if name == "notnans" else count.rsub(sizes, axis=0)
+        else:
+            part = grouped.agg(func)
+        func_names.append(name)
+        parts.append(part.reindex(index=sizes.index, columns=columns))
+
+    # Rows of the concatenated parts are ordered by function, reorder them by group
+    n_groups, n_funcs = len(sizes), len(func_names)
+    order = (np.arange(n_groups)[:, None] + np.arange(n_funcs)[None, :] * n_groups).ravel()
+    agg = pd.concat(parts, axis=0).iloc[order]
+    groups = pd.Index(list(sizes.index), tupleize_cols=False, dtype=object)
+    names = np.tile(np.array(func_names, dtype=object), n_groups)
+    agg.index = pd.MultiIndex.from_arrays([groups.repeat(n_funcs), names])
+    return agg
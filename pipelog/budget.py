@@ -0,0 +1,109 @@
+import threading
+import time
+from typing import Callable, Dict, Optional, Union
+
+# Fidelity levels from the most to the least complete log.
+FULL = "full"
+SAMPLED = "sampled"
+CHEAP = "cheap"
+SKIPPED = "skipped"
+FIDELITIES = (FULL, SAMPLED, CHEAP, SKIPPED)
+
+
+class OverheadBudget:
+    """Limits the time spent logging to a fraction of the wall time since the first log.
+
+    The cost of each log is recorded per fidelity level as seconds per unit of work, e.g. per logged cell. Before
+    logging, the most complete level is chosen whose predicted cost still fits into the budget. Levels whose cost is
+    not known yet are assumed to fit, so their cost is measured the first time they are needed.
+
+    Args:
+        fraction (float): Fraction of the wall time that logging may use, e.g. 0.02 for 2%.
+        smoothing (float): Weight of the latest cost in the moving average of the cost of each level.
+        clock (Callable[[], float]): Returns the current time in seconds, used for the elapsed wall time and by
+            PipeLogger to measure the cost of logs.
+    """
+
+    def __init__(self, fraction: float, smoothing: float = 0.3, clock: Callable[[], float] = time.perf_counter) -> None:
+        """Init without any measured costs."""
+        if not 0 < fraction <= 1:
+            raise ValueError(f"fraction should be between 0 and 1. Got {fraction} instead.")
+        self.fraction = fraction
+        self.smoothing = smoothing
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the time spent and all measured costs."""
+        with self._lock:
+            self.spent = 0.0
+            self._start = None
+            self._rates = {}
+
+    @property
+    def elapsed(self) -> float:
+        """Wall time since the first log in seconds."""
+        return 0.0 if self._start is None else self.clock() - self._start
+
+    def allowance(self) -> float:
+        """Seconds that logging may still use without exceeding the budget."""
+        return self.fraction * self.elapsed - self.spent
+
+    def choose(self, work: Dict[str, float]) -> str:
+        """Returns the most complete fidelity level whose predicted cost fits into the budget.
+
+        Args:
+            work (Dict[str, float]): Amount of work of each fidelity level for the frame to log, levels that are not
+                given are not considered.
+        """
+        with self._lock:
+            if self._start is None:
+                self._start = self.clock()
+            allowance = self.allowance()
+            for fidelity in FIDELITIES:
+                if fidelity in work and self.predict(fidelity, work[fidelity]) <= max(allowance, 0.0):
+                    return fidelity
+        return SKIPPED
+
+    def predict(self, fidelity: str, work: float) -> float:
+        """Predicted seconds of logging work at fidelity, 0 if its cost is not known yet."""
+        rate = self._rates.get(fidelity)
+        return 0.0 if rate is None else rate * work
+
+    def record(self, fidelity: str, work: float, seconds: float) -> None:
+        """Add seconds spent logging work at fidelity."""
+        with self._lock:
+            self.spent += seconds
+            if work > 0:
+                rate = seconds / work
+                previous = self._rates.get(fidelity)
+                self._rates[fidelity] = rate if previous is None else previous + self.smoothing * (rate - previous)
+
+    def rate(self, fidelity: str) -> Optional[float]:
+        """Average seconds per unit of work at fidelity, None if it wasn't measured yet."""
+        return self._rates.get(fidelity)
+
+    def __repr__(self) -> str:
+        """Show the budget and the time spent so far."""
+        return f"OverheadBudget(fraction={self.fraction}, spent={self.spent:.3g}s, elapsed={self.elapsed:.3g}s)"
+
+
+def parse_budget(budget: Union[float, OverheadBudget, None]) -> Optional[OverheadBudget]:
+    """Turn the budget argument of PipeLogger into an OverheadBudget, given ones are used as they are."""
+    if budget is None or isinstance(budget, OverheadBudget):
+        return budget
+    return OverheadBudget(budget)
+
+
+def frame_work(n_rows: int, n_cols: int, sample_rows: int) -> Dict[str, float]:
+    """Amount of work of logging a frame at each fidelity level.
+
+    Full and sampled logs scale with the number of logged cells, cheap logs with the number of columns.
+    """
+    return {
+        FULL: n_rows * n_cols,
+        SAMPLED: min(n_rows, sample_rows) * n_cols,
+        CHEAP: n_cols + 1,
+        SKIPPED: 0,
+    }
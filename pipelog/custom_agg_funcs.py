@@ -1,9 +1,11 @@
 from enum import Enum, unique
 from functools import update_wrapper
-from typing import Any
+from typing import Any, Union
 
 import pandas as pd
 
+from pipelog.sketches import HyperLogLog, KLLSketch
+
 
 def nans_func(df: pd.DataFrame) -> pd.Series:
     """Counts the number of nan values for all columns."""
@@ -15,6 +17,25 @@ def not_nans_func(df: pd.DataFrame) -> pd.Series:
     return df.notna().sum()
 
 
+def _sketch(sketch_cls: type, data: Union[pd.DataFrame, pd.Series]) -> Union[pd.Series, Any]:
+    # Series.agg first tries to apply functions element wise, this makes it fall back to passing the Series.
+    if isinstance(data, pd.DataFrame):
+        return data.apply(sketch_cls.from_values)
+    elif not isinstance(data, pd.Series):
+        raise TypeError(f"Sketches are created from a Series or DataFrame, got {type(data)}.")
+    return sketch_cls.from_values(data)
+
+
+def approx_nunique_func(df: pd.DataFrame) -> pd.Series:
+    """Sketches the number of distinct values with a mergeable HyperLogLog, use float() to get the estimate."""
+    return _sketch(HyperLogLog, df)
+
+
+def approx_quantiles_func(df: pd.DataFrame) -> pd.Series:
+    """Sketches the distribution of values with a mergeable KLLSketch, use .quantile(q) to get estimates."""
+    return _sketch(KLLSketch, df)
+
+
 class EnumFunc:
     """Wrapper class that enables usage and proper representation for functions in Enums."""
 
@@ -36,3 +57,5 @@ class EnumFunc:
 class CustomAggFuncs(Enum):
     nans = EnumFunc(nans_func)
     notnans = EnumFunc(not_nans_func)
+    approx_nunique = EnumFunc(approx_nunique_func)
+    approx_quantiles = EnumFunc(approx_quantiles_func)
@@ -0,0 +1,154 @@
+from typing import List, Mapping
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+from pipelog.frame_log import _AGG_FUNC_NAME, _COL_NAME, _GROUP, _LOG_KEY, FrameLog, with_group_level
+
+# Kinds of changes between two collections.
+AGG = "agg"
+DTYPE = "dtype"
+SHAPE = "shape"
+COLUMN_ADDED = "column_added"
+COLUMN_REMOVED = "column_removed"
+LOG_ADDED = "log_added"
+LOG_REMOVED = "log_removed"
+
+_CHANGE = "change"
+_STAT = "stat"
+_COLUMNS = [_LOG_KEY, _COL_NAME, _CHANGE, _STAT, "a", "b", "delta", "score"]
+
+
+def compare(logs_a: Mapping[str, FrameLog], logs_b: Mapping[str, FrameLog]) -> pd.DataFrame:
+    """Compare the logs of two runs of the same pipeline, e.g. yesterday's and today's.
+
+    Entries are lined up by key and compared with the logged values only, so the original frames are not needed.
+    Changes are found for numeric aggregations, dtypes, shapes and column names that were logged in both runs,
+    as well as for keys that were only logged in one run. All values are compared at once on the aligned views
+    of both collections.
+
+    Each change is scored by its size: the relative difference abs(b - a) / (abs(a) + abs(b)) for aggregations
+    and shapes, which is between 0 and 1, and 1 for all other changes, including values that turned missing.
+
+    Args:
+        logs_a (Mapping[str, FrameLog]): A FrameLogCollection or a slice of it, the reference run.
+        logs_b (Mapping[str, FrameLog]): Logs of the run to compare with logs_a.
+
+    Returns:
+        One row per change with the columns log_key, col_name, change, stat, a, b, delta and score, sorted by
+        descending score. change is one of the kinds of this module, stat is the aggregation function for
+        aggregations, a tuple of group and function for aggregations per group, and n_rows or n_cols for shapes.
+    """
+    keys_b = set(logs_b)
+    keys_a = set(logs_a)
+    parts = [
+        _key_changes([k for k in logs_a if k not in keys_b], LOG_REMOVED),
+        _key_changes([k for k in logs_b if k not in keys_a], LOG_ADDED),
+        _agg_changes(logs_a.agg(), logs_b.agg()),
+        _dtype_changes(logs_a.dtypes(), logs_b.dtypes()),
+        _shape_changes(logs_a.shape(), logs_b.shape()),
+        _column_changes(logs_a.column_names(), logs_b.column_names()),
+    ]
+    parts = [part for part in parts if len(part) > 0]
+    if not parts:
+        return pd.DataFrame(columns=_COLUMNS)
+
+    changes = pd.concat(parts, ignore_index=True)
+    order = np.argsort(-changes["score"].to_numpy(), kind="stable")
+    return changes.take(order).reset_index(drop=True)
+
+
+def _numeric_values(df: pd.DataFrame) -> np.ndarray:
+    """Values of df as a float array, non numeric values are NaN."""
+    values = np.full(df.shape, np.nan)
+    is_numeric = np.array([is_numeric_dtype(dtype) for dtype in df.dtypes], dtype=bool)
+    if is_numeric.any():
+        values[:, is_numeric] = df.iloc[:, is_numeric].to_numpy(dtype=np.float64, na_value=np.nan)
+    for i in np.flatnonzero(~is_numeric):
+        values[:, i] = pd.to_numeric(df.iloc[:, i], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    return values
+
+
+def _changes(
+    log_keys: np.ndarray, col_names: np.ndarray, change: str, stats: np.ndarray, a: np.ndarray, b: np.ndarray
+) -> pd.DataFrame:
+    """Frame of changes of the same kind, scored by their relative difference if a and b are numeric."""
+    if a.dtype.kind == "f":
+        delta = b - a
+        with np.errstate(invalid="ignore", divide="ignore"):
+            score = np.abs(delta) / (np.abs(a) + np.abs(b))
+        # Values that turned missing or appeared are a full change
+        score[np.isnan(a) != np.isnan(b)] = 1.0
+    else:
+        delta, score = np.full(len(a), np.nan), np.ones(len(a))
+    data = dict(zip(_COLUMNS, (log_keys, col_names, np.full(len(a), change, dtype=object), stats, a, b, delta)))
+    data["score"] = score
+    return pd.DataFrame(data, columns=_COLUMNS)
+
+
+def _key_changes(keys: List[str], change: str) -> pd.DataFrame:
+    empty = np.full(len(keys), None, dtype=object)
+    return _changes(np.array(keys, dtype=object), empty, change, empty, empty, empty)
+
+
+def _agg_changes(agg_a: pd.DataFrame, agg_b: pd.DataFrame) -> pd.DataFrame:
+    """Differences of numeric aggregations of the same function, group, column and key."""
+    if agg_a.index.nlevels != agg_b.index.nlevels:
+        agg_a, agg_b = with_group_level(agg_a), with_group_level(agg_b)
+    index = agg_a.index.intersection(agg_b.index, sort=False)
+    columns = agg_a.columns.intersection(agg_b.columns, sort=False)
+    a = _numeric_values(agg_a.reindex(index=index, columns=columns))
+    b = _numeric_values(agg_b.reindex(index=index, columns=columns))
+
+    changed = (a != b) & ~(np.isnan(a) & np.isnan(b))
+    rows, cols = np.nonzero(changed)
+    log_keys = index.get_level_values(_LOG_KEY).to_numpy()[rows] if len(index) else np.array([], dtype=object)
+    stats = index.get_level_values(_AGG_FUNC_NAME).to_numpy()[rows] if len(index) else log_keys
+    if _GROUP in index.names and len(index):
+        groups = index.get_level_values(_GROUP).to_numpy()[rows]
+        stats = np.array(
+            [stat if pd.isna(group) else (group, stat) for group, stat in zip(groups, stats)], dtype=object
+        )
+    return _changes(log_keys, columns.to_numpy()[cols], AGG, stats, a[rows, cols], b[rows, cols])
+
+
+def _dtype_changes(dtypes_a: pd.DataFrame, dtypes_b: pd.DataFrame) -> pd.DataFrame:
+    """Columns whose dtype changed, only for columns that exist in both logs."""
+    index = dtypes_a.index.intersection(dtypes_b.index, sort=False)
+    columns = dtypes_a.columns.intersection(dtypes_b.columns, sort=False)
+    a = dtypes_a.reindex(index=index, columns=columns).to_numpy(dtype=object)
+    b = dtypes_b.reindex(index=index, columns=columns).to_numpy(dtype=object)
+
+    present = pd.notna(a) & pd.notna(b)
+    changed = np.zeros(a.shape, dtype=bool)
+    changed[present] = a[present] != b[present]
+    rows, cols = np.nonzero(changed)
+    return _changes(
+        index.to_numpy()[rows], columns.to_numpy()[cols], DTYPE, np.full(len(rows), None), a[rows, cols], b[rows, cols]
+    )
+
+
+def _shape_changes(shape_a: pd.DataFrame, shape_b: pd.DataFrame) -> pd.DataFrame:
+    index = shape_a.index.intersection(shape_b.index, sort=False)
+    a = shape_a.reindex(index=index).to_numpy(dtype=np.float64)
+    b = shape_b.reindex(index=index).to_numpy(dtype=np.float64)
+
+    # Logs without shape have missing values, which are not compared
+    rows, cols = np.nonzero((a != b) & ~np.isnan(a) & ~np.isnan(b))
+    stats = shape_a.columns.to_numpy()[cols]
+    return _changes(index.to_numpy()[rows], np.full(len(rows), None), SHAPE, stats, a[rows, cols], b[rows, cols])
+
+
+def _column_changes(names_a: pd.DataFrame, names_b: pd.DataFrame) -> pd.DataFrame:
+    index = names_a.index.intersection(names_b.index, sort=False)
+    columns = names_a.columns.union(names_b.columns, sort=False)
+    a = names_a.reindex(index=index, columns=columns, fill_value=False).to_numpy(dtype=bool)
+    b = names_b.reindex(index=index, columns=columns, fill_value=False).to_numpy(dtype=bool)
+
+    parts = []
+    for change, changed in ((COLUMN_ADDED, b & ~a), (COLUMN_REMOVED, a & ~b)):
+        rows, cols = np.nonzero(changed)
+        empty = np.full(len(rows), None, dtype=object)
+        parts.append(_changes(index.to_numpy()[rows], columns.to_numpy()[cols], change, empty, empty, empty))
+    return pd.concat(parts, ignore_index=True)
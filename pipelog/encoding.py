@@ -0,0 +1,44 @@
+from typing import Any
+
+import pandas as pd
+
+from pipelog.fingerprint import column_values
+from pipelog.row_diff import RowHashes
+
+_FRAME = "frame"
+_ROW_HASHES = "row_hashes"
+
+
+def _encode_index(index: pd.Index) -> tuple:
+    if isinstance(index, pd.MultiIndex):
+        return (list(index), list(index.names), True)
+    return (column_values(index), index.name, False)
+
+
+def _decode_index(encoded: tuple) -> pd.Index:
+    values, names, is_multi = encoded
+    if is_multi:
+        return pd.MultiIndex.from_tuples(values, names=names)
+    return pd.Index(values, name=names, tupleize_cols=False)
+
+
+def encode_value(value: Any) -> Any:
+    """Replace DataFrames and RowHashes by tuples of plain arrays and lists, which pickle without pandas internals."""
+    if isinstance(value, pd.DataFrame):
+        columns = [column_values(value.iloc[:, i]) for i in range(value.shape[1])]
+        return (_FRAME, _encode_index(value.index), _encode_index(value.columns), columns)
+    if isinstance(value, RowHashes):
+        return (_ROW_HASHES, value.index, value.content)
+    return value
+
+
+def decode_value(value: Any) -> Any:
+    """Inverse of encode_value."""
+    if isinstance(value, tuple) and len(value) > 0 and value[0] == _FRAME:
+        _, index, columns, arrays = value
+        df = pd.DataFrame(dict(enumerate(arrays)), index=_decode_index(index))
+        df.columns = _decode_index(columns)
+        return df
+    if isinstance(value, tuple) and len(value) > 0 and value[0] == _ROW_HASHES:
+        return RowHashes(value[1], value[2])
+    return value
@@ -0,0 +1,69 @@
+from typing import Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+Fingerprint = Tuple[str, int, int, int]
+
+# Number of evenly spaced values that are hashed for a buffer fingerprint.
+_N_SAMPLED_VALUES = 16
+
+
+def column_values(series: pd.Series) -> Union[np.ndarray, pd.api.extensions.ExtensionArray]:
+    """Returns the values backing a column, a numpy array for numpy dtypes and an ExtensionArray otherwise."""
+    return series.to_numpy() if isinstance(series.dtype, np.dtype) else series.array
+
+
+def hash_rows(series: pd.Series) -> Optional[np.ndarray]:
+    """Hash every value of a column to an uint64, ignoring the index. Returns None for unhashable values."""
+    try:
+        return pd.util.hash_pandas_object(series, index=False).to_numpy()
+    except TypeError:
+        return None
+
+
+def combine_hashes(hashes: np.ndarray) -> Tuple[int, int]:
+    """Combine row hashes into an order sensitive 128 bit hash, as a sum and a position weighted sum."""
+    weights = np.arange(1, 2 * len(hashes), 2, dtype=np.uint64)
+    return int(hashes.sum(dtype=np.uint64)), int(np.multiply(hashes, weights).sum(dtype=np.uint64))
+
+
+def content_fingerprint(series: pd.Series, hashes: np.ndarray = None) -> Optional[Fingerprint]:
+    """Fingerprint of the dtype and all values of a column, or None if its values can't be hashed.
+
+    Two columns with equal fingerprints hold the same values with the same dtype, independent of their index.
+    """
+    hashes = hash_rows(series) if hashes is None else hashes
+    if hashes is None:
+        return None
+    return (str(series.dtype), len(hashes), *combine_hashes(hashes))
+
+
+def buffer_fingerprint(series: pd.Series) -> Optional[Tuple[tuple, np.ndarray]]:
+    """Cheap fingerprint of a column backed by a numpy array, from the identity of its buffer and a few values.
+
+    The fingerprint consists of the address, strides, shape and dtype of the column's array, and a hash of
+    evenly spaced sampled values. Its cost does not depend on the length of the column, but values that are
+    changed in place only change the fingerprint if they are sampled. The address of a buffer may be reused after
+    it was freed, so the array owning the buffer is returned as well. Fingerprints are only valid as long as that
+    array is alive.
+
+    Returns:
+        The fingerprint and the owning array, or None for columns that are not backed by a numpy array.
+    """
+    values = series.values
+    if not isinstance(values, np.ndarray):
+        return None
+    owner = values
+    while isinstance(owner.base, np.ndarray):
+        owner = owner.base
+
+    sampled = values[np.linspace(0, len(values) - 1, min(len(values), _N_SAMPLED_VALUES)).astype(np.intp)]
+    fingerprint = (
+        values.__array_interface__["data"][0],
+        values.strides,
+        values.shape,
+        values.dtype.str,
+        hash(sampled.tobytes()),
+    )
+    return fingerprint, owner
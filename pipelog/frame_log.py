@@ -1,19 +1,123 @@
-from collections import OrderedDict
-from typing import Any, Dict, Tuple, Union
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from collections.abc import Mapping
+from itertools import chain, count
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
+from pipelog.lazy import LazyValue, materialize
+from pipelog.logfile import LogFileWriter, read_log_file
+from pipelog.profiling import StepTiming
+from pipelog.row_diff import RowDiff, RowHashes, row_diff
+from pipelog.schema import MISSING, SCHEMAS, UNRESOLVED, LogMetadata
+from pipelog.snapshot import FrameSnapshot
+from pipelog.storage import DiskStore
+
 _NEW_LOG_KEY = "df_{}".format  # Call with _LOG_KEY(0)
 
 _LOG_KEY = "log_key"
 
 _AGG_FUNC_NAME = "agg_func"
 _COL_NAME = "col_name"
+_GROUP = "group"
 _N_ROWS = "n_rows"
 _N_COLS = "n_cols"
+_BOUND = "bound"
+_LOWER = "lower"
+_UPPER = "upper"
+
+
+class _LazyAttribute:
+    """FrameLog attribute that may still be computed in the background, or that is only loaded on access."""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.private_name = "_" + name
+
+    def __get__(self, obj: "FrameLog", objtype: type = None) -> Any:
+        if obj is None:
+            return self
+        obj.wait()
+        return materialize(getattr(obj, self.private_name))
+
+    def __set__(self, obj: "FrameLog", value: Any) -> None:
+        setattr(obj, self.private_name, value)
+
+
+class _InternedAttribute(_LazyAttribute):
+    """FrameLog attribute that is stored as the id of a value interned in pipelog.schema.SCHEMAS.
+
+    Args:
+        intern (Callable): Returns the id of a value.
+        lookup (Callable): Returns a new copy of the value of an id.
+        lazy (bool): Whether the value may still be computed in the background.
+    """
+
+    def __init__(self, intern: Callable, lookup: Callable, lazy: bool = True) -> None:
+        """Init with the functions of the SchemaTable to use."""
+        self.intern = intern
+        self.lookup = lookup
+        self.lazy = lazy
+
+    def __get__(self, obj: "FrameLog", objtype: type = None) -> Any:
+        if obj is None:
+            return self
+        if self.lazy:
+            obj.wait()
+        value_id = getattr(obj, self.private_name)
+        return None if value_id is None or value_id == UNRESOLVED else self.lookup(value_id)
+
+    def __set__(self, obj: "FrameLog", value: Any) -> None:
+        setattr(obj, self.private_name, None if value is None else self.intern(value))
 
 
 class FrameLog:
+    """Logged values of a single frame.
+
+    Slots instead of an instance dict, and dtypes and column names interned in pipelog.schema.SCHEMAS, keep
+    collections of many logs of the same schema small.
+    """
+
+    __slots__ = (
+        "_pending",
+        "_agg",
+        "agg_axis",
+        "_dtypes",
+        "shape",
+        "_column_names",
+        "_copy",
+        "_sample_size",
+        "_agg_bounds",
+        "_row_hashes",
+        "timing",
+        "fidelity",
+    )
+    _FIELDS = (
+        "agg",
+        "agg_axis",
+        "dtypes",
+        "shape",
+        "column_names",
+        "copy",
+        "sample_size",
+        "agg_bounds",
+        "row_hashes",
+        "timing",
+        "fidelity",
+    )
+
+    agg = _LazyAttribute()
+    dtypes = _InternedAttribute(SCHEMAS.intern_dtypes, SCHEMAS.get_dtypes)
+    column_names = _InternedAttribute(SCHEMAS.intern_names, SCHEMAS.get_names, lazy=False)
+    copy = _LazyAttribute()
+    sample_size = _LazyAttribute()
+    agg_bounds = _LazyAttribute()
+    row_hashes = _LazyAttribute()
+
     def __init__(
         self,
         agg: pd.DataFrame = None,
@@ -21,15 +125,26 @@ class FrameLog:
         dtypes: dict = None,
         shape: Tuple[int, int] = None,
         column_names: list = None,
-        copy: pd.DataFrame = None,
+        copy: Union[pd.DataFrame, FrameSnapshot] = None,
+        sample_size: int = None,
+        agg_bounds: pd.DataFrame = None,
+        row_hashes: RowHashes = None,
+        timing: StepTiming = None,
+        fidelity: str = None,
     ) -> None:
         """Init empty FrameLog"""
+        self._pending = None
         self.agg = agg
         self.agg_axis = agg_axis
         self.dtypes = dtypes
         self.shape = shape
         self.column_names = column_names
         self.copy = copy
+        self.sample_size = sample_size
+        self.agg_bounds = agg_bounds
+        self.row_hashes = row_hashes
+        self.timing = timing
+        self.fidelity = fidelity
 
     def __eq__(self, o: object) -> bool:
         """Checks classical equivalence for all non DataFrame objects, and asserts that all DataFrames
@@ -38,7 +153,7 @@ class FrameLog:
         if not isinstance(o, FrameLog):
             return False
         else:
-            for attr in vars(self).keys():
+            for attr in self._FIELDS:
                 a1, a2 = getattr(self, attr), getattr(o, attr)
                 if isinstance(a1, pd.DataFrame) and isinstance(a2, pd.DataFrame):
                     try:
@@ -52,122 +167,807 @@ class FrameLog:
     def __repr__(self) -> str:
         """Create an easy to read representation of a FrameLog.
         None values will not be added, to make the representation shorter.
+        Values that are still computed in the background are shown as pending.
 
         Example:
             FrameLog(agg=DataFrame(...), axis=1)
         """
+        if self.is_pending:
+            return "FrameLog(<pending>)"
+
         repr_str = []
-        for k, v in dict(vars(self)).items():
+        for k in self._FIELDS:
+            # Private values are shown as they are, so spilled values are not loaded
+            v = getattr(self, f"_{k}" if f"_{k}" in self.__slots__ else k)
+            if v is not None and isinstance(getattr(FrameLog, k, None), _InternedAttribute):
+                # Values of failed background computations stay unresolved
+                v = getattr(self, k) if v != UNRESOLVED else None
             if v is not None:
-                if isinstance(v, pd.DataFrame):
+                if isinstance(v, (pd.DataFrame, LazyValue)):
                     v = "DataFrame(...)"
                 repr_str.append(f"{k}={v}")
 
         return f"FrameLog({', '.join(repr_str)})"
 
+    def __getstate__(self) -> dict:
+        """Pickle interned values themselves, as their ids are only valid within the process."""
+        self.wait()
+        state = {name: getattr(self, name) for name in self.__slots__ if name != "_pending"}
+        state.update(_dtypes=self.dtypes, _column_names=self.column_names)
+        return state
 
-class FrameLogCollection(OrderedDict):
-    """An OrderedDict, which supports slicing, integer access and some custom functionality."""
+    def __setstate__(self, state: dict) -> None:
+        """Intern the values of pickled logs again."""
+        self._pending = None
+        dtypes, column_names = state.pop("_dtypes"), state.pop("_column_names")
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.dtypes = dtypes
+        self.column_names = column_names
 
-    def __init__(self, *args, **kwargs) -> None:
+    @property
+    def is_pending(self) -> bool:
+        """Whether some values are still computed in the background."""
+        return self._pending is not None and not self._pending.done()
+
+    def wait(self) -> None:
+        """Block until all values that are computed in the background are available.
+        Raises the exception of the background computation if it failed.
+        """
+        pending = self._pending
+        if pending is not None:
+            pending.result()
+            self._pending = None
+
+    def spill(self, store: DiskStore) -> None:
+        """Move large DataFrames of this log into store. They are loaded again when they are accessed."""
+        if isinstance(self._agg, pd.DataFrame):
+            self._agg = store.spill(self._agg)
+        if isinstance(self._copy, FrameSnapshot):
+            self._copy.spill(store)
+        elif isinstance(self._copy, pd.DataFrame):
+            self._copy = store.spill(self._copy)
+        if isinstance(self._row_hashes, RowHashes):
+            self._row_hashes.spill(store)
+
+
+class _FrameLogViews:
+    """DataFrame views of all entries, for mappings of keys to FrameLogs."""
+
+    def _get_attr_dict(self, attr: str, keys: Iterable[str] = None) -> Dict[str, Any]:
+        attr_dict = OrderedDict()
+        for k in self.keys() if keys is None else keys:
+            attr_dict[k] = getattr(self[k], attr)
+        return attr_dict
+
+    def _view(self, name: Hashable, build: Callable, extend: Callable = None) -> pd.DataFrame:
+        """Build the view name from all keys. Overwritten by FrameLogCollection to cache views."""
+        return build(list(self.keys()))
+
+    def agg(self, agg_func_first: bool = False) -> pd.DataFrame:
+        """View agg values as a multi index DataFrame.
+
+        If any entry was logged with groupby, the index has an additional group level after log_key, which is None
+        for entries without groups.
+        """
+        if agg_func_first:
+            return self._view(
+                ("agg", agg_func_first),
+                lambda keys: self._sort_agg_func_first(self._build_agg(keys)),
+                extend=self._merge_agg_func_first,
+            )
+        return self._view("agg", self._build_agg, extend=self._concat_agg_views)
+
+    def _build_agg(self, keys: List[str]) -> pd.DataFrame:
+        agg_dict = OrderedDict((k, agg) for k, agg in self._get_attr_dict("agg", keys).items() if agg is not None)
+        if not agg_dict:
+            # e.g. appended logs that were captured without aggregations
+            index = pd.MultiIndex.from_arrays([[], []], names=(_LOG_KEY, _AGG_FUNC_NAME))
+            return pd.DataFrame(index=index, columns=pd.Index([], name=_COL_NAME))
+        aggs = list(agg_dict.values())
+        grouped = any(agg.index.nlevels > 1 for agg in aggs)
+        if grouped:
+            aggs = [with_group_level(agg) for agg in aggs]
+        # Concat with "keys" will result in a multi index for the index
+        agg_concat = pd.concat(aggs, axis=0, keys=agg_dict.keys())
+        # Rename indices
+        agg_concat.columns.name = _COL_NAME
+        agg_concat.index.names = (_LOG_KEY, _GROUP, _AGG_FUNC_NAME) if grouped else (_LOG_KEY, _AGG_FUNC_NAME)
+        if grouped:
+            agg_concat = _set_groups(agg_concat, np.concatenate([_groups(agg.index, 0) for agg in aggs]))
+        return agg_concat
+
+    @classmethod
+    def _sort_agg_func_first(cls, agg_concat: pd.DataFrame) -> pd.DataFrame:
+        names = list(agg_concat.index.names)
+        agg_concat = agg_concat.reorder_levels([_AGG_FUNC_NAME] + [name for name in names if name != _AGG_FUNC_NAME])
+        return cls._group_by_agg_func(agg_concat)
+
+    @classmethod
+    def _merge_agg_func_first(cls, cached: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+        """Merge the rows of new entries, sorted by agg function, into the function groups of the cached view."""
+        return cls._group_by_agg_func(cls._concat_agg_views(cached, new))
+
+    @staticmethod
+    def _group_by_agg_func(view: pd.DataFrame) -> pd.DataFrame:
+        """Group the rows of view by agg function, in order of first occurrence and keeping the log order within.
+
+        ["sum", "min", "sum", "min"] becomes ["sum", "sum", "min", "min"], not ["min", "min", "sum", "sum"].
+        """
+        # Codes are in order of first occurrence. A stable argsort (timsort) keeps the order of the rows of each
+        # function, and merges the sorted runs of a cached and an extended view in linear time.
+        codes = pd.factorize(view.index.get_level_values(_AGG_FUNC_NAME), sort=False)[0]
+        return view.iloc[np.argsort(codes, kind="stable")]  # Will return copy not view
+
+    @classmethod
+    def _concat_agg_views(cls, cached: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+        """Append the agg view of new entries, both get a group level if only one of them has it."""
+        if cached.index.nlevels == new.index.nlevels == 2:
+            return cls._concat_views(cached, new)
+        cached, new = with_group_level(cached), with_group_level(new)
+        groups = [_groups(view.index, view.index.names.index(_GROUP)) for view in (cached, new)]
+        return _set_groups(cls._concat_views(cached, new), np.concatenate(groups))
+
+    def dtypes(self) -> pd.DataFrame:
+        """View dtypes values as a DataFrame."""
+        return self._view("dtypes", self._build_dtypes, extend=self._concat_views)
+
+    def _build_dtypes(self, keys: List[str]) -> pd.DataFrame:
+        metadata, positions = self._metadata(keys, resolve_dtypes=True)
+        log_schemas, schema_ids = pd.factorize(metadata.dtypes_ids[positions], sort=False)
+
+        # Dtype codes of all distinct schemas, -1 where a schema has no column of that name
+        schemas = [SCHEMAS.dtype_schemas[i] if i != MISSING else (None, np.empty(0, np.int32)) for i in schema_ids]
+        rows, columns, names = _union_positions([SCHEMAS.names[i] if i is not None else () for i, _ in schemas])
+        schema_codes = np.full((len(schemas), len(names)), -1, dtype=np.int32)
+        schema_codes[rows, columns] = np.concatenate([codes for _, codes in schemas]) if schemas else []
+
+        # The last dtype is NaN, so code -1 shows missing columns as NaN. Logs without dtypes have None values.
+        dtypes = np.empty(len(SCHEMAS.dtypes) + 1, dtype=object)
+        dtypes[:-1], dtypes[-1] = SCHEMAS.dtypes, np.nan
+        values = dtypes[schema_codes[log_schemas]]
+        values[schema_ids[log_schemas] == MISSING] = None
+
+        index = pd.Index(keys, dtype=object, name=_LOG_KEY)
+        return pd.DataFrame(values, index=index, columns=pd.Index(names, name=_COL_NAME), dtype=object)
+
+    def shape(self) -> pd.DataFrame:
+        """View shape values as a DataFrame."""
+        return self._view("shape", self._build_shape, extend=self._concat_views)
+
+    def _build_shape(self, keys: List[str]) -> pd.DataFrame:
+        metadata, positions = self._metadata(keys)
+        shapes = metadata.shapes[positions]
+        missing = shapes[:, 0] < 0
+        if missing.any():
+            shapes = shapes.astype(object)
+            shapes[missing] = None
+
+        index = pd.Index(keys, dtype=object, name=_LOG_KEY)
+        return pd.DataFrame(shapes, index=index, columns=[_N_ROWS, _N_COLS])
+
+    def timings(self) -> pd.DataFrame:
+        """View the cost of the steps of tracked functions as a DataFrame, with one row per output log.
+
+        Peak memory is only known for loggers with trace_memory=True, it is NaN otherwise.
+        """
+        return self._view("timings", self._build_timings, extend=self._concat_views)
+
+    def _build_timings(self, keys: List[str]) -> pd.DataFrame:
+        timing_dict = {k: timing for k, timing in self._get_attr_dict("timing", keys).items() if timing is not None}
+        index = pd.Index(list(timing_dict), dtype=object)
+        df_timings = pd.DataFrame(
+            np.array(list(timing_dict.values()), dtype=np.float64).reshape(len(index), len(StepTiming._fields)),
+            index=index,
+            columns=StepTiming._fields,
+        )
+
+        df_timings.index.name = _LOG_KEY
+
+        return df_timings
+
+    @staticmethod
+    def _concat_views(cached: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+        """Append the view of new entries to the cached view, keeping columns ordered by first occurrence."""
+        columns = cached.columns.append(new.columns.difference(cached.columns, sort=False))
+        # Empty views have no columns, so their object dtype would be forced onto the values of the other view
+        parts = [view for view in (cached, new) if len(view) > 0] or [cached]
+        view = pd.concat(parts, axis=0).reindex(columns=columns)
+        view.columns.name = cached.columns.name
+        return view
+
+    def row_diff(self, a: Union[str, int], b: Union[str, int]) -> RowDiff:
+        """Compare the rows of the logs a and b, given by key or position. Both need to be logged with row_hashes.
+
+        Returns:
+            RowDiff with the hashes of the index labels, that were added, dropped or modified from a to b.
+            Use pipelog.row_diff.locate to find the labels of the hashes in a frame.
+        """
+        hashes = []
+        for k in (a, b):
+            row_hashes = self[k].row_hashes
+            if row_hashes is None:
+                raise ValueError(f"Log '{k}' has no row hashes, log it with row_hashes=True or 'content'.")
+            hashes.append(row_hashes)
+        return row_diff(*hashes)
+
+    def column_names(self, sparse: bool = False) -> pd.DataFrame:
+        """View column names as a boolean DataFrame, showing which column is present in which log.
+
+        Args:
+            sparse (bool): If True, columns are returned as SparseArrays with fill value True, which needs much less
+                memory when most columns are present in most logs.
+        """
+        return self._view(("column_names", sparse), lambda keys: self._build_column_names(keys, sparse))
+
+    def _build_column_names(self, keys: List[str], sparse: bool) -> pd.DataFrame:
+        # Most logs share their column names with other logs, so the presence is computed once per distinct list.
+        metadata, positions = self._metadata(keys)
+        log_schemas, schema_ids = pd.factorize(metadata.names_ids[positions], sort=False)
+        rows, columns, uniques = _union_positions([SCHEMAS.names[i] if i != MISSING else () for i in schema_ids])
+        schema_present = np.zeros((len(schema_ids), len(uniques)), dtype=bool)
+        schema_present[rows, columns] = True
+        present = schema_present[log_schemas]
+
+        index = pd.Index(keys, dtype=object, name=_LOG_KEY)
+        columns = pd.Index(uniques, dtype=object, name=_COL_NAME)
+        if sparse:
+            data = {i: pd.arrays.SparseArray(present[:, i], fill_value=True) for i in range(len(columns))}
+            df_cols = pd.DataFrame(data, index=index)
+            df_cols.columns = columns
+        else:
+            df_cols = pd.DataFrame(present, index=index, columns=columns)
+
+        return df_cols
+
+
+def with_group_level(agg: pd.DataFrame) -> pd.DataFrame:
+    """Add a group level of None values to an aggregation or agg view without groups.
+
+    The level is inserted after log_key in views, and first in the aggregation of a single log. Aggregations that
+    already have groups are returned as they are.
+    """
+    names = list(agg.index.names)
+    if _GROUP in names or (_LOG_KEY not in names and len(names) > 1):
+        return agg
+    position = names.index(_LOG_KEY) + 1 if _LOG_KEY in names else 0
+    arrays = [agg.index.get_level_values(i) for i in range(len(names))]
+    arrays.insert(position, np.full(len(agg), None, dtype=object))
+    names.insert(position, _GROUP)
+    return agg.set_axis(pd.MultiIndex.from_arrays(arrays, names=names), axis=0)
+
+
+def _groups(index: pd.MultiIndex, level: int) -> np.ndarray:
+    """Values of the group level of index as objects, None for entries without groups."""
+    codes = index.codes[level]
+    groups = np.full(len(codes), None, dtype=object)
+    present = codes >= 0
+    groups[present] = index.levels[level].to_numpy(dtype=object)[codes[present]]
+    return groups
+
+
+def _set_groups(view: pd.DataFrame, groups: np.ndarray) -> pd.DataFrame:
+    """Set the group level of an agg view to groups, as a level of object dtype.
+
+    Concatenating multi indexes infers the dtype of their levels again, which would turn integer groups into floats
+    next to None, and gives views that were extended a different dtype than views that were built at once.
+    """
+    level = view.index.names.index(_GROUP)
+    codes, uniques = pd.factorize(groups)
+    index = view.index.set_levels(
+        pd.Index(uniques, dtype=object, tupleize_cols=False), level=level, verify_integrity=False
+    ).set_codes(codes, level=level, verify_integrity=False)
+    return view.set_axis(index, axis=0)
+
+
+def _union_positions(schemas: List[tuple]) -> Tuple[np.ndarray, np.ndarray, list]:
+    """Position of each name of all schemas in the ordered union of all names.
+
+    Returns:
+        The schema and the union position of each name of the concatenated schemas, and the union.
+    """
+    # Factorizing all names at once gives the position of each name in the ordered union of all names.
+    all_names = list(chain.from_iterable(schemas))
+    codes, uniques = pd.factorize(pd.Index(all_names, dtype=object), sort=False)
+    rows = np.repeat(np.arange(len(schemas)), [len(names) for names in schemas])
+    return rows, codes, list(uniques)
+
+
+class FrameLogCollection(_FrameLogViews, OrderedDict):
+    """An OrderedDict, which supports slicing, integer access and some custom functionality.
+
+    Keys are additionally kept in insertion order in a list, so integer access is O(1) and slicing returns a
+    FrameLogView in O(1), instead of copying all selected entries.
+
+    The DataFrame views agg(), dtypes(), shape() and column_names() are cached until the collection is changed
+    by anything else than appending. Views of appended entries are concatenated to the cached views, so
+    repeated reads don't rebuild them from all entries. The views returned share their data with the cache,
+    copy them before changing their values in place.
+
+    If a DiskStore is given, large DataFrames of all added FrameLogs are spilled to disk and only loaded again
+    when they are accessed. This keeps the memory of long running collections bounded.
+
+    Collections are written to log files with save, which can also keep streaming all later changes to the file,
+    and read again with FrameLogCollection.open. See pipelog.logfile.
+    """
+
+    def __init__(self, *args, store: DiskStore = None, **kwargs) -> None:
         """Overwritten, to initialise additional parameters that should be tracked."""
         # It is important to assign _assignment_counter before super().__init__ because the instantiation might
         # call __setitem__ and will result in not finding this attribute.
         self._assignment_counter = 0
+        self._key_list = []
+        self._key_positions = {}
+        self._view_cache = {}
+        self._log_metadata = LogMetadata()
+        self._writer = None
+        self._path = None
+        self.store = store
         super().__init__(*args, **kwargs)
 
     def __setitem__(self, *args, **kwargs) -> None:
-        """Overwrites the original version, to be able to count assignments."""
-        if not isinstance(args[0], str):
+        """Overwrites the original version, to be able to count assignments and keep the position index."""
+        key = args[0]
+        if not isinstance(key, str):
             raise ValueError("Keys should always be a string to enable unambiguous integer access, e.g. logs[0]")
+        if getattr(self, "store", None) is not None and isinstance(args[1], FrameLog) and args[1]._pending is None:
+            args[1].spill(self.store)
+        is_new = key not in self
         super().__setitem__(*args, **kwargs)
         self._assignment_counter += 1
+        if getattr(self, "_writer", None) is not None:
+            self._write_entry(self._writer, key, args[1])
+        if not is_new:
+            self._view_cache.clear()
+            if self._key_list is not None:
+                self._log_metadata.set(self._key_positions[key], args[1])
+        elif self._key_list is not None:
+            self._key_positions[key] = len(self._key_list)
+            self._key_list.append(key)
+            self._log_metadata.set(self._key_positions[key], args[1])
 
-    def __getitem__(self, k: Union[slice]) -> Any:
+    def __getitem__(self, k: Union[str, int, slice]) -> Any:
         """Overwrites the original version, to be able to get a list like slice with frame_logs[1:3]."""
         if isinstance(k, slice):
-            k_slice = list(self.keys())[k]
-            log_slice = FrameLogCollection()
-            for _k in k_slice:
-                log_slice[_k] = super().__getitem__(_k)
-            return log_slice
-        elif isinstance(k, int):
-            _k = list(self.keys())[k]
-            return super().__getitem__(_k)
+            return FrameLogView(self, range(len(self))[k])
+        elif isinstance(k, (int, np.integer)):
+            return super().__getitem__(self._keys_by_position()[k])
         else:
             return super().__getitem__(k)
 
+    def __delitem__(self, k: str) -> None:
+        """Overwrites the original version, to keep the position index up to date."""
+        super().__delitem__(k)
+        self._invalidate_positions([k])
+
+    def pop(self, *args) -> Any:
+        """Overwrites the original version, to keep the position index up to date."""
+        is_present = args[0] in self
+        value = super().pop(*args)
+        self._invalidate_positions([args[0]] if is_present else [])
+        return value
+
+    def popitem(self, last: bool = True) -> Tuple[str, Any]:
+        """Overwrites the original version, to keep the position index up to date."""
+        item = super().popitem(last=last)
+        self._invalidate_positions([item[0]])
+        return item
+
+    def move_to_end(self, key: str, last: bool = True) -> None:
+        """Overwrites the original version, to keep the position index up to date."""
+        super().move_to_end(key, last=last)
+        self._invalidate_positions()
+        if self._writer is not None:
+            # Log files only append entries, so keys are moved by removing and adding them again
+            keys = [key] if last else [k for k in self.keys()]
+            for k in keys:
+                self._writer.delete(k, self._writer.reserve_version())
+                self._write_entry(self._writer, k, super().__getitem__(k))
+
+    def clear(self) -> None:
+        """Overwrites the original version, to keep the position index up to date."""
+        keys = list(self.keys())
+        super().clear()
+        self._invalidate_positions(keys)
+
+    def position(self, key: str) -> int:
+        """Returns the integer position of key."""
+        self._keys_by_position()
+        return self._key_positions[key]
+
+    def _keys_by_position(self) -> list:
+        """Returns all keys in order. Rebuilt only after entries were removed or moved."""
+        if self._key_list is None:
+            self._key_list = list(self.keys())
+            self._key_positions = {k: i for i, k in enumerate(self._key_list)}
+            self._log_metadata.clear()
+            for i, frame_log in enumerate(self.values()):
+                self._log_metadata.set(i, frame_log)
+        return self._key_list
+
+    def _invalidate_positions(self, removed_keys: List[str] = ()) -> None:
+        self._key_list = None
+        self._key_positions = None
+        self._view_cache.clear()
+        if self._writer is not None:
+            for key in removed_keys:
+                self._writer.delete(key, self._writer.reserve_version())
+
+    def save(self, path: str, stream: bool = False) -> None:
+        """Write all entries into a log file at path, replacing an existing one.
+
+        Args:
+            path (str): Directory of the log file.
+            stream (bool): If True, all later changes of the collection are appended to the log file as well,
+                until save or close_stream is called. Logs that are still computed in the background are written
+                when they are done.
+        """
+        if self._path is not None and os.path.realpath(path) == os.path.realpath(self._path):
+            raise ValueError(f"Can't replace {path}, because values of this collection are read from it.")
+        self.close_stream()
+        writer = LogFileWriter(path)
+        for key, frame_log in self.items():
+            self._write_entry(writer, key, frame_log)
+        if stream:
+            self._writer = writer
+        else:
+            writer.close()
+
+    def close_stream(self) -> None:
+        """Stop streaming changes into the log file of save."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    @classmethod
+    def open(cls, path: str, store: DiskStore = None) -> "FrameLogCollection":
+        """Read a log file written by save.
+
+        Only the index of the file is read right away. Aggregations, copies, bounds and row hashes are read from
+        the file whenever they are accessed, so the file needs to stay in place.
+        """
+        logs = cls(store=store)
+        for key, fields in read_log_file(path).items():
+            logs[key] = FrameLog(**fields)
+        logs._path = path
+        return logs
+
+    @staticmethod
+    def _write_entry(writer: LogFileWriter, key: str, frame_log: FrameLog) -> None:
+        """Write frame_log into writer, once all of its values are computed."""
+        version = writer.reserve_version()
+
+        def _write() -> None:
+            fields = {field: getattr(frame_log, field) for field in FrameLog._FIELDS}
+            writer.write(key, {field: value for field, value in fields.items() if value is not None}, version)
+
+        pending = frame_log._pending
+        if pending is None or pending.done():
+            _write()
+            return
+
+        # Shape and column names are known right away, the entry keeps its position when the rest is written
+        writer.write(key, {"shape": frame_log.shape, "column_names": frame_log.column_names}, version)
+        # Waiting for the log also waits until it is written
+        written = Future()
+        frame_log._pending = written
+
+        def _write_when_done(future: Future) -> None:
+            frame_log._pending = future
+            error = future.exception()
+            if error is None:
+                try:
+                    _write()
+                except Exception as write_error:
+                    error = write_error
+            if error is None:
+                written.set_result(None)
+            else:
+                written.set_exception(error)
+
+        pending.add_done_callback(_write_when_done)
+
+    def _metadata(self, keys: List[str], resolve_dtypes: bool = False) -> Tuple[LogMetadata, np.ndarray]:
+        """Returns the shapes and schema ids of all logs, and the positions of keys in them.
+
+        Args:
+            resolve_dtypes (bool): Whether to wait for dtypes that are still computed in the background. Shapes and
+                column names are always available right away.
+        """
+        self._keys_by_position()
+        positions = np.fromiter((self._key_positions[k] for k in keys), dtype=np.intp, count=len(keys))
+        if resolve_dtypes:
+            self._log_metadata.resolve(positions, self.__getitem__)
+        return self._log_metadata, positions
+
+    def _view(self, name: Hashable, build: Callable, extend: Callable = None) -> pd.DataFrame:
+        """Returns the cached view name, after adding all entries that were appended since it was built.
+
+        Args:
+            name (Hashable): Identifies the view and its arguments in the cache.
+            build (Callable): Builds the view from a list of keys.
+            extend (Callable): Combines the cached view with the view of appended keys. If not given, the view is
+                rebuilt from all keys as soon as entries were appended.
+        """
+        keys = self._keys_by_position()
+        n_cached, view = self._view_cache.get(name, (0, None))
+        if view is None or (n_cached < len(keys) and extend is None):
+            view = build(list(keys))
+        elif n_cached < len(keys):
+            view = extend(view, build(keys[n_cached:]))
+        self._view_cache[name] = (len(keys), view)
+        # A shallow copy, so renaming or adding columns of the result doesn't change the cache
+        return view.copy(deep=False)
+
     def append(self, value: FrameLog, key: str = None) -> str:
-        """Append new entry. If key is not given a new one will be created based on the internal assigment counter."""
+        """Append new entry and return its key.
+
+        If key is not given a new one will be created based on the internal assigment counter.
+        """
         if key is not None and key in self:
             raise KeyError(f"Key '{key}' already exists!")
         elif key is None:
-            self[_NEW_LOG_KEY(self._assignment_counter)] = value
-        else:
-            self[key] = value
+            key = _NEW_LOG_KEY(self._assignment_counter)
+        self[key] = value
+        return key
 
-    def _get_attr_dict(self, attr: str) -> Dict[str, Any]:
-        attr_dict = OrderedDict()
-        for k, v in self.items():
-            attr_dict[k] = getattr(v, attr)
-        return attr_dict
 
-    def agg(self, agg_func_first: bool = False) -> pd.DataFrame:
-        """View agg values as a multi index DataFrame."""
-        agg_dict = self._get_attr_dict("agg")
-        # Concat with "keys" will result in a multi index for the index
-        agg_concat = pd.concat(agg_dict.values(), axis=0, keys=agg_dict.keys())
-        # Rename indices
-        agg_concat.columns.name = _COL_NAME
-        agg_concat.index.names = (_LOG_KEY, _AGG_FUNC_NAME)
+class ThreadSafeFrameLogCollection(FrameLogCollection):
+    """A FrameLogCollection that many threads can append to at once, e.g. from a shared PipeLogger.
 
-        if agg_func_first:
-            agg_concat = agg_concat.swaplevel()
-            # swaplevel() leaves the sorting of both index levels the same, so the new outer index is not grouped.
-            # We need to group same keys, but do want the groups to be ordered by first occurrence, not alphabetically.
-            # ["sum", "min", "sum", "min"] should become ["sum", "sum", "min", "min"] not ["min", "min", "sum", "sum"]
-            agg_func_names = agg_concat.index.get_level_values(_AGG_FUNC_NAME)
-            ordered_index = pd.Index(pd.Categorical(agg_func_names, agg_func_names.unique(), ordered=True))
-            # categories should be: Categories ['sum' < 'min'] so sorting will happen with regard to this ordering
-            sorted_indexer = ordered_index.sort_values(return_indexer=True)[1]
-            agg_concat = agg_concat.iloc[sorted_indexer]  # Will return copy not view
+    append doesn't take a lock. Each thread appends to its own buffer, and every entry gets a sequence number from a
+    counter that all threads share. Default keys come from another shared counter, and given keys are reserved
+    with dict.setdefault, so both are unique without a lock. All buffers are merged into the collection before
+    it is read or changed otherwise, in order of the sequence numbers. A merge holds back entries up to the
+    lowest sequence number that is still being appended, so entries are added in the same order even if they are
+    merged by different reads. Entries that are appended while the collection is read show up in the next read.
+    Views are built under the lock of the merge, other reads like iterating over the keys should not run while
+    another thread reads the collection.
+    """
 
-        return agg_concat
+    def __init__(self, *args, **kwargs) -> None:
+        """Init empty buffers, before entries given as arguments are added."""
+        self._sequence = count()
+        self._key_counter = count()
+        self._buffers = {}
+        self._appending = {}
+        self._held = []
+        self._reserved = {}
+        self._merge_lock = threading.RLock()
+        self._merging = None
+        super().__init__(*args, **kwargs)
 
-    def dtypes(self) -> pd.DataFrame:
-        """View dtypes values as a DataFrame."""
-        dtypes_dict = self._get_attr_dict("dtypes")
-        df_dtypes = pd.DataFrame(dtypes_dict).T
+    def append(self, value: FrameLog, key: str = None) -> str:
+        """Append new entry to the buffer of the calling thread and return its key.
 
-        df_dtypes.index.name = _LOG_KEY
-        df_dtypes.columns.name = _COL_NAME
+        If key is not given a new one will be created based on a counter of default keys.
+        """
+        thread = threading.get_ident()
+        # Announced before the sequence number is taken, so merges wait for entries with lower numbers
+        self._appending[thread] = None
+        try:
+            # next() of a count and dict.setdefault are atomic, so no lock is needed to get unique keys
+            sequence = next(self._sequence)
+            self._appending[thread] = sequence
+            token = object()
+            if key is not None:
+                if self._reserved.setdefault(key, token) is not token:
+                    raise KeyError(f"Key '{key}' already exists!")
+            else:
+                key = _NEW_LOG_KEY(next(self._key_counter))
+                while self._reserved.setdefault(key, token) is not token:
+                    # Taken by an entry with a given key, take another one instead
+                    key = _NEW_LOG_KEY(next(self._key_counter))
+            buffer = self._buffers.get(thread)
+            if buffer is None:
+                buffer = self._buffers.setdefault(thread, deque())
+            buffer.append((sequence, key, value))
+        finally:
+            del self._appending[thread]
+        return key
 
-        return df_dtypes
+    def _merge_limit(self) -> int:
+        """Lowest sequence number whose entry may not be in a buffer yet."""
+        # Entries with higher numbers than a number taken now are appended later
+        limit = next(self._sequence)
+        for thread in list(self._appending):
+            sequence = self._appending.get(thread)
+            while sequence is None and thread in self._appending:
+                # The thread is taking its sequence number, which may be lower than the limit
+                time.sleep(0)
+                sequence = self._appending.get(thread)
+            if sequence is not None:
+                limit = min(limit, sequence)
+        return limit
 
-    def shape(self) -> pd.DataFrame:
-        """View shape values as a DataFrame."""
-        shape_dict = self._get_attr_dict("shape")
-        df_shape = pd.DataFrame(shape_dict).T
+    def merge_buffers(self) -> None:
+        """Add the entries of all threads' buffers to the collection, in order of their sequence numbers."""
+        buffers = list(self._buffers.values())
+        if not (self._held or any(buffers)) or self._merging == threading.get_ident():
+            # Adding entries reads the collection, which must not merge entries of other threads in between
+            return
+        with self._merge_lock:
+            self._merging = threading.get_ident()
+            try:
+                limit = self._merge_limit()
+                entries, self._held = self._held, []
+                for buffer in list(self._buffers.values()):
+                    # popleft is atomic, so entries that other threads append meanwhile stay in their buffer
+                    while buffer:
+                        entries.append(buffer.popleft())
+                for entry in sorted(entries, key=lambda entry: entry[0]):
+                    if entry[0] < limit:
+                        super().__setitem__(entry[1], entry[2])
+                    else:
+                        # An entry with a lower number is still being appended, so this one is added later
+                        self._held.append(entry)
+            finally:
+                self._merging = None
 
-        df_shape.index.name = _LOG_KEY
-        df_shape.columns = [_N_ROWS, _N_COLS]
+    def __setitem__(self, key: str, value: Any) -> None:
+        """Merge all buffers before the entry is set."""
+        with self._merge_lock:
+            self.merge_buffers()
+            self._reserved[key] = None
+            super().__setitem__(key, value)
 
-        return df_shape
+    def __getitem__(self, k: Union[str, int, slice]) -> Any:
+        """Merge all buffers before the entry is read."""
+        self.merge_buffers()
+        return super().__getitem__(k)
 
-    def column_names(self) -> pd.DataFrame:
-        """View shape values as a DataFrame."""
-        columns_names_dict = self._get_attr_dict("column_names")
-        cols = OrderedDict()
-        for v in columns_names_dict.values():
-            cols.update(OrderedDict.fromkeys(v))
+    def __delitem__(self, k: str) -> None:
+        """Merge all buffers before the entry is removed, its key can be used again."""
+        with self._merge_lock:
+            self.merge_buffers()
+            super().__delitem__(k)
+            self._reserved.pop(k, None)
 
-        df_cols = pd.DataFrame(columns=cols, dtype=bool)
+    def __contains__(self, k: object) -> bool:
+        """Merge all buffers before looking up k."""
+        self.merge_buffers()
+        return super().__contains__(k)
 
-        for k, v in columns_names_dict.items():
-            bool_mask = pd.Series(df_cols.columns.isin(v), index=df_cols.columns, name=k)
-            df_cols = df_cols.append(bool_mask)
+    def __len__(self) -> int:
+        """Merge all buffers before counting the entries."""
+        self.merge_buffers()
+        return super().__len__()
 
-        df_cols.columns.name = _COL_NAME
-        df_cols.index.name = _LOG_KEY
+    def __iter__(self) -> Iterator[str]:
+        """Merge all buffers before iterating over the keys."""
+        self.merge_buffers()
+        return super().__iter__()
 
-        return df_cols
+    def __reversed__(self) -> Iterator[str]:
+        """Merge all buffers before iterating over the keys."""
+        self.merge_buffers()
+        return super().__reversed__()
+
+    def __eq__(self, other: object) -> bool:
+        """Merge all buffers before comparing the entries."""
+        self.merge_buffers()
+        return super().__eq__(other)
+
+    def __repr__(self) -> str:
+        """Merge all buffers before showing the entries."""
+        self.merge_buffers()
+        return super().__repr__()
+
+    def keys(self) -> Any:
+        """Merge all buffers before returning the keys."""
+        self.merge_buffers()
+        return super().keys()
+
+    def values(self) -> Any:
+        """Merge all buffers before returning the values."""
+        self.merge_buffers()
+        return super().values()
+
+    def items(self) -> Any:
+        """Merge all buffers before returning the items."""
+        self.merge_buffers()
+        return super().items()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Merge all buffers before the entry is read."""
+        self.merge_buffers()
+        return super().get(key, default)
+
+    def pop(self, *args) -> Any:
+        """Merge all buffers before the entry is removed, its key can be used again."""
+        with self._merge_lock:
+            self.merge_buffers()
+            value = super().pop(*args)
+            self._reserved.pop(args[0], None)
+            return value
+
+    def popitem(self, last: bool = True) -> Tuple[str, Any]:
+        """Merge all buffers before the entry is removed, its key can be used again."""
+        with self._merge_lock:
+            self.merge_buffers()
+            item = super().popitem(last=last)
+            self._reserved.pop(item[0], None)
+            return item
+
+    def move_to_end(self, key: str, last: bool = True) -> None:
+        """Merge all buffers before the entry is moved."""
+        with self._merge_lock:
+            self.merge_buffers()
+            super().move_to_end(key, last=last)
+
+    def clear(self) -> None:
+        """Merge all buffers before all entries are removed, their keys can be used again."""
+        with self._merge_lock:
+            self.merge_buffers()
+            super().clear()
+            self._held.clear()
+            self._reserved.clear()
+
+    def _keys_by_position(self) -> list:
+        """Merge all buffers before positions are looked up, e.g. for views."""
+        self.merge_buffers()
+        return super()._keys_by_position()
+
+    def _view(self, name: Hashable, build: Callable, extend: Callable = None) -> pd.DataFrame:
+        """Merge all buffers and build the view, while no other thread merges."""
+        with self._merge_lock:
+            self.merge_buffers()
+            # Reads of the build must not merge entries that were appended meanwhile, they are not in the view
+            self._merging = threading.get_ident()
+            try:
+                return super()._view(name, build, extend=extend)
+            finally:
+                self._merging = None
+
+    def save(self, path: str, stream: bool = False) -> None:
+        """Merge all buffers before the entries are written."""
+        with self._merge_lock:
+            self.merge_buffers()
+            super().save(path, stream=stream)
+
+
+class FrameLogView(_FrameLogViews, Mapping):
+    """Read only view of a range of positions of a FrameLogCollection, as returned by slicing it.
+
+    The view does not copy any entries. Removing or moving entries of the collection afterwards changes which
+    entries the view shows.
+    """
+
+    def __init__(self, collection: FrameLogCollection, positions: range) -> None:
+        """Init with the viewed collection and positions."""
+        self.collection = collection
+        self.positions = positions
+
+    def __len__(self) -> int:
+        """Number of viewed entries."""
+        return len(self.positions)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the viewed keys in order."""
+        keys = self.collection._keys_by_position()
+        return (keys[i] for i in self.positions)
+
+    def __contains__(self, key: object) -> bool:
+        """Check whether key is part of the view in O(1)."""
+        try:
+            return self.collection.position(key) in self.positions
+        except (KeyError, TypeError):
+            return False
+
+    def __getitem__(self, k: Union[str, int, slice]) -> Any:
+        """Access entries by key, position relative to the view, or slices of the view."""
+        if isinstance(k, slice):
+            return FrameLogView(self.collection, self.positions[k])
+        elif isinstance(k, (int, np.integer)):
+            return self.collection[self.positions[k]]
+        elif k not in self:
+            raise KeyError(k)
+        return self.collection[k]
+
+    def _metadata(self, keys: List[str], resolve_dtypes: bool = False) -> Tuple[LogMetadata, np.ndarray]:
+        """Returns the shapes and schema ids of the collection, and the positions of keys in them."""
+        return self.collection._metadata(keys, resolve_dtypes=resolve_dtypes)
+
+    def __repr__(self) -> str:
+        """Show the viewed keys."""
+        return f"FrameLogView({list(self.keys())})"
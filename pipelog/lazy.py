@@ -0,0 +1,14 @@
+from typing import Any
+
+
+class LazyValue:
+    """Base class for values of a FrameLog that are only computed or loaded when they are accessed."""
+
+    def materialize(self) -> Any:
+        """Returns the actual value."""
+        raise NotImplementedError
+
+
+def materialize(value: Any) -> Any:
+    """Returns the actual value of lazy values and all other values as they are."""
+    return value.materialize() if isinstance(value, LazyValue) else value
@@ -0,0 +1,157 @@
+import itertools
+import os
+import pickle
+import struct
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator
+
+from pipelog.encoding import decode_value, encode_value
+from pipelog.lazy import LazyValue
+
+# Increased whenever the layout of log files changes.
+LOG_FILE_VERSION = 1
+
+_MAGIC = b"PIPELOG"
+_INDEX_FILE = "index.bin"
+_PAYLOAD_FILE = "payloads.bin"
+
+# The index starts with _MAGIC and the version, every record after it is prefixed with its length in bytes.
+_LENGTH = struct.Struct("<Q")
+
+_ENTRY = "entry"
+_DELETE = "delete"
+
+# Small values that are kept in the index. All other values are payloads, which are only read when accessed.
+INDEX_FIELDS = ("agg_axis", "dtypes", "shape", "column_names", "sample_size", "timing", "fidelity")
+
+
+class StoredValue(LazyValue):
+    """Handle of a payload in a log file, which is read and decoded on every access."""
+
+    def __init__(self, path: str, offset: int, length: int) -> None:
+        """Init with the payload file and the position of the payload in it."""
+        self.path = path
+        self.offset = offset
+        self.length = length
+
+    def materialize(self) -> Any:
+        """Read the value from the payload file."""
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(self.length)
+        return decode_value(pickle.loads(data))
+
+    def __repr__(self) -> str:
+        """Show the position of the payload."""
+        return f"StoredValue({self.path}, offset={self.offset})"
+
+
+class LogFileWriter:
+    """Writes entries into a new log file, a directory holding an index and a payload file.
+
+    Both files are only ever appended to. Payloads are written before the index record that references them, so
+    an interrupted write never leaves a record pointing to missing data. Each record is flushed right away, so
+    the file can be read while it is written.
+
+    Every record carries a version, which is reserved when the entry is changed. Records with older versions than
+    an already read record of the same key are skipped, so entries that are written out of order, e.g. when
+    their values were computed in the background, don't overwrite newer ones.
+
+    Args:
+        path (str): Directory of the log file, which is created if needed. An existing log file is replaced.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Create an empty log file."""
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self._index = open(os.path.join(path, _INDEX_FILE), "wb")
+        self._payloads = open(os.path.join(path, _PAYLOAD_FILE), "wb")
+        self._versions = itertools.count()
+        self._lock = threading.Lock()
+        self._index.write(_MAGIC + _LENGTH.pack(LOG_FILE_VERSION))
+        self._index.flush()
+
+    def reserve_version(self) -> int:
+        """Version of the next change of an entry."""
+        return next(self._versions)
+
+    def write(self, key: str, fields: Dict[str, Any], version: int) -> None:
+        """Write the values of an entry, which replace all values of an earlier version of key.
+
+        Args:
+            fields (Dict[str, Any]): Values of the entry by FrameLog field, fields that are not given are None.
+        """
+        with self._lock:
+            index_fields, payloads = {}, {}
+            for field, value in fields.items():
+                if field in INDEX_FIELDS:
+                    index_fields[field] = value
+                else:
+                    data = pickle.dumps(encode_value(value), protocol=pickle.HIGHEST_PROTOCOL)
+                    payloads[field] = (self._payloads.tell(), len(data))
+                    self._payloads.write(data)
+            self._payloads.flush()
+            self._write_record((_ENTRY, key, version, index_fields, payloads))
+
+    def delete(self, key: str, version: int) -> None:
+        """Remove key and all of its earlier versions."""
+        with self._lock:
+            self._write_record((_DELETE, key, version))
+
+    def close(self) -> None:
+        """Close both files, later writes fail."""
+        with self._lock:
+            self._index.close()
+            self._payloads.close()
+
+    def _write_record(self, record: tuple) -> None:
+        data = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        self._index.write(_LENGTH.pack(len(data)) + data)
+        self._index.flush()
+
+
+def read_log_file(path: str) -> Dict[str, Dict[str, Any]]:
+    """Read the index of the log file at path.
+
+    Only the index is read. Payloads, e.g. aggregations and copies, are returned as StoredValues that read them
+    when they are accessed. A truncated last record, e.g. of an interrupted write, is ignored.
+
+    Returns:
+        The fields of each entry, by key in the order the entries were added.
+    """
+    with open(os.path.join(path, _INDEX_FILE), "rb") as f:
+        data = f.read()
+    payload_file = os.path.join(path, _PAYLOAD_FILE)
+
+    header_size = len(_MAGIC) + _LENGTH.size
+    if len(data) < header_size or not data.startswith(_MAGIC):
+        raise ValueError(f"{path} is not a pipelog log file.")
+    (version,) = _LENGTH.unpack_from(data, len(_MAGIC))
+    if version != LOG_FILE_VERSION:
+        raise ValueError(f"{path} has version {version}, but only version {LOG_FILE_VERSION} is known.")
+
+    entries, versions = OrderedDict(), {}
+    for record in _iter_records(data, header_size):
+        kind, key, version = record[:3]
+        if version < versions.get(key, -1):
+            continue
+        versions[key] = version
+        if kind == _DELETE:
+            entries.pop(key, None)
+        else:
+            fields = dict(record[3])
+            fields.update({field: StoredValue(payload_file, *position) for field, position in record[4].items()})
+            # Assigning an existing key keeps its position, like in the collection that was written
+            entries[key] = fields
+    return entries
+
+
+def _iter_records(data: bytes, position: int) -> Iterator[tuple]:
+    while position + _LENGTH.size <= len(data):
+        (length,) = _LENGTH.unpack_from(data, position)
+        start, position = position + _LENGTH.size, position + _LENGTH.size + length
+        if position > len(data):
+            return
+        yield pickle.loads(data[start:position])
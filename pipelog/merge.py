@@ -0,0 +1,143 @@
+from typing import Iterable, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from pipelog.frame_log import FrameLog, FrameLogCollection
+from pipelog.row_diff import RowHashes
+from pipelog.streaming import _MERGE_FUNCS, _merge_values
+
+# Fields that describe a sample or a copy of a single frame, logs with these values can't be combined.
+_UNCOMBINABLE_FIELDS = ("copy", "sample_size", "agg_bounds")
+
+
+def _counts(agg: pd.DataFrame) -> Optional[np.ndarray]:
+    for name in ("notnans", "count"):
+        if name in agg.index:
+            return agg.loc[name].to_numpy(dtype=np.float64)
+    return None
+
+
+def combine_agg(a: pd.DataFrame, b: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """Combine the aggregations of two disjoint parts of the same data into the aggregation of all data.
+
+    count, nans, notnans, sum, min, max and sketches are combined directly. mean needs a count or notnans row,
+    std and var additionally a mean row, as they are combined with the pairwise update of Chan et al.
+
+    Returns:
+        The combined aggregation, or None if a and b have different layouts or any function can't be combined.
+    """
+    if not (a.index.equals(b.index) and a.columns.equals(b.columns) and a.index.is_unique):
+        return None
+    names = list(a.index)
+    if any(name not in _MERGE_FUNCS and name not in ("mean", "std", "var") for name in names):
+        return None
+
+    n_a, n_b = _counts(a), _counts(b)
+    if any(name in ("mean", "std", "var") for name in names) and n_a is None:
+        return None
+    if any(name in ("std", "var") for name in names) and "mean" not in names:
+        return None
+
+    combined = a.copy()
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if "mean" in names:
+            mean_a, mean_b = (agg.loc["mean"].to_numpy(dtype=np.float64) for agg in (a, b))
+            n = n_a + n_b
+            mean = np.where(n_b == 0, mean_a, np.where(n_a == 0, mean_b, (mean_a * n_a + mean_b * n_b) / n))
+        for i, name in enumerate(names):
+            if name in _MERGE_FUNCS:
+                values = _merge_values(_MERGE_FUNCS[name], list(a.iloc[i]), list(b.iloc[i]))
+            elif name == "mean":
+                values = mean
+            else:
+                var_a, var_b = (
+                    (agg.loc["var"] if "var" in names else agg.loc["std"] ** 2).to_numpy(dtype=np.float64)
+                    for agg in (a, b)
+                )
+                # Partitions with less than two values have an undefined variance, but no deviation (m2) at all
+                m2 = np.where(n_a > 1, var_a * (n_a - 1), 0) + np.where(n_b > 1, var_b * (n_b - 1), 0)
+                m2 += np.where((n_a > 0) & (n_b > 0), (mean_b - mean_a) ** 2 * n_a * n_b / n, 0)
+                var = np.where(n > 1, m2 / (n - 1), np.nan)
+                values = var if name == "var" else np.sqrt(var)
+            combined.iloc[i] = values
+    return combined
+
+
+def combine_logs(a: FrameLog, b: FrameLog) -> Optional[FrameLog]:
+    """Combine the logs of two disjoint row partitions of the same frame into the log of all rows.
+
+    Returns:
+        The combined log, or None if the partitions have different schemas, or any of the logged values can't be
+        combined, like copies or aggregations of samples.
+    """
+    if any(getattr(log, field) is not None for log in (a, b) for field in _UNCOMBINABLE_FIELDS):
+        return None
+    if a.agg_axis != b.agg_axis or a.column_names != b.column_names or a.dtypes != b.dtypes:
+        return None
+    if a.fidelity != b.fidelity:
+        return None
+
+    combined = FrameLog(agg_axis=a.agg_axis, column_names=a.column_names, dtypes=a.dtypes, fidelity=a.fidelity)
+    if a.shape is not None or b.shape is not None:
+        if a.shape is None or b.shape is None or a.shape[1] != b.shape[1]:
+            return None
+        combined.shape = (a.shape[0] + b.shape[0], a.shape[1])
+
+    if a.agg is not None or b.agg is not None:
+        if a.agg is None or b.agg is None or a.agg_axis not in (0, "index"):
+            return None
+        combined.agg = combine_agg(a.agg, b.agg)
+        if combined.agg is None:
+            return None
+
+    if a.row_hashes is not None or b.row_hashes is not None:
+        if a.row_hashes is None or b.row_hashes is None:
+            return None
+        index = np.concatenate([a.row_hashes.index, b.row_hashes.index])
+        order = np.argsort(index, kind="stable")
+        content = None
+        if a.row_hashes.content is not None and b.row_hashes.content is not None:
+            content = np.concatenate([a.row_hashes.content, b.row_hashes.content])[order]
+        combined.row_hashes = RowHashes(index[order], content)
+
+    if a.timing is not None and b.timing is not None:
+        combined.timing = a.timing.combine(b.timing)
+
+    return combined
+
+
+def merge_logs(
+    logs: FrameLogCollection, others: Iterable[Mapping[str, FrameLog]], combine: bool = False
+) -> FrameLogCollection:
+    """Merge the logs of workers into logs, e.g. after loading them with pipelog.wire.loads.
+
+    Entries are appended in the order of others and their own order, so the result is deterministic as long as
+    others are given in a fixed order, e.g. by worker or partition number. Keys that already exist get the suffix
+    "@i", with i the position of the worker in others.
+
+    Args:
+        logs (FrameLogCollection): Collection to merge into, it is changed in place.
+        others (Iterable[Mapping[str, FrameLog]]): Collections of the workers.
+        combine (bool): If True, the workers are assumed to process disjoint row partitions of the same data, and
+            logs of existing keys are combined with them if possible, see combine_logs.
+
+    Returns:
+        logs
+    """
+    for i, other in enumerate(others):
+        for key, frame_log in other.items():
+            if key not in logs:
+                logs.append(frame_log, key=key)
+                continue
+
+            combined = combine_logs(logs[key], frame_log) if combine else None
+            if combined is not None:
+                logs[key] = combined
+                continue
+
+            new_key, n = f"{key}@{i}", 1
+            while new_key in logs:
+                new_key, n = f"{key}@{i}_{n}", n + 1
+            logs.append(frame_log, key=new_key)
+    return logs
@@ -1,10 +1,34 @@
-from functools import wraps
-from typing import Any, Union
+import asyncio
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+from itertools import count
+from typing import Any, Awaitable, Callable, Hashable, Iterable, Iterator, List, Union
 
 import pandas as pd
 
+from pipelog.adapters import FrameAdapter, get_adapter, is_frame
+from pipelog.agg_cache import ColumnAggCache
+from pipelog.agg_engine import aggregate, group_aggregate, parallel_aggregate, resolve_func_names
+from pipelog.budget import CHEAP, SAMPLED, SKIPPED, OverheadBudget, frame_work, parse_budget
 from pipelog.custom_agg_funcs import CustomAggFuncs
-from pipelog.frame_log import FrameLog, FrameLogCollection
+from pipelog.frame_log import FrameLog, FrameLogCollection, ThreadSafeFrameLogCollection
+from pipelog.profiling import StepTiming, profile_call, profile_coroutine
+from pipelog.row_diff import RowHashes
+from pipelog.sampling import (
+    FixedSizeSampler,
+    ReservoirSampler,
+    RowSampler,
+    estimate_population,
+    parse_sample,
+    parse_stream_sample,
+)
+from pipelog.schema import SCHEMAS, UNRESOLVED
+from pipelog.slicing import IndexerCache
+from pipelog.snapshot import SnapshotStore
+from pipelog.storage import DiskStore
+from pipelog.streaming import ChunkAggregator, common_dtypes
 
 
 class PipeLogger:
@@ -18,8 +42,57 @@ class PipeLogger:
         shape: bool = None,
         column_names: bool = None,
         copy: bool = None,
+        sample: Union[int, float, RowSampler] = None,
+        store: DiskStore = None,
+        background: bool = False,
+        max_workers: int = 1,
+        row_hashes: Union[bool, str] = None,
+        agg_cache: int = None,
+        n_jobs: int = None,
+        trace_memory: bool = False,
+        budget: Union[float, OverheadBudget] = None,
+        budget_sample: int = 1000,
+        log_file: str = None,
+        groupby: Union[Hashable, List[Hashable]] = None,
+        thread_safe: bool = False,
     ) -> None:
-        """Init with default values for all logging and tracking."""
+        """Init with default values for all logging and tracking.
+
+        Args:
+            sample (Union[int, float, RowSampler]): If given, aggregations, dtypes and copies are computed on a
+                sample of rows. An int samples a fixed number of rows, a float a fraction of all rows.
+                A ReservoirSampler samples the rows of all chunks of log_chunks, and a single frame in log_frame.
+            store (DiskStore): If given, large aggregations and copies are spilled to disk and loaded on access.
+            background (bool): If True, log_frame only logs shape and column names right away, and computes all
+                other values on a thread pool with max_workers threads. Accessing these values waits for them.
+                The frame is referenced with a shallow copy, so changing its values in place before they are
+                computed will show up in the log. Adding, removing and replacing columns is safe.
+            row_hashes (Union[bool, str]): If True or "index", hashes of all index labels are logged, with "content"
+                also hashes of the values of each row. Compare the rows of two logs with logs.row_diff(a, b).
+            agg_cache (int): If given, the aggregations of up to agg_cache columns are cached, and reused for
+                columns that are backed by the same memory as in an earlier log. Values changed in place are only
+                noticed by chance, see pipelog.agg_cache.ColumnAggCache.
+            n_jobs (int): If greater than 1, the columns of wide frames are split into n_jobs ranges, which are
+                aggregated concurrently on a thread pool. See pipelog.agg_engine.parallel_aggregate.
+            trace_memory (bool): If True, tracked functions additionally log the peak of memory they allocate,
+                measured with tracemalloc. This slows down the tracked functions, while their wall and CPU times
+                are always logged. See logs.timings().
+            budget (Union[float, OverheadBudget]): If given, the fraction of wall time since the first log that
+                logging may use, e.g. 0.02 for 2%. Whenever a log would exceed it, log_frame steps down from logging
+                all values to a sample of budget_sample rows without row hashes, then to shape, dtypes and column
+                names only, then to skipping the frame. The level of each log is stored in its fidelity. In
+                background mode only the time that log_frame blocks is counted. See pipelog.budget.OverheadBudget.
+            budget_sample (int): Number of rows that are sampled at the fidelity level "sampled".
+            log_file (str): If given, all logs are streamed into a log file in this directory while they are logged,
+                which is replaced on reset. See FrameLogCollection.save and FrameLogCollection.open.
+            groupby (Union[Hashable, List[Hashable]]): If given, one or more column labels whose groups are
+                aggregated separately, e.g. per tenant or date. All groups are aggregated in one pass over the frame,
+                see pipelog.agg_engine.group_aggregate. Groups show up as an additional level of logs.agg().
+                Aggregations per group can't be sampled, so budgets skip the fidelity level "sampled".
+            thread_safe (bool): If True, many threads can log with the tracker at once, e.g. the workers of a thread
+                pool. Logs are appended to per thread buffers without a lock, and merged in the order they were
+                logged when logs are read. See pipelog.frame_log.ThreadSafeFrameLogCollection.
+        """
         self.indices = indices
         self.columns = columns
         self.agg_func = agg_func
@@ -28,16 +101,59 @@ class PipeLogger:
         self.shape = shape
         self.column_names = column_names
         self.copy = copy
+        self.sample = parse_sample(sample)
+        self.store = store
+        self.background = background
+        self.max_workers = max_workers
+        self.row_hashes = row_hashes
+        self.agg_cache = agg_cache
+        self.n_jobs = n_jobs
+        self.trace_memory = trace_memory
+        self.budget = budget
+        self.budget_sample = budget_sample
+        self.log_file = log_file
+        self.groupby = groupby
+        self.thread_safe = thread_safe
 
-        self.logs = FrameLogCollection()
+        self.logs = self._new_collection()
+        if log_file is not None:
+            self.logs.save(log_file, stream=True)
+        self._snapshots = SnapshotStore()
+        self._agg_cache = ColumnAggCache(agg_cache) if agg_cache else None
+        self._indexers = IndexerCache()
+        self._budget = parse_budget(budget)
+        self._executor = None
+        self._agg_executor = None
+        self._lock = threading.Lock()
 
     def reset(self) -> None:
         """Reset all variables that can be set during tracking."""
-        self.logs = FrameLogCollection()
+        self.logs.close_stream()
+        self.logs = self._new_collection()
+        if self.log_file is not None:
+            self.logs.save(self.log_file, stream=True)
+        self._snapshots = SnapshotStore()
+        self._agg_cache = ColumnAggCache(self.agg_cache) if self.agg_cache else None
+        if self._budget is not None:
+            self._budget.reset()
+
+    def wait(self) -> None:
+        """Block until all logs that are computed in the background are complete."""
+        for frame_log in list(self.logs.values()):
+            frame_log.wait()
+
+    def close(self) -> None:
+        """Wait for all background logs and shut down the background and aggregation threads."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._agg_executor is not None:
+            self._agg_executor.shutdown()
+            self._agg_executor = None
 
     def log_frame(
         self,
-        df: pd.DataFrame,
+        df: Any,
         key: str = None,
         indices: list = None,
         columns: list = None,
@@ -47,10 +163,59 @@ class PipeLogger:
         shape: bool = None,
         column_names: bool = None,
         copy: bool = None,
+        sample: Union[int, float, RowSampler] = None,
+        row_hashes: Union[bool, str] = None,
         return_result: bool = None,
+        timing: StepTiming = None,
+        groupby: Union[Hashable, List[Hashable]] = None,
     ) -> None:
-        """Append frame statistics to the frame_logs depending on the given arguments."""
+        """Append frame statistics to the frame_logs depending on the given arguments.
+
+        Frames of other libraries, e.g. pyarrow Tables or Polars DataFrames, are logged with their adapter without
+        converting them to pandas, see pipelog.adapters. Their indices are row positions. Aggregations, dtypes and
+        copies of them can't be sampled, and row hashes and groupby are not supported.
+
+        Args:
+            df (Any): A pandas DataFrame or a frame of a registered adapter.
+            timing (StepTiming): Cost of the step that returned df, which is stored in the log as it is.
+            groupby (Union[Hashable, List[Hashable]]): Column labels whose groups are aggregated separately.
+        """
+        frame_log = self._build_log(
+            df,
+            indices=indices,
+            columns=columns,
+            agg_func=agg_func,
+            agg_axis=agg_axis,
+            dtypes=dtypes,
+            shape=shape,
+            column_names=column_names,
+            copy=copy,
+            sample=sample,
+            row_hashes=row_hashes,
+            timing=timing,
+            groupby=groupby,
+        )
+        self.logs.append(value=frame_log, key=key)
+        if return_result:
+            return frame_log
 
+    def _build_log(
+        self,
+        df: Any,
+        indices: list = None,
+        columns: list = None,
+        agg_func: Union[callable, str, list, dict] = None,
+        agg_axis: int = 0,
+        dtypes: bool = None,
+        shape: bool = None,
+        column_names: bool = None,
+        copy: bool = None,
+        sample: Union[int, float, RowSampler] = None,
+        row_hashes: Union[bool, str] = None,
+        timing: StepTiming = None,
+        groupby: Union[Hashable, List[Hashable]] = None,
+    ) -> FrameLog:
+        """Log df like log_frame, but return the log instead of appending it to the logs."""
         indices = self.indices if indices is None else indices
         columns = self.columns if columns is None else columns
         agg_func = self.agg_func if agg_func is None else agg_func
@@ -59,40 +224,270 @@ class PipeLogger:
         shape = self.shape if shape is None else shape
         column_names = self.column_names if column_names is None else column_names
         copy = self.copy if copy is None else copy
+        sampler = self.sample if sample is None else parse_sample(sample)
+        row_hashes = self.row_hashes if row_hashes is None else row_hashes
+        if row_hashes not in (None, False, True, "index", "content"):
+            raise ValueError(f"row_hashes should be a bool, 'index' or 'content', got {row_hashes!r}.")
+        groupby = self.groupby if groupby is None else groupby
+        if groupby is not None:
+            groupby = list(groupby) if isinstance(groupby, list) else [groupby]
+            if sampler is not None:
+                raise ValueError("Aggregations per group can't be sampled, use either groupby or sample.")
+            if agg_axis not in (0, "index"):
+                raise ValueError(f"Groups can only be aggregated along the index, got axis {agg_axis!r}.")
+        adapter = get_adapter(df)
+        if adapter is not None:
+            unsupported = dict(sample=sampler, row_hashes=row_hashes or None, groupby=groupby)
+            unsupported = [name for name, value in unsupported.items() if value is not None]
+            if unsupported or agg_axis not in (0, "index"):
+                raise ValueError(
+                    f"Frames of type {type(df).__name__} are only aggregated along the index, without "
+                    f"{', '.join(unsupported) or 'axis'}."
+                )
+        n_rows, n_cols = adapter.shape(df) if adapter is not None else df.shape
+
+        fidelity = None
+        if self._budget is not None:
+            started = self._budget.clock()
+            work = frame_work(n_rows, n_cols, sample_rows=self.budget_sample)
+            if groupby is not None or adapter is not None:
+                del work[SAMPLED]
+            fidelity = self._budget.choose(work)
+            if fidelity == SAMPLED:
+                # Row hashes would be computed for all rows, so they are skipped like copies
+                sampler = sampler if sampler is not None else FixedSizeSampler(self.budget_sample)
+                copy, row_hashes = None, None
+            elif fidelity in (CHEAP, SKIPPED):
+                agg_func, copy, sampler, row_hashes = None, None, None, None
+                dtypes = shape = column_names = fidelity == CHEAP
+
+        kwargs = dict(agg_axis=agg_axis, indices=indices, columns=columns, dtypes=dtypes, copy=copy, sampler=sampler)
+        kwargs.update(row_hashes=row_hashes, groupby=groupby, adapter=adapter)
 
-        frame_log = FrameLog()
+        frame_log = FrameLog(timing=timing, fidelity=fidelity)
 
         # We log present shape and columns_names before slicing, because returning those when
         # indices and columns are provided already gives little information.
         # Additionally this could give the wrong impression of a changing shape or number of columns.
         if shape:
-            frame_log.shape = df.shape
+            frame_log.shape = (n_rows, n_cols)
         if column_names:
-            frame_log.column_names = list(df.columns)
+            frame_log.column_names = adapter.column_names(df) if adapter is not None else list(df.columns)
+
+        if agg_func is not None:
+            frame_log.agg_axis = agg_axis
+
+        if self.background:
+            # A shallow copy protects the log from columns that are added, dropped or replaced in the meantime.
+            # Frames of adapters are not copied, as pyarrow Tables and Polars DataFrames are immutable.
+            df = df.copy(deep=False) if adapter is None else df
+            if dtypes:
+                # Marks dtypes as not yet known, so views that don't need them don't wait for the log
+                frame_log._dtypes = UNRESOLVED
+            frame_log._pending = self._get_executor().submit(self._log_values, frame_log, df, agg_func, **kwargs)
+        else:
+            self._log_values(frame_log, df, agg_func, **kwargs)
+
+        if fidelity is not None:
+            self._budget.record(fidelity, work[fidelity], self._budget.clock() - started)
+        return frame_log
+
+    def log_chunks(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        key: str = None,
+        indices: list = None,
+        columns: list = None,
+        agg_func: Union[callable, str, list] = None,
+        dtypes: bool = None,
+        shape: bool = None,
+        column_names: bool = None,
+        copy: bool = None,
+        sample: Union[int, ReservoirSampler] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Log a frame that is given as an iterable of row chunks, e.g. pd.read_csv(..., chunksize=n).
+
+        Returns a generator that passes all chunks on unchanged. While it is consumed, a single FrameLog under
+        key is kept up to date with all chunks so far, and equals the log of their concatenation in the end.
+        The concatenated frame is never built, aggregations are merged from partial statistics of the chunks.
+        See pipelog.streaming.ChunkAggregator for the aggregations that can be streamed.
+
+        Aggregations are always computed along the index. Copies are only logged for sampled chunks.
+
+        Args:
+            sample (Union[int, ReservoirSampler]): If given, aggregations and copies are computed on a uniform sample
+                of all chunks so far, kept in a reservoir of that many rows. Aggregations are extrapolated with
+                confidence bounds like the ones of log_frame, and don't need to be mergeable. Defaults to the
+                tracker's sample if it is a ReservoirSampler.
+        """
+        indices = self.indices if indices is None else indices
+        columns = self.columns if columns is None else columns
+        agg_func = self.agg_func if agg_func is None else agg_func
+        dtypes = self.dtypes if dtypes is None else dtypes
+        shape = self.shape if shape is None else shape
+        column_names = self.column_names if column_names is None else column_names
+        copy = self.copy if copy is None else copy
+        if sample is None and isinstance(self.sample, ReservoirSampler):
+            sample = self.sample
+        reservoir = parse_stream_sample(sample)
+
+        # Created right away, so unsupported aggregations raise before any chunk is consumed
+        func_list = self._parse_agg_func(agg_func) if agg_func is not None else None
+        aggregator = ChunkAggregator(func_list) if func_list is not None and reservoir is None else None
+
+        def _log_chunks() -> Iterator[pd.DataFrame]:
+            frame_log, log_key, n_rows, chunk_dtypes = FrameLog(), None, 0, None
+            n_sliced_rows = 0
+            if reservoir is not None:
+                reservoir.reset()
+            for chunk in chunks:
+                df = chunk
+                if indices is not None or columns is not None:
+                    df = self._slice_df(df, indices, columns)
+
+                n_rows += len(chunk)
+                n_sliced_rows += len(df)
+                if shape:
+                    frame_log.shape = (n_rows, chunk.shape[1])
+                if column_names and log_key is None:
+                    frame_log.column_names = list(chunk.columns)
+                if aggregator is not None:
+                    aggregator.update(df)
+                    frame_log.agg_axis = 0
+                    frame_log._agg = aggregator.result()
+                if reservoir is not None:
+                    df_sample = reservoir.update(df)
+                    frame_log._sample_size = len(df_sample)
+                    if func_list is not None:
+                        frame_log.agg_axis = 0
+                        frame_log._agg, frame_log._agg_bounds = estimate_population(
+                            df_sample, aggregate(df_sample, func_list), n_sliced_rows, reservoir.confidence
+                        )
+                    if copy:
+                        frame_log._copy = self._snapshots.snapshot(df_sample)
+                if dtypes:
+                    chunk_dtypes = df.dtypes if chunk_dtypes is None else common_dtypes(chunk_dtypes, df.dtypes)
+                    frame_log._dtypes = SCHEMAS.intern_dtypes(chunk_dtypes)
+
+                # Assigning the log again lets the collection know that it changed
+                if log_key is None:
+                    log_key = self.logs.append(value=frame_log, key=key)
+                else:
+                    self.logs[log_key] = frame_log
+                yield chunk
+
+        return _log_chunks()
+
+    def _log_values(
+        self,
+        frame_log: FrameLog,
+        df: pd.DataFrame,
+        agg_func: Union[callable, str, list, dict],
+        agg_axis: int,
+        indices: list,
+        columns: list,
+        dtypes: bool,
+        copy: bool,
+        sampler: RowSampler,
+        row_hashes: Union[bool, str],
+        groupby: List[Hashable] = None,
+        adapter: FrameAdapter = None,
+    ) -> FrameLog:
+        """Compute all values of frame_log that need more than the frame's metadata."""
+        if adapter is not None:
+            return self._log_adapter_values(frame_log, df, adapter, agg_func, indices, columns, dtypes, copy)
+
+        # Like shape, rows are hashed before slicing so all rows of the frame can be compared.
+        if row_hashes:
+            frame_log._row_hashes = RowHashes.from_frame(df, content=row_hashes == "content")
 
         if indices is not None or columns is not None:
+            if columns is not None and groupby is not None:
+                columns = list(columns) + [label for label in groupby if label not in columns]
             df = self._slice_df(df, indices, columns)
 
+        n_rows = len(df)
+        if sampler is not None:
+            df = sampler.sample(df)
+            frame_log._sample_size = len(df)
+
         if agg_func is not None:
             func_list = self._parse_agg_func(agg_func)
-            frame_log.agg = df.agg(func=func_list, axis=agg_axis)
-            frame_log.agg_axis = agg_axis
+            aggregator = aggregate
+            if self.n_jobs is not None and self.n_jobs > 1:
+                aggregator = partial(parallel_aggregate, executor=self._get_agg_executor(), n_chunks=self.n_jobs)
+            if groupby is not None:
+                frame_log._agg = group_aggregate(df, groupby, func_list)
+            elif self._agg_cache is not None:
+                frame_log._agg = self._agg_cache.aggregate(df, func_list, axis=agg_axis, aggregator=aggregator)
+            else:
+                frame_log._agg = aggregator(df, func_list, axis=agg_axis)
+            if sampler is not None and agg_axis in (0, "index"):
+                frame_log._agg, frame_log._agg_bounds = estimate_population(
+                    df, frame_log._agg, n_rows, sampler.confidence
+                )
         if dtypes:
-            frame_log.dtypes = dict(df.dtypes)
+            frame_log._dtypes = SCHEMAS.intern_dtypes(df.dtypes)
         if copy:
-            frame_log.copy = df.copy()
+            # Only columns and rows that changed since earlier copies are stored, the rest is shared with them.
+            frame_log._copy = self._snapshots.snapshot(df)
 
-        self.logs.append(value=frame_log, key=key)
-        if return_result:
-            return frame_log
+        if self.background and self.store is not None:
+            frame_log.spill(self.store)
+        return frame_log
 
-    @staticmethod
-    def _slice_df(df: pd.DataFrame, indices: list, columns: list) -> pd.DataFrame:
-        """Slicing dataframe without running into missing index errors."""
-        cols = df.columns.intersection(pd.Index(columns)) if columns is not None else df.columns
-        idx = df.index.intersection(pd.Index(indices)) if indices is not None else df.index
+    def _log_adapter_values(
+        self,
+        frame_log: FrameLog,
+        df: Any,
+        adapter: FrameAdapter,
+        agg_func: Union[callable, str, list],
+        indices: list,
+        columns: list,
+        dtypes: bool,
+        copy: bool,
+    ) -> FrameLog:
+        """Compute the values of frame_log for a frame of adapter, with the kernels of its library."""
+        if indices is not None or columns is not None:
+            df = adapter.slice(df, indices, columns)
 
-        return df.loc[idx, cols]
+        if agg_func is not None:
+            func_names = resolve_func_names(self._parse_agg_func(agg_func), allowed=adapter.agg_funcs)
+            if func_names is None:
+                raise ValueError(
+                    f"{adapter} only aggregates a list of the functions {', '.join(adapter.agg_funcs)}. "
+                    f"Got {agg_func!r} instead."
+                )
+            frame_log._agg = adapter.aggregate(df, func_names)
+        if dtypes:
+            frame_log._dtypes = SCHEMAS.intern_dtypes(adapter.dtypes(df))
+        if copy:
+            frame_log._copy = self._snapshots.snapshot(adapter.to_pandas(df))
+
+        if self.background and self.store is not None:
+            frame_log.spill(self.store)
+        return frame_log
+
+    def _new_collection(self) -> FrameLogCollection:
+        collection_cls = ThreadSafeFrameLogCollection if self.thread_safe else FrameLogCollection
+        return collection_cls(store=self.store)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pipelog")
+        return self._executor
+
+    def _get_agg_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._agg_executor is None:
+                self._agg_executor = ThreadPoolExecutor(max_workers=self.n_jobs, thread_name_prefix="pipelog_agg")
+            return self._agg_executor
+
+    def _slice_df(self, df: pd.DataFrame, indices: list, columns: list) -> pd.DataFrame:
+        """Slicing dataframe without running into missing index errors."""
+        return self._indexers.slice(df, indices, columns)
 
     @staticmethod
     def _parse_agg_func(agg_func: Union[callable, str, list, dict]) -> Union[list, dict]:
@@ -131,36 +526,76 @@ class PipeLogger:
         return _agg_func
 
     def track(self) -> callable:
-        """Returns a decorator to be used for tracking the input and output of a function."""
+        """Returns a decorator to be used for tracking the input and output of a function.
+
+        The log of the output additionally holds the wall time, CPU time and optionally the peak memory of the
+        function call, see logs.timings().
+
+        Coroutine functions are awaited. Their logs are computed in the default executor of the running event
+        loop, so aggregating large frames doesn't block other tasks, and appended to the logs on the loop's thread.
+        Each call of a coroutine function logs under keys of its own, which are reserved when the call starts, so
+        calls can run concurrently: the n-th call logs its input as "<name>_#<2n - 1>" and its output as
+        "<name>_#<2n>".
+        """
 
         def track_decorator(func: callable) -> callable:
+            if inspect.iscoroutinefunction(func):
+                return self._track_coroutine(func)
+
             @wraps(func)
             def wrapper_decorator(*args, **kwargs) -> Any:
-
-                df_1 = [*args, *kwargs.values()][0]  # args could be empty, so collecting all values.
-                if not isinstance(df_1, pd.DataFrame):
-                    raise TypeError(
-                        f"The first argument of '{func.__name__}' should be a pandas.DataFrame."
-                        f" Got {type(df_1)} instead."
-                    )
-                else:
-                    self.log_frame(df_1, key=f"{func.__name__}_#1")
-
-                out = func(*args, **kwargs)
-
-                # Unpacking the first return value in case we get a tuple
-                # We can't use implicit unpacking like df_2, *rest = func(..) because DataFrames can also be unpacked.
-                df_2 = out[0] if isinstance(out, tuple) else out
-                if not isinstance(df_2, pd.DataFrame):
-                    raise TypeError(
-                        f"The first return value of '{func.__name__}' should be a pandas.DataFrame."
-                        f" Got {type(df_2)} instead."
-                    )
-                else:
-                    self.log_frame(df_2, key=f"{func.__name__}_#2")
-
+                self.log_frame(self._input_frame(func, args, kwargs), key=f"{func.__name__}_#1")
+                out, timing = profile_call(func, args, kwargs, trace_memory=self.trace_memory)
+                self.log_frame(self._output_frame(func, out), key=f"{func.__name__}_#2", timing=timing)
                 return out
 
             return wrapper_decorator
 
         return track_decorator
+
+    def _track_coroutine(self, func: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+        calls = count()
+
+        @wraps(func)
+        async def wrapper_decorator(*args, **kwargs) -> Any:
+            # next() of a count is atomic, so concurrent calls get distinct keys
+            n_logs = 2 * next(calls)
+            loop = asyncio.get_running_loop()
+            df_1 = self._input_frame(func, args, kwargs)
+            # The input is logged before the step runs, as the step may change it
+            frame_log = await loop.run_in_executor(None, self._build_log, df_1)
+            self.logs.append(value=frame_log, key=f"{func.__name__}_#{n_logs + 1}")
+
+            out, timing = await profile_coroutine(func, args, kwargs, trace_memory=self.trace_memory)
+            df_2 = self._output_frame(func, out)
+            frame_log = await loop.run_in_executor(None, partial(self._build_log, df_2, timing=timing))
+            self.logs.append(value=frame_log, key=f"{func.__name__}_#{n_logs + 2}")
+            return out
+
+        return wrapper_decorator
+
+    @staticmethod
+    def _input_frame(func: callable, args: tuple, kwargs: dict) -> Any:
+        """The first argument of a tracked call, which needs to be a frame."""
+        df_1 = [*args, *kwargs.values()][0]  # args could be empty, so collecting all values.
+        if not is_frame(df_1):
+            raise TypeError(
+                f"The first argument of '{func.__name__}' should be a pandas.DataFrame or a frame of an"
+                " adapter, see pipelog.adapters."
+                f" Got {type(df_1)} instead."
+            )
+        return df_1
+
+    @staticmethod
+    def _output_frame(func: callable, out: Any) -> Any:
+        """The first return value of a tracked call, which needs to be a frame."""
+        # Unpacking the first return value in case we get a tuple
+        # We can't use implicit unpacking like df_2, *rest = func(..) because DataFrames can also be unpacked.
+        df_2 = out[0] if isinstance(out, tuple) else out
+        if not is_frame(df_2):
+            raise TypeError(
+                f"The first return value of '{func.__name__}' should be a pandas.DataFrame or a frame of an"
+                " adapter, see pipelog.adapters."
+                f" Got {type(df_2)} instead."
+            )
+        return df_2
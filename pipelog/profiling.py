@@ -0,0 +1,107 @@
+import threading
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, NamedTuple, Optional, Tuple
+
+
+class StepTiming(NamedTuple):
+    """Cost of one call of a tracked function.
+
+    wall_time and cpu_time are in seconds. cpu_time is the time of the whole process, so it includes threads that
+    the function starts, but also threads that log in the background meanwhile. peak_memory is the peak of memory
+    allocated by Python during the call in bytes, or None if memory was not traced.
+    """
+
+    wall_time: float
+    cpu_time: float
+    peak_memory: Optional[int] = None
+
+    def combine(self, other: "StepTiming") -> "StepTiming":
+        """Timing of two calls on partitions of the same data, e.g. in different processes.
+
+        Times are summed, the peak memory is the larger peak of both calls.
+        """
+        peaks = [peak for peak in (self.peak_memory, other.peak_memory) if peak is not None]
+        return StepTiming(
+            wall_time=self.wall_time + other.wall_time,
+            cpu_time=self.cpu_time + other.cpu_time,
+            peak_memory=max(peaks) if peaks else None,
+        )
+
+
+class _CallProfiler:
+    """Context manager that measures the cost of the code it runs, see profile_call.
+
+    Profilers that trace memory count how many of them are active. The first one starts tracemalloc, unless it is
+    already tracing, and the last one to exit stops it again, so calls that overlap, e.g. awaited steps, are traced
+    until all of them are done.
+    """
+
+    _n_tracing = 0
+    _started_tracing = False
+    _tracing_lock = threading.Lock()
+
+    def __init__(self, trace_memory: bool) -> None:
+        """Init with whether to trace memory."""
+        self.trace_memory = trace_memory
+        self.timing = None
+
+    def __enter__(self) -> "_CallProfiler":
+        if self.trace_memory:
+            cls = _CallProfiler
+            with cls._tracing_lock:
+                if cls._n_tracing == 0:
+                    if not tracemalloc.is_tracing():
+                        tracemalloc.start()
+                        cls._started_tracing = True
+                    elif hasattr(tracemalloc, "reset_peak"):
+                        tracemalloc.reset_peak()
+                # The peak is not reset while other calls are traced, so their peaks stay valid
+                cls._n_tracing += 1
+                self._memory_before = tracemalloc.get_traced_memory()[0]
+        self._wall_start, self._cpu_start = time.perf_counter(), time.process_time()
+        return self
+
+    def __exit__(self, exc_type: type, exc: BaseException, traceback: Any) -> None:
+        wall_time, cpu_time = time.perf_counter() - self._wall_start, time.process_time() - self._cpu_start
+        peak_memory = None
+        if self.trace_memory:
+            cls = _CallProfiler
+            with cls._tracing_lock:
+                peak_memory = tracemalloc.get_traced_memory()[1] - self._memory_before
+                cls._n_tracing -= 1
+                if cls._n_tracing == 0 and cls._started_tracing:
+                    tracemalloc.stop()
+                    cls._started_tracing = False
+        if exc is None:
+            self.timing = StepTiming(wall_time, cpu_time, peak_memory)
+
+
+def profile_call(func: Callable, args: tuple, kwargs: dict, trace_memory: bool = False) -> Tuple[Any, StepTiming]:
+    """Call func(*args, **kwargs) and measure its cost.
+
+    Args:
+        trace_memory (bool): Whether to measure the peak memory with tracemalloc, which slows down allocations
+            considerably while the function runs. If tracemalloc is already tracing, its peak is reset. Calls
+            that overlap with other profiled calls, nested or concurrent, share the peak since the first of them
+            started, so their peaks may be too high.
+
+    Returns:
+        The result of func and its StepTiming.
+    """
+    with _CallProfiler(trace_memory) as profiler:
+        out = func(*args, **kwargs)
+    return out, profiler.timing
+
+
+async def profile_coroutine(
+    func: Callable[..., Awaitable], args: tuple, kwargs: dict, trace_memory: bool = False
+) -> Tuple[Any, StepTiming]:
+    """Await func(*args, **kwargs) and measure its cost like profile_call.
+
+    Other tasks of the event loop run while func is suspended. The wall time includes the time func waits, and
+    the CPU time and peak memory include the cost of the other tasks meanwhile.
+    """
+    with _CallProfiler(trace_memory) as profiler:
+        out = await func(*args, **kwargs)
+    return out, profiler.timing
@@ -0,0 +1,135 @@
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pipelog.lazy import materialize
+from pipelog.storage import DiskStore
+
+
+class RowHashes:
+    """Hashes of the index labels of a frame sorted by value, and optionally of the content of each row.
+
+    Takes 8 bytes per row for the index and 8 more for the content, instead of a copy of the frame. Rows with the
+    same index label keep their order in the frame.
+
+    Args:
+        index (np.ndarray): Sorted uint64 hashes of the index labels.
+        content (np.ndarray): uint64 hashes of the row values, in the same order as index.
+    """
+
+    def __init__(self, index: np.ndarray, content: np.ndarray = None) -> None:
+        """Init with already sorted hashes."""
+        self._index = index
+        self._content = content
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, content: bool = False) -> "RowHashes":
+        """Hash the index of df, and the values of each row if content is True.
+
+        Content hashes are skipped for frames with unhashable values, like lists.
+        """
+        index_hashes = pd.util.hash_pandas_object(df.index).to_numpy()
+        content_hashes = None
+        if content:
+            try:
+                content_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+            except TypeError:
+                pass
+
+        if content_hashes is None:
+            return cls(np.sort(index_hashes))
+        order = np.argsort(index_hashes, kind="stable")
+        return cls(index_hashes[order], content_hashes[order])
+
+    @property
+    def index(self) -> np.ndarray:
+        """Sorted hashes of the index labels."""
+        return materialize(self._index)
+
+    @property
+    def content(self) -> Optional[np.ndarray]:
+        """Hashes of the row values, aligned with index."""
+        return materialize(self._content)
+
+    def spill(self, store: DiskStore) -> None:
+        """Move large hash arrays into store."""
+        self._index = store.spill(self._index)
+        self._content = store.spill(self._content)
+
+    def __len__(self) -> int:
+        """Number of hashed rows."""
+        return len(self.index)
+
+    def __eq__(self, other: object) -> bool:
+        """Hashes are equal if they hash the same labels and contents."""
+        if not isinstance(other, RowHashes):
+            return False
+        a, b = self.content, other.content
+        same_content = (a is None and b is None) or (a is not None and b is not None and np.array_equal(a, b))
+        return same_content and np.array_equal(self.index, other.index)
+
+    def __repr__(self) -> str:
+        """Show the number of hashed rows."""
+        return f"RowHashes(n={len(self)}, content={self._content is not None})"
+
+
+class RowDiff(NamedTuple):
+    """Index label hashes of the rows that were added, dropped or modified between two logs.
+
+    modified is None if any of both logs has no content hashes. Use locate to find the labels of the hashes.
+    """
+
+    added: np.ndarray
+    dropped: np.ndarray
+    modified: Optional[np.ndarray]
+
+
+def _match(sorted_a: np.ndarray, sorted_b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Positions of the hashes that are in both sorted arrays, in a and in b.
+
+    A stable sort of both arrays after another only merges two sorted runs, which takes linear time. Equal hashes
+    end up next to each other, the ones of a first. Hashes of duplicated labels are matched as multisets, the k-th
+    occurrence in a with the k-th occurrence in b.
+    """
+    merged = np.concatenate([sorted_a, sorted_b])
+    order = np.argsort(merged, kind="stable")
+    merged = merged[order]
+
+    starts = np.flatnonzero(np.concatenate([[True], merged[1:] != merged[:-1]]))
+    sizes = np.diff(np.append(starts, len(merged)))
+    n_a = np.add.reduceat(order < len(sorted_a), starts) if len(merged) > 0 else np.empty(0, dtype=np.intp)
+    n_pairs = np.minimum(n_a, sizes - n_a)
+
+    # Position of the j-th pair of each group, counted from the start of the group
+    offsets = np.arange(n_pairs.sum()) - np.repeat(np.cumsum(n_pairs) - n_pairs, n_pairs)
+    first = np.repeat(starts, n_pairs) + offsets
+    return order[first], order[first + np.repeat(n_a, n_pairs)] - len(sorted_a)
+
+
+def row_diff(a: RowHashes, b: RowHashes) -> RowDiff:
+    """Compare the rows of two hashed frames a and b.
+
+    Returns:
+        RowDiff with the hashes of labels only in b (added), only in a (dropped), and labels in both, whose row
+        values changed (modified).
+    """
+    index_a, index_b = a.index, b.index
+    positions_a, positions_b = _match(index_a, index_b)
+    in_b = np.zeros(len(index_a), dtype=bool)
+    in_b[positions_a] = True
+    in_a = np.zeros(len(index_b), dtype=bool)
+    in_a[positions_b] = True
+
+    modified = None
+    content_a, content_b = a.content, b.content
+    if content_a is not None and content_b is not None:
+        modified = index_a[positions_a[content_a[positions_a] != content_b[positions_b]]]
+
+    return RowDiff(added=index_b[~in_a], dropped=index_a[~in_b], modified=modified)
+
+
+def locate(index: pd.Index, hashes: np.ndarray) -> pd.Index:
+    """Returns the labels of index with the given hashes, e.g. the dropped labels of a RowDiff."""
+    index_hashes = pd.util.hash_pandas_object(index).to_numpy()
+    return index[np.isin(index_hashes, hashes)]
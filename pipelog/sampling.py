@@ -0,0 +1,211 @@
+from statistics import NormalDist
+from typing import Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype
+
+from pipelog.frame_log import _AGG_FUNC_NAME, _BOUND, _LOWER, _UPPER
+
+# Aggregations that scale with the number of rows and have to be extrapolated from a sample to the full frame.
+_EXTENSIVE_FUNCS = ("count", "notnans", "nans", "sum")
+
+
+class RowSampler:
+    """Base class for selecting the rows that statistics are computed on.
+
+    Args:
+        confidence (float): Confidence level of the bounds that are logged for sampled statistics.
+        random_state: Seed or numpy Generator, as accepted by numpy.random.default_rng.
+    """
+
+    def __init__(self, confidence: float = 0.95, random_state: Union[int, np.random.Generator] = None) -> None:
+        """Init random number generator."""
+        if not 0 < confidence < 1:
+            raise ValueError(f"confidence should be between 0 and 1. Got {confidence} instead.")
+        self.confidence = confidence
+        self._rng = np.random.default_rng(random_state)
+
+    def sample_size(self, n_rows: int) -> int:
+        """Number of rows that will be sampled from a frame with n_rows rows."""
+        raise NotImplementedError
+
+    def sample(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Return a sample of df with its rows in the original order. df itself is returned if no row is dropped."""
+        n_rows = len(df)
+        size = self.sample_size(n_rows)
+        if size >= n_rows:
+            return df
+        positions = np.sort(self._rng.choice(n_rows, size=size, replace=False))
+        return df.take(positions)
+
+    def __repr__(self) -> str:
+        """Show the sampling parameters."""
+        params = ", ".join(f"{k}={v}" for k, v in vars(self).items() if not k.startswith("_"))
+        return f"{type(self).__name__}({params})"
+
+
+class FixedSizeSampler(RowSampler):
+    """Samples a fixed number of rows, so the cost of computing statistics does not grow with the frame."""
+
+    def __init__(self, n: int, **kwargs) -> None:
+        """Init with the number of rows to sample."""
+        if n < 1:
+            raise ValueError(f"n should be a positive number of rows. Got {n} instead.")
+        self.n = n
+        super().__init__(**kwargs)
+
+    def sample_size(self, n_rows: int) -> int:
+        """Never more than n rows."""
+        return min(self.n, n_rows)
+
+
+class FractionSampler(RowSampler):
+    """Samples a fixed fraction of all rows."""
+
+    def __init__(self, frac: float, **kwargs) -> None:
+        """Init with the fraction of rows to sample."""
+        if not 0 < frac <= 1:
+            raise ValueError(f"frac should be between 0 and 1. Got {frac} instead.")
+        self.frac = frac
+        super().__init__(**kwargs)
+
+    def sample_size(self, n_rows: int) -> int:
+        """At least one row of every non empty frame is sampled."""
+        return min(max(int(round(self.frac * n_rows)), 1), n_rows)
+
+
+class ReservoirSampler(FixedSizeSampler):
+    """Keeps a uniform sample of at most n rows over a stream of frames.
+
+    Every row gets a random priority and the reservoir holds the n rows with the lowest priorities seen so far,
+    which makes reservoirs of different streams mergeable. For a single frame this is the same as sampling n rows.
+    """
+
+    def __init__(self, n: int, **kwargs) -> None:
+        """Init empty reservoir."""
+        super().__init__(n, **kwargs)
+        self.reset()
+
+    def reset(self) -> None:
+        """Empty the reservoir."""
+        self.reservoir = None
+        self._priorities = np.array([], dtype=np.float64)
+
+    def update(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Offer all rows of df to the reservoir and return the updated reservoir."""
+        priorities = np.concatenate([self._priorities, self._rng.random(len(df))])
+        frames = [df] if self.reservoir is None else [self.reservoir, df]
+        candidates = pd.concat(frames) if len(frames) > 1 else df
+
+        if len(candidates) > self.n:
+            keep = np.sort(np.argpartition(priorities, self.n - 1)[: self.n])
+            candidates, priorities = candidates.take(keep), priorities[keep]
+
+        self.reservoir, self._priorities = candidates, priorities
+        return self.reservoir
+
+
+def parse_sample(sample: Union[int, float, RowSampler, None]) -> Optional[RowSampler]:
+    """Turn the sample argument of PipeLogger into a RowSampler.
+
+    Args:
+        sample (Union[int, float, RowSampler, None]): An int samples a fixed number of rows, a float a fraction of
+            all rows. A RowSampler, e.g. a ReservoirSampler, is used as it is.
+    """
+    if sample is None or isinstance(sample, RowSampler):
+        return sample
+    if isinstance(sample, (bool, np.bool_)):
+        raise TypeError("sample should be an int, float or RowSampler, not a bool.")
+    if isinstance(sample, (int, np.integer)):
+        return FixedSizeSampler(int(sample))
+    if isinstance(sample, (float, np.floating)):
+        return FractionSampler(float(sample))
+    raise TypeError(f"sample should be an int, float or RowSampler. Got {type(sample)} instead.")
+
+
+def parse_stream_sample(sample: Union[int, RowSampler, None]) -> Optional[ReservoirSampler]:
+    """Turn the sample argument of PipeLogger.log_chunks into a ReservoirSampler.
+
+    Args:
+        sample (Union[int, RowSampler, None]): An int or a FixedSizeSampler keeps a reservoir of that many rows.
+            Fractions can't be sampled from a stream of unknown length.
+    """
+    sampler = parse_sample(sample)
+    if sampler is None or isinstance(sampler, ReservoirSampler):
+        return sampler
+    if isinstance(sampler, FixedSizeSampler):
+        return ReservoirSampler(sampler.n, confidence=sampler.confidence)
+    raise ValueError(f"Only a fixed number of rows can be sampled from chunks. Got {sampler} instead.")
+
+
+def estimate_population(
+    df_sample: pd.DataFrame, agg: pd.DataFrame, n_rows: int, confidence: float
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Extrapolate the aggregations of a sample to the full frame and compute their confidence bounds.
+
+    Counts and sums are scaled from the sample to the full frame, sums of columns that are neither numeric nor bool
+    are set to NaN. Bounds are based on the normal approximation with finite population correction, and are only
+    computed for count, notnans, nans, sum and mean.
+
+    Args:
+        df_sample (pd.DataFrame): Sampled rows the aggregations were computed on.
+        agg (pd.DataFrame): Aggregations of df_sample, with one row per aggregation function.
+        n_rows (int): Number of rows of the full frame.
+        confidence (float): Confidence level of the bounds.
+
+    Returns:
+        The extrapolated aggregations, and a DataFrame with a (agg_func, bound) index holding lower and upper bounds.
+    """
+    n_sample = len(df_sample)
+    if n_sample == 0:
+        return agg, None
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    fpc = np.sqrt((n_rows - n_sample) / (n_rows - 1)) if n_rows > 1 else 0.0
+
+    p_notna = df_sample.notna().mean()
+    count_error = z * n_rows * np.sqrt(p_notna * (1 - p_notna) / n_sample) * fpc
+
+    # pandas counts timedeltas as numbers, but they can't be filled with 0 or scaled like them
+    numeric = df_sample.select_dtypes(include=["number", "bool"], exclude="timedelta")
+    # Sums of bools count their True values, which are extrapolated like numbers
+    numeric = numeric.apply(lambda column: column.astype(np.float64) if is_bool_dtype(column) else column)
+    estimates = {
+        "count": (n_rows * p_notna, count_error),
+        "notnans": (n_rows * p_notna, count_error),
+        "nans": (n_rows * (1 - p_notna), count_error),
+    }
+    if len(numeric.columns) > 0:
+        filled = numeric.fillna(0)
+        mean_error = z * numeric.std() / np.sqrt(numeric.count()) * fpc
+        sum_error = z * n_rows * filled.std() / np.sqrt(n_sample) * fpc
+        estimates["sum"] = (n_rows * filled.mean(), sum_error)
+        estimates["mean"] = (numeric.mean(), mean_error)
+
+    scale = n_rows != n_sample
+    agg = agg.copy()
+    bounds = {}
+    for name, (estimate, error) in estimates.items():
+        if name not in agg.index:
+            continue
+        cols = estimate.index.intersection(agg.columns)
+        if scale and name in _EXTENSIVE_FUNCS:
+            int_cols = [c for c in cols if agg[c].dtype.kind in "iub"]
+            agg = agg.astype({c: np.float64 for c in int_cols})
+            agg.loc[name, cols] = estimate[cols].values
+        bounds[(name, _LOWER)] = (estimate - error)[cols]
+        bounds[(name, _UPPER)] = (estimate + error)[cols]
+
+    # Sums of all other columns, e.g. concatenated strings, can't be extrapolated and are dropped
+    if scale and "sum" in agg.index:
+        unscaled = ~agg.columns.isin(numeric.columns)
+        if unscaled.any():
+            agg.loc["sum", unscaled] = np.nan
+
+    if not bounds:
+        return agg, None
+
+    agg_bounds = pd.DataFrame(bounds).T.reindex(columns=agg.columns).astype(np.float64)
+    agg_bounds.index.names = (_AGG_FUNC_NAME, _BOUND)
+    return agg, agg_bounds
@@ -0,0 +1,146 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# Ids of logs without a value, and of dtypes that are still computed in the background.
+MISSING = -1
+UNRESOLVED = -2
+
+
+def _key(value: Any) -> Hashable:
+    """Lookup key of value, unhashable values are only found again as the very same object."""
+    try:
+        hash(value)
+    except TypeError:
+        return ("unhashable", id(value))
+    # The type is part of the key, as some dtypes are equal to strings or to dtypes of other types
+    return (type(value), value)
+
+
+class SchemaTable:
+    """Interns column names and dtypes, so logs of frames with the same schema share a single copy of it.
+
+    Every distinct dtype is stored once and referenced by a small integer code. Column names are stored as one
+    tuple per distinct list of names, dtypes as the id of their column names and an array of dtype codes. Both are
+    referenced by integer ids, which are only valid within the process. Interned schemas are never removed.
+    """
+
+    def __init__(self) -> None:
+        """Init empty table."""
+        self.dtypes: List[Any] = []
+        self.names: List[tuple] = []
+        self.dtype_schemas: List[Tuple[int, np.ndarray]] = []
+        self._dtype_codes = {}
+        self._names_ids = {}
+        self._dtype_schema_ids = {}
+        self._lock = threading.Lock()
+
+    def dtype_code(self, dtype: Any) -> int:
+        """Code of dtype, which is added to the table if it is new."""
+        return self._intern(self._dtype_codes, self.dtypes, _key(dtype), dtype)
+
+    def intern_names(self, names: Iterable) -> int:
+        """Id of the column names, which are added to the table if they are new."""
+        names = tuple(names)
+        return self._intern(self._names_ids, self.names, _key(names), names)
+
+    def intern_dtypes(self, dtypes: Union[Mapping, pd.Series]) -> int:
+        """Id of the dtypes of all columns, given as a mapping of column names to dtypes, e.g. DataFrame.dtypes."""
+        if isinstance(dtypes, pd.Series):
+            names, values = dtypes.index, dtypes.to_numpy()
+        else:
+            names, values = dtypes.keys(), dtypes.values()
+        names_id = self.intern_names(names)
+        codes = np.fromiter((self.dtype_code(dtype) for dtype in values), dtype=np.int32)
+        key = (names_id, codes.tobytes())
+        return self._intern(self._dtype_schema_ids, self.dtype_schemas, key, (names_id, codes))
+
+    def _intern(self, ids: dict, values: list, key: Hashable, value: Any) -> int:
+        value_id = ids.get(key)
+        if value_id is None:
+            with self._lock:
+                value_id = ids.get(key)
+                if value_id is None:
+                    # The value is appended before its id is published, so other threads never see a missing value
+                    value_id = len(values)
+                    values.append(value)
+                    ids[key] = value_id
+        return value_id
+
+    def get_names(self, names_id: int) -> list:
+        """Column names of names_id as a new list."""
+        return list(self.names[names_id])
+
+    def get_dtypes(self, schema_id: int) -> Dict[Any, Any]:
+        """Dtypes of schema_id as a new dict of column names to dtypes."""
+        names_id, codes = self.dtype_schemas[schema_id]
+        return {name: self.dtypes[code] for name, code in zip(self.names[names_id], codes)}
+
+
+# Table of all FrameLogs of the process, so logs of different collections share their schemas as well.
+SCHEMAS = SchemaTable()
+
+
+class LogMetadata:
+    """Shapes and schema ids of the logs of a collection, in integer arrays aligned with the logs' positions.
+
+    Shapes of logs without shape are (-1, -1), ids of logs without the value are MISSING, and ids of dtypes that
+    are still computed in the background are UNRESOLVED until resolve is called.
+    """
+
+    def __init__(self) -> None:
+        """Init without logs."""
+        self.n = 0
+        self._shapes = np.empty((0, 2), dtype=np.int64)
+        self._names_ids = np.empty(0, dtype=np.int32)
+        self._dtypes_ids = np.empty(0, dtype=np.int32)
+
+    @property
+    def shapes(self) -> np.ndarray:
+        """Shapes of all logs, as an array of n_rows and n_cols."""
+        return self._shapes[: self.n]
+
+    @property
+    def names_ids(self) -> np.ndarray:
+        """Ids of the column names of all logs in SCHEMAS."""
+        return self._names_ids[: self.n]
+
+    @property
+    def dtypes_ids(self) -> np.ndarray:
+        """Ids of the dtypes of all logs in SCHEMAS."""
+        return self._dtypes_ids[: self.n]
+
+    def set(self, position: int, frame_log: Any) -> None:
+        """Store the metadata of frame_log at position, which may be one past the last position to append it."""
+        if position == self.n:
+            if self.n == len(self._names_ids):
+                self._grow(max(2 * self.n, 16))
+            self.n += 1
+
+        shape = getattr(frame_log, "shape", None)
+        self._shapes[position] = shape[:2] if shape is not None else (-1, -1)
+        names_id = getattr(frame_log, "_column_names", None)
+        self._names_ids[position] = names_id if names_id is not None else MISSING
+        # Logs that compute dtypes in the background hold UNRESOLVED until they are done
+        dtypes_id = getattr(frame_log, "_dtypes", None)
+        self._dtypes_ids[position] = dtypes_id if dtypes_id is not None else MISSING
+
+    def resolve(self, positions: np.ndarray, get_log: Callable[[int], Any]) -> None:
+        """Wait for the dtypes of all logs at positions that are still computed in the background."""
+        for position in positions[self._dtypes_ids[positions] == UNRESOLVED]:
+            frame_log = get_log(position)
+            frame_log.wait()
+            self.set(position, frame_log)
+
+    def clear(self) -> None:
+        """Remove the metadata of all logs."""
+        self.__init__()
+
+    def _grow(self, capacity: int) -> None:
+        shapes = np.empty((capacity, 2), dtype=np.int64)
+        shapes[: self.n] = self.shapes
+        names_ids, dtypes_ids = np.empty(capacity, dtype=np.int32), np.empty(capacity, dtype=np.int32)
+        names_ids[: self.n], dtypes_ids[: self.n] = self.names_ids, self.dtypes_ids
+        self._shapes, self._names_ids, self._dtypes_ids = shapes, names_ids, dtypes_ids
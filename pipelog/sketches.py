@@ -0,0 +1,201 @@
+from typing import Iterable, Union
+
+import numpy as np
+import pandas as pd
+
+_EMPTY = np.empty(0, dtype=np.float64)
+
+
+class HyperLogLog:
+    """HyperLogLog sketch estimating the number of distinct values, with a relative error of about 1.04 / 2^(p/2).
+
+    The sketch needs 2^p bytes, no matter how many values are added. Missing values are not counted, like in
+    Series.nunique(). Sketches of different chunks of data can be merged into the sketch of all their values.
+
+    Args:
+        p (int): Precision, the number of hash bits that select a register. Between 4 and 18.
+    """
+
+    def __init__(self, p: int = 12) -> None:
+        """Init an empty sketch."""
+        if not 4 <= p <= 18:
+            raise ValueError(f"p should be between 4 and 18, got {p}.")
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    @classmethod
+    def from_values(cls, values: Union[pd.Series, np.ndarray], p: int = 12) -> "HyperLogLog":
+        """Create the sketch of all values."""
+        sketch = cls(p)
+        sketch.update(values)
+        return sketch
+
+    def update(self, values: Union[pd.Series, np.ndarray]) -> None:
+        """Add values to the sketch."""
+        values = pd.Series(values) if not isinstance(values, pd.Series) else values
+        hashes = pd.util.hash_pandas_object(values.dropna(), index=False).to_numpy()
+
+        # The first p bits select the register, the position of the first set bit in the others is its rank.
+        n_rest = 64 - self.p
+        register = (hashes >> np.uint64(n_rest)).astype(np.intp)
+        # Floats represent integers of up to 53 bits exactly, so their exponent is the bit length. Lower bits of
+        # longer remainders only matter for ranks above 52, which are too unlikely to be worth the exact count.
+        n_dropped = max(n_rest - 52, 0)
+        rest = (hashes >> np.uint64(n_dropped)) & np.uint64((1 << (n_rest - n_dropped)) - 1)
+        bit_length = np.frexp(rest.astype(np.float64))[1] + np.where(rest > 0, n_dropped, 0)
+        rank = (n_rest + 1 - bit_length).astype(np.uint8)
+        np.maximum.at(self.registers, register, rank)
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Returns the sketch of the values of both sketches."""
+        if other.p != self.p:
+            raise ValueError(f"Can't merge sketches with different precisions {self.p} and {other.p}.")
+        merged = HyperLogLog(self.p)
+        merged.registers = np.maximum(self.registers, other.registers)
+        return merged
+
+    def estimate(self) -> float:
+        """Estimated number of distinct values."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        n_zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and n_zeros > 0:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * np.log(m / n_zeros)
+        return float(estimate)
+
+    def __float__(self) -> float:
+        """Estimated number of distinct values."""
+        return self.estimate()
+
+    def __eq__(self, other: object) -> bool:
+        """Sketches are equal if all their registers are equal."""
+        if not isinstance(other, HyperLogLog):
+            return False
+        return self.p == other.p and np.array_equal(self.registers, other.registers)
+
+    def __repr__(self) -> str:
+        """Show the estimate."""
+        return f"HyperLogLog(~{self.estimate():.0f})"
+
+
+class KLLSketch:
+    """KLL sketch of the distribution of numeric values, to estimate quantiles with bounded memory.
+
+    Values are kept in a hierarchy of compactors, where each value of level h stands for 2^h added values. Full
+    compactors are sorted and every second value is promoted to the next level. With k values for the top level,
+    the rank error of estimated quantiles is about 1.7 / k, and the sketch holds less than 3 * k values.
+    Missing values are ignored, minimum and maximum are tracked exactly. Sketches of different chunks of data can
+    be merged into the sketch of all their values.
+
+    Args:
+        k (int): Capacity of the top level compactor.
+        seed (int): Seed of the random choice of promoted values. A fixed seed makes sketches reproducible.
+    """
+
+    def __init__(self, k: int = 200, seed: int = 0) -> None:
+        """Init an empty sketch."""
+        self.k = k
+        self.n = 0
+        self.levels = [_EMPTY]
+        self.minimum = np.nan
+        self.maximum = np.nan
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def from_values(cls, values: Union[pd.Series, np.ndarray], k: int = 200) -> "KLLSketch":
+        """Create the sketch of all values."""
+        sketch = cls(k)
+        sketch.update(values)
+        return sketch
+
+    def update(self, values: Union[pd.Series, np.ndarray]) -> None:
+        """Add numeric values to the sketch."""
+        values = pd.Series(values) if not isinstance(values, pd.Series) else values
+        if not (pd.api.types.is_numeric_dtype(values.dtype) or pd.api.types.is_bool_dtype(values.dtype)):
+            raise TypeError(f"Quantiles can only be sketched for numeric values, got {values.dtype}.")
+        values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        values = np.sort(values[~np.isnan(values)])
+        if len(values) == 0:
+            return
+
+        self.n += len(values)
+        self.minimum = np.fmin(self.minimum, values[0])
+        self.maximum = np.fmax(self.maximum, values[-1])
+
+        # Large batches are compacted on their own first, which needs no sorting because they are sorted already.
+        level = 0
+        while len(values) > self.k:
+            keep = len(values) % 2
+            self._add(level, values[len(values) - keep :])
+            values = values[self._rng.integers(2) : len(values) - keep : 2]
+            level += 1
+        self._add(level, values)
+        self._compress()
+
+    def _add(self, level: int, values: np.ndarray) -> None:
+        self.levels.extend([_EMPTY] * (level + 1 - len(self.levels)))
+        self.levels[level] = np.concatenate([self.levels[level], values])
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(int(np.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) <= self._capacity(level):
+                level += 1
+                continue
+            items = np.sort(items)
+            # An odd value stays at its level, so the total weight of all values is preserved.
+            keep = len(items) % 2
+            self.levels[level] = items[len(items) - keep :]
+            self._add(level + 1, items[self._rng.integers(2) : len(items) - keep : 2])
+            # Adding a level lowers the capacity of all levels below, so they are checked again.
+            level = 0
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Returns the sketch of the values of both sketches."""
+        merged = KLLSketch(max(self.k, other.k))
+        n_levels = max(len(self.levels), len(other.levels))
+        levels_a = self.levels + [_EMPTY] * (n_levels - len(self.levels))
+        levels_b = other.levels + [_EMPTY] * (n_levels - len(other.levels))
+        merged.levels = [np.concatenate([a, b]) for a, b in zip(levels_a, levels_b)]
+        merged.n = self.n + other.n
+        merged.minimum = np.fmin(self.minimum, other.minimum)
+        merged.maximum = np.fmax(self.maximum, other.maximum)
+        merged._compress()
+        return merged
+
+    def quantile(self, q: Union[float, Iterable[float]]) -> Union[float, np.ndarray]:
+        """Estimated quantiles q of all added values, NaN if no value was added."""
+        qs = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        if self.n == 0:
+            result = np.full(len(qs), np.nan)
+        else:
+            items = np.concatenate(self.levels)
+            weights = np.concatenate([np.full(len(level), 2 ** h) for h, level in enumerate(self.levels)])
+            order = np.argsort(items, kind="stable")
+            items, cum_weights = items[order], np.cumsum(weights[order])
+            positions = np.searchsorted(cum_weights, qs * cum_weights[-1], side="left")
+            result = items[np.minimum(positions, len(items) - 1)]
+            result = np.where(qs <= 0, self.minimum, np.where(qs >= 1, self.maximum, result))
+        return result if np.ndim(q) > 0 else float(result[0])
+
+    def __eq__(self, other: object) -> bool:
+        """Sketches are equal if they hold the same values on all levels."""
+        if not isinstance(other, KLLSketch):
+            return False
+        return (
+            self.n == other.n
+            and len(self.levels) == len(other.levels)
+            and all(np.array_equal(a, b) for a, b in zip(self.levels, other.levels))
+        )
+
+    def __repr__(self) -> str:
+        """Show the number of values and the estimated quartiles."""
+        quartiles = ", ".join(f"{value:.4g}" for value in self.quantile([0, 0.25, 0.5, 0.75, 1]))
+        return f"KLLSketch(n={self.n}, quartiles=[{quartiles}])"
@@ -0,0 +1,95 @@
+import threading
+import weakref
+from typing import Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def _lookup(axis: pd.Index, labels: pd.Index) -> np.ndarray:
+    """Positions of all entries of axis that are in labels, in the order of axis."""
+    if axis.is_unique:
+        # The hash table of a unique index is built once by pandas and kept with the index, so only labels are hashed
+        positions = axis.get_indexer(labels.unique())
+        return np.sort(positions[positions >= 0])
+    return np.flatnonzero(axis.isin(labels))
+
+
+class IndexerCache:
+    """Caches the positions of the rows and columns that PipeLogger slices frames to.
+
+    Positions are found by hashing the requested labels and looking them up in the frame's index, instead of
+    intersecting both. They are cached per index, and reused for the same index and its views, e.g. of frames that
+    steps return with assign or a shallow copy (see pandas.Index.is_). Following a few thousand rows through many
+    steps of a large frame then only takes those rows, at most max_size indexers are kept.
+
+    Args:
+        max_size (int): Maximum number of cached indexers, the least recently used ones are dropped first.
+    """
+
+    def __init__(self, max_size: int = 32) -> None:
+        """Init empty cache."""
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: List[Tuple[weakref.ref, Iterable, pd.Index, np.ndarray]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of cached indexers."""
+        return len(self._entries)
+
+    def positions(self, axis: pd.Index, labels: Iterable) -> np.ndarray:
+        """Positions of all entries of axis that are in labels, in the order of axis. Missing labels are ignored.
+
+        Args:
+            axis (pd.Index): Index or columns of a frame.
+            labels (Iterable): Labels to select.
+        """
+        labels_index = None
+        with self._lock:
+            for i, (axis_ref, cached_labels, cached_index, positions) in enumerate(self._entries):
+                cached_axis = axis_ref()
+                if cached_axis is None or not cached_axis.is_(axis):
+                    continue
+                # Lists may have changed in place since they were cached, so only immutable labels match by identity
+                if cached_labels is not labels or not isinstance(labels, (pd.Index, tuple)):
+                    labels_index = pd.Index(labels) if labels_index is None else labels_index
+                    if not labels_index.equals(cached_index):
+                        continue
+                self._entries.append(self._entries.pop(i))
+                self.hits += 1
+                return positions
+
+        labels_index = pd.Index(labels) if labels_index is None else labels_index
+        positions = _lookup(axis, labels_index)
+        positions.setflags(write=False)
+        with self._lock:
+            self.misses += 1
+            # Indexers of indexes that were garbage collected can never be found again
+            self._entries = [entry for entry in self._entries if entry[0]() is not None]
+            self._entries.append((weakref.ref(axis), labels, labels_index, positions))
+            del self._entries[: -self.max_size]
+        return positions
+
+    def slice(self, df: pd.DataFrame, indices: Iterable = None, columns: Iterable = None) -> pd.DataFrame:
+        """Select the rows of df with labels in indices and the columns with labels in columns.
+
+        Same as df.loc[df.index.intersection(indices), df.columns.intersection(columns)], except that rows of
+        duplicate labels keep their order in df. Only selected rows are copied. If all rows are selected, the columns
+        of the result are views of the columns of df.
+        """
+        rows = self.positions(df.index, indices) if indices is not None else None
+        cols = self.positions(df.columns, columns) if columns is not None else None
+        if rows is not None:
+            return df.take(rows) if cols is None else df.iloc[rows, cols]
+        if cols is None or len(cols) == df.shape[1]:
+            # Positions are sorted and unique, so these are all columns in their order
+            return df
+        if len(cols) == 0:
+            return df.iloc[:, cols]
+
+        # Taking columns with iloc copies them, concatenated Series stay views of the columns of df
+        sliced = pd.concat([df.iloc[:, i] for i in cols], axis=1, copy=False)
+        sliced.columns = df.columns[cols]
+        return sliced
@@ -0,0 +1,160 @@
+import threading
+import weakref
+from typing import List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from pipelog.fingerprint import column_values, content_fingerprint, hash_rows
+from pipelog.lazy import LazyValue, materialize
+from pipelog.storage import DiskStore
+
+ArrayLike = Union[np.ndarray, pd.api.extensions.ExtensionArray]
+
+# A changed column is stored as a patch of its previous version, as long as at most this fraction of rows changed.
+_MAX_PATCH_FRACTION = 0.25
+# Numpy kinds that can be compared element wise to find changed rows.
+_PATCHABLE_KINDS = "biufcmM"
+
+
+class ColumnBlock:
+    """Read only values of a single column.
+
+    A block either holds all values of a column, or only the values of the rows that changed with regard to a
+    base block holding all values. Values can also be a LazyValue, e.g. when they were spilled to disk.
+    """
+
+    def __init__(self, values: ArrayLike, base: "ColumnBlock" = None, positions: np.ndarray = None) -> None:
+        """Init from already copied values."""
+        self._values = values
+        self.base = base
+        self.positions = positions
+
+    @property
+    def values(self) -> ArrayLike:
+        """Values held by this block itself."""
+        return materialize(self._values)
+
+    @property
+    def is_lazy(self) -> bool:
+        """Whether the values of this block are only loaded on access."""
+        return isinstance(self._values, LazyValue)
+
+    def spill(self, store: DiskStore) -> None:
+        """Move the values of this block into store, if they are large enough."""
+        if not self.is_lazy:
+            self._values = store.spill(self._values)
+
+    @classmethod
+    def full(cls, values: ArrayLike) -> "ColumnBlock":
+        """Store a read only copy of all values."""
+        values = values.copy()
+        if isinstance(values, np.ndarray):
+            values.setflags(write=False)
+        return cls(values)
+
+    @classmethod
+    def patch(cls, base: "ColumnBlock", values: np.ndarray, positions: np.ndarray) -> "ColumnBlock":
+        """Store only the values at positions, all others are taken from base."""
+        return cls(values[positions], base=base, positions=positions)
+
+    def materialize(self) -> ArrayLike:
+        """Returns all values of the column. Values of full blocks are returned read only and must not be changed."""
+        if self.base is None:
+            return self.values
+        values = self.base.materialize().copy()
+        values[self.positions] = self.values
+        return values
+
+
+class FrameSnapshot(LazyValue):
+    """Copy of a DataFrame made of column blocks, which can be shared with other snapshots."""
+
+    def __init__(self, index: pd.Index, columns: pd.Index, blocks: List[ColumnBlock]) -> None:
+        """Init from index, columns and one block per column."""
+        self.index = index
+        self.columns = columns
+        self.blocks = blocks
+
+    def spill(self, store: DiskStore) -> None:
+        """Move the values of all blocks into store. Blocks shared with other snapshots are only written once."""
+        for block in self.blocks:
+            block.spill(store)
+            if block.base is not None:
+                block.base.spill(store)
+
+    def materialize(self) -> pd.DataFrame:
+        """Rebuild the DataFrame. The result owns its data and can be changed freely."""
+        data = {i: block.materialize() for i, block in enumerate(self.blocks)}
+        df = pd.DataFrame(data, index=self.index, copy=True)
+        df.columns = self.columns
+        return df
+
+
+class SnapshotStore:
+    """Creates delta encoded snapshots of DataFrames.
+
+    Columns are identified by a fingerprint of their content, so a column that didn't change since any earlier
+    snapshot is not copied again, but shared with it. If only a few rows of a column changed since the last
+    snapshot, only those rows are stored. Blocks are forgotten as soon as no snapshot references them anymore.
+    """
+
+    def __init__(self) -> None:
+        """Init empty store."""
+        self._blocks = weakref.WeakValueDictionary()
+        self._last = None
+        self._lock = threading.Lock()
+
+    def snapshot(self, df: pd.DataFrame) -> FrameSnapshot:
+        """Create a snapshot of df, reusing all unchanged blocks of earlier snapshots."""
+        with self._lock:
+            return self._snapshot(df)
+
+    def _snapshot(self, df: pd.DataFrame) -> FrameSnapshot:
+        last = self._last
+        same_index = last is not None and (last.index is df.index or last.index.equals(df.index))
+        index = last.index if same_index else df.index
+        previous_blocks = dict(zip(last.columns, last.blocks)) if same_index else {}
+
+        blocks = []
+        for i, col in enumerate(df.columns):
+            blocks.append(self._column_block(df.iloc[:, i], previous_blocks.get(col)))
+
+        self._last = FrameSnapshot(index, df.columns, blocks)
+        return self._last
+
+    def _column_block(self, series: pd.Series, previous: Optional[ColumnBlock]) -> ColumnBlock:
+        fingerprint = content_fingerprint(series, hash_rows(series))
+        block = self._blocks.get(fingerprint) if fingerprint is not None else None
+        if block is not None:
+            return block
+
+        values = column_values(series)
+        block = self._patch(previous, values) if previous is not None else None
+        block = ColumnBlock.full(values) if block is None else block
+
+        if fingerprint is not None:
+            self._blocks[fingerprint] = block
+        return block
+
+    @staticmethod
+    def _patch(previous: ColumnBlock, values: ArrayLike) -> Optional[ColumnBlock]:
+        """Patch the full block of the previous column version, if only a few rows changed."""
+        base = previous if previous.base is None else previous.base
+        base_values = base.values
+        if (
+            not isinstance(values, np.ndarray)
+            or not isinstance(base_values, np.ndarray)
+            or values.dtype != base_values.dtype
+            or values.dtype.kind not in _PATCHABLE_KINDS
+            or len(values) != len(base_values)
+        ):
+            return None
+
+        changed = values != base_values
+        if values.dtype.kind in "fcmM":
+            changed &= ~(pd.isna(values) & pd.isna(base_values))
+        positions = np.flatnonzero(changed)
+        if len(positions) > _MAX_PATCH_FRACTION * len(values):
+            return None
+        return ColumnBlock.patch(base, values, positions)
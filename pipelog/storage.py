@@ -0,0 +1,153 @@
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import uuid
+import weakref
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from pipelog.lazy import LazyValue
+
+# Numpy kinds that are written as .npy files and memory mapped when loaded. Everything else is pickled.
+_MEMMAP_KINDS = "biufcmM"
+
+
+def nbytes(obj: Any) -> int:
+    """Approximate number of bytes an array or DataFrame holds in memory."""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=False).sum())
+    return int(getattr(obj, "nbytes", 0))
+
+
+class SpilledValue(LazyValue):
+    """Handle of a value that was written to a DiskStore."""
+
+    def __init__(self, store: "DiskStore", key: str) -> None:
+        """Init with the store and the key the value was written with."""
+        self.store = store
+        self.key = key
+
+    def materialize(self) -> Any:
+        """Load the value from the store, or from its in memory cache."""
+        return self.store.get(self.key)
+
+    def __repr__(self) -> str:
+        """Show the key of the spilled value."""
+        return f"SpilledValue({self.key})"
+
+
+class DiskStore:
+    """Keeps arrays and DataFrames in files of a local directory, so they don't need to stay in memory.
+
+    Numeric numpy arrays are stored as .npy files and loaded as read only memory maps, all other values are
+    pickled. Loaded values are kept in a LRU cache holding at most max_cache_bytes. Files are removed once their
+    SpilledValue is garbage collected, e.g. because the log holding it was removed.
+
+    Args:
+        path (str): Directory for the files. A temporary directory, that is removed together with the store,
+            is used if not given.
+        max_cache_bytes (int): Upper bound for the bytes of loaded values that are kept in memory.
+        min_nbytes (int): Values smaller than this are not worth spilling and stay in memory.
+    """
+
+    def __init__(self, path: str = None, max_cache_bytes: int = 2 ** 28, min_nbytes: int = 2 ** 16) -> None:
+        """Init store directory and empty cache."""
+        if path is None:
+            path = tempfile.mkdtemp(prefix="pipelog_")
+            self._finalizer = weakref.finalize(self, shutil.rmtree, path, ignore_errors=True)
+        else:
+            os.makedirs(path, exist_ok=True)
+            self._finalizer = None
+        self.path = path
+        self.max_cache_bytes = max_cache_bytes
+        self.min_nbytes = min_nbytes
+
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of stored values."""
+        return sum(1 for _ in os.scandir(self.path))
+
+    def put(self, value: Any) -> SpilledValue:
+        """Write value to disk and return a handle to load it again.
+
+        The file is removed as soon as the handle is garbage collected.
+        """
+        key = uuid.uuid4().hex
+        if isinstance(value, np.ndarray) and value.dtype.kind in _MEMMAP_KINDS:
+            suffix = ".npy"
+            np.save(self._file(key, suffix), value, allow_pickle=False)
+        else:
+            suffix = ".pkl"
+            with open(self._file(key, suffix), "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        handle = SpilledValue(self, key)
+        weakref.finalize(handle, self._remove, key, suffix)
+        return handle
+
+    def spill(self, value: Any) -> Any:
+        """Returns a handle for values that are large enough to be spilled, all other values as they are."""
+        spillable = (pd.DataFrame, np.ndarray, pd.api.extensions.ExtensionArray)
+        if isinstance(value, spillable) and nbytes(value) >= self.min_nbytes:
+            return self.put(value)
+        return value
+
+    def get(self, key: str) -> Any:
+        """Load the value stored under key."""
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key][0]
+
+        npy_file = self._file(key, ".npy")
+        if os.path.exists(npy_file):
+            value = np.load(npy_file, mmap_mode="r")
+        else:
+            with open(self._file(key, ".pkl"), "rb") as f:
+                value = pickle.load(f)
+        self._add_to_cache(key, value)
+        return value
+
+    def clear_cache(self) -> None:
+        """Drop all loaded values from memory."""
+        with self._lock:
+            self._cache.clear()
+            self._cache_bytes = 0
+
+    def close(self) -> None:
+        """Drop the cache and remove the directory if it was created by this store."""
+        self.clear_cache()
+        if self._finalizer is not None:
+            self._finalizer()
+
+    def _add_to_cache(self, key: str, value: Any) -> None:
+        size = nbytes(value)
+        with self._lock:
+            if key in self._cache:
+                return
+            self._cache[key] = (value, size)
+            self._cache_bytes += size
+            while self._cache_bytes > self.max_cache_bytes and len(self._cache) > 1:
+                _, (_, old_size) = self._cache.popitem(last=False)
+                self._cache_bytes -= old_size
+
+    def _remove(self, key: str, suffix: str) -> None:
+        """Drop the value stored under key from the cache and from disk."""
+        with self._lock:
+            cached = self._cache.pop(key, None)
+            if cached is not None:
+                self._cache_bytes -= cached[1]
+        try:
+            os.remove(self._file(key, suffix))
+        except OSError:  # Already removed together with the directory, or still memory mapped on Windows
+            pass
+
+    def _file(self, key: str, suffix: str) -> str:
+        return os.path.join(self.path, key + suffix)
@@ -0,0 +1,212 @@
+from typing import Any, List
+
+import numpy as np
+import pandas as pd
+
+from pipelog.agg_engine import (
+    _FUSED_DTYPES,
+    FUSED_AGG_FUNCS,
+    align_states,
+    combine_parts,
+    frame_agg_states,
+    fused_column_blocks,
+    required_stats,
+    resolve_func_names,
+)
+
+# How the aggregations of two chunks are combined for columns that are not handled by an AggState.
+_MERGE_FUNCS = {
+    "count": "add",
+    "nans": "add",
+    "notnans": "add",
+    "sum": "add",
+    "min": "min",
+    "max": "max",
+    "approx_nunique": "merge",
+    "approx_quantiles": "merge",
+}
+
+# Sketches are mergeable for all dtypes, so they are computed by pandas for all columns.
+SKETCH_AGG_FUNCS = ("approx_nunique", "approx_quantiles")
+
+
+def common_dtypes(dtypes: pd.Series, other: pd.Series) -> pd.Series:
+    """Dtypes of the concatenation of two frames with the same columns and the given dtypes.
+
+    Columns that are int64 in one and float64 in the other frame become float64, like read_csv infers columns
+    whose later chunks contain missing values. All other columns whose dtypes differ become object.
+    """
+    same = dtypes.values == other.values
+    if same.all():
+        return dtypes
+    common = [
+        dtype if is_same else np.dtype(np.float64 if upcastable else object)
+        for dtype, is_same, upcastable in zip(dtypes.values, same, _upcastable(dtypes, other))
+    ]
+    return pd.Series(common, index=dtypes.index, dtype=object)
+
+
+def _upcastable(dtypes: pd.Series, other: pd.Series) -> List[bool]:
+    """Whether each column is int64 or float64 in both dtypes."""
+    return [a in _FUSED_DTYPES and b in _FUSED_DTYPES for a, b in zip(dtypes.values, other.values)]
+
+
+def _merge_values(how: str, a: List[Any], b: List[Any]) -> List[Any]:
+    """Combine two rows of aggregated values element wise. Missing values mean that pandas failed to aggregate."""
+    if how == "add":
+        return [x + y for x, y in zip(a, b)]
+
+    merged = []
+    for x, y in zip(a, b):
+        if pd.isna(x) or pd.isna(y):
+            merged.append(x if pd.isna(y) else y)
+        elif how == "merge":
+            merged.append(x.merge(y))
+        else:
+            merged.append(min(x, y) if how == "min" else max(x, y))
+    return merged
+
+
+class _PandasPartial:
+    """Aggregations of a subset of columns computed by pandas per chunk, merged with _MERGE_FUNCS."""
+
+    def __init__(self, positions: np.ndarray, func_list: list, func_names: List[str]) -> None:
+        self.positions = positions
+        self.func_list = func_list
+        self.func_names = func_names
+        self.values = None
+
+    def update(self, df: pd.DataFrame) -> None:
+        agg = df.iloc[:, self.positions].agg(func=self.func_list)
+        values = [list(agg.iloc[i]) for i in range(len(self.func_names))]
+        if self.values is None:
+            self.values = values
+        else:
+            self.values = [
+                _merge_values(_MERGE_FUNCS[name], a, b) for name, a, b in zip(self.func_names, self.values, values)
+            ]
+
+    def result(self, columns: pd.Index) -> pd.DataFrame:
+        agg = pd.DataFrame(self.values, index=self.func_names, columns=columns[self.positions], dtype=object)
+        return agg.infer_objects()
+
+
+class ChunkAggregator:
+    """Aggregates a frame that is given as a sequence of row chunks, without concatenating them.
+
+    int64 and float64 columns are aggregated into mergeable AggStates, all other columns with pandas per chunk.
+    The aggregations of the concatenated frame are derived from these partial results, which only works for
+    functions that can be merged: all aggregations of pipelog.agg_engine.FUSED_AGG_FUNCS for int64 and float64
+    columns, count, nans, notnans, sum, min and max for all other columns, and the sketches approx_nunique and
+    approx_quantiles for all columns.
+
+    All chunks need to have the same columns and dtypes, except for columns that are int64 in some and float64
+    in other chunks. These are aggregated as float64 columns, like the concatenated frame.
+
+    Args:
+        func_list (list): Parsed aggregation functions as returned by PipeLogger._parse_agg_func.
+    """
+
+    def __init__(self, func_list: list) -> None:
+        """Init without any aggregated chunk."""
+        self.func_names = resolve_func_names(func_list, allowed=FUSED_AGG_FUNCS + SKETCH_AGG_FUNCS)
+        if self.func_names is None:
+            raise ValueError(f"Only the aggregations {', '.join(_MERGE_FUNCS)}, mean, std and var can be streamed.")
+        self.func_list = func_list
+        self.n_rows = 0
+
+        is_sketch = [name in SKETCH_AGG_FUNCS for name in self.func_names]
+        self._fused_names = [name for name, sketch in zip(self.func_names, is_sketch) if not sketch]
+        self._fused_funcs = [func for func, sketch in zip(func_list, is_sketch) if not sketch]
+        self._sketch_names = [name for name, sketch in zip(self.func_names, is_sketch) if sketch]
+        self._sketch_funcs = [func for func, sketch in zip(func_list, is_sketch) if sketch]
+
+        self._stats = required_stats(self._fused_names)
+        self._template = None
+        self._blocks = None
+        self._states = None
+        self._other_partial = None
+        self._sketch_partial = None
+
+    def update(self, df: pd.DataFrame) -> None:
+        """Add the next chunk."""
+        if self._template is None:
+            self._init_partials(df)
+        elif not df.columns.equals(self._template.columns):
+            raise ValueError("All chunks need to have the same columns as the first one.")
+        elif not df.dtypes.equals(self.dtypes):
+            self._upcast(df.dtypes)
+
+        if len(df) == 0:
+            return
+
+        if self._fused_names:
+            states = align_states(frame_agg_states(df, self._stats), self._blocks)
+            if self._states is None:
+                self._states = states
+            else:
+                self._states = [(pos, state.merge(new)) for (pos, state), (_, new) in zip(self._states, states)]
+        for partial in (self._other_partial, self._sketch_partial):
+            if partial is not None:
+                partial.update(df)
+
+        self.n_rows += len(df)
+
+    @property
+    def dtypes(self) -> pd.Series:
+        """Dtypes of the concatenation of all chunks so far."""
+        return self._template.dtypes
+
+    def _upcast(self, dtypes: pd.Series) -> None:
+        """Aggregate int64 columns as float64 from now on, if they are float64 in dtypes."""
+        changed = self.dtypes.values != dtypes.values
+        if not all(np.array(_upcastable(self.dtypes, dtypes))[changed]):
+            raise ValueError(
+                "All chunks need to have the same dtypes as the first one, except for int64 and float64 columns."
+                f" Got {list(dtypes[changed])} instead of {list(self.dtypes[changed])}."
+            )
+
+        common = common_dtypes(self.dtypes, dtypes)
+        if (common.values == self.dtypes.values).all():
+            return
+        template = pd.DataFrame({i: pd.Series(dtype=dtype) for i, dtype in enumerate(common.values)})
+        template.columns = self._template.columns
+        self._template = template
+        self._blocks, _ = fused_column_blocks(template)
+        if self._states is not None:
+            self._states = align_states(self._states, self._blocks)
+
+    def _init_partials(self, df: pd.DataFrame) -> None:
+        self._template = df.iloc[:0]
+        self._blocks, others = fused_column_blocks(df)
+        if self._fused_names and len(others) > 0:
+            unmergeable = [name for name in self._fused_names if name not in _MERGE_FUNCS]
+            if unmergeable:
+                raise ValueError(
+                    f"The aggregations {unmergeable} can only be streamed for int64 and float64 columns,"
+                    f" not for {list(df.columns[others])}."
+                )
+            self._other_partial = _PandasPartial(others, self._fused_funcs, self._fused_names)
+        if self._sketch_names:
+            self._sketch_partial = _PandasPartial(np.arange(len(df.columns)), self._sketch_funcs, self._sketch_names)
+
+    def result(self) -> pd.DataFrame:
+        """Aggregation of all chunks so far, equal to aggregating their concatenation."""
+        if self.n_rows == 0 or len(self._template.columns) == 0:
+            return self._template.agg(func=self.func_list)
+
+        columns = self._template.columns
+        results = []
+        if self._fused_names:
+            parts, positions = [], []
+            for block_positions, state in self._states:
+                parts.append(state.finalize(self._fused_names))
+                positions.append(block_positions)
+            if self._other_partial is not None:
+                parts.append(self._other_partial.result(columns))
+                positions.append(self._other_partial.positions)
+            results.append(combine_parts(parts, positions, self._fused_names))
+        if self._sketch_partial is not None:
+            results.append(self._sketch_partial.result(columns))
+
+        return pd.concat(results).reindex(self.func_names) if len(results) > 1 else results[0]
@@ -0,0 +1,42 @@
+import pickle
+from typing import Mapping
+
+from pipelog.encoding import decode_value, encode_value
+from pipelog.frame_log import FrameLog, FrameLogCollection
+
+# Increased whenever the layout of dumped logs changes.
+WIRE_VERSION = 1
+
+
+def dumps(logs: Mapping[str, FrameLog], copy: bool = False) -> bytes:
+    """Serialize logs into bytes that can be sent from a worker process to its parent.
+
+    Values that are computed in the background are waited for, and values spilled to a DiskStore are loaded, so
+    the result does not depend on the worker's threads or files. DataFrames are stored as plain arrays without the
+    pickled internals of pandas.
+
+    Args:
+        logs (Mapping[str, FrameLog]): A FrameLogCollection or a slice of it.
+        copy (bool): Whether to include copies of logged frames, which are often much larger than all other values.
+    """
+    entries = []
+    for key, frame_log in logs.items():
+        fields = {}
+        for field in FrameLog._FIELDS:
+            value = getattr(frame_log, field)
+            if value is not None and (copy or field != "copy"):
+                fields[field] = encode_value(value)
+        entries.append((key, fields))
+    return pickle.dumps((WIRE_VERSION, entries), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def loads(data: bytes) -> FrameLogCollection:
+    """Create a FrameLogCollection from bytes created with dumps."""
+    version, entries = pickle.loads(data)
+    if version != WIRE_VERSION:
+        raise ValueError(f"Logs were dumped with wire version {version}, but only version {WIRE_VERSION} is known.")
+
+    logs = FrameLogCollection()
+    for key, fields in entries:
+        logs.append(FrameLog(**{field: decode_value(value) for field, value in fields.items()}), key=key)
+    return logs
@@ -0,0 +1,112 @@
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipelog import PipeLogger, adapters
+from pipelog.adapters import FrameAdapter, register_adapter
+
+_FUNCS = ["count", "nans", "sum", "mean", "min", "max", "std"]
+
+
+@pytest.fixture
+def df_mixed() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "float": [1.5, np.nan, -2.0, 4.0],
+            "int": [1, 2, 3, 4],
+            "bool": [True, False, False, True],
+            "str": ["a", None, "c", "b"],
+        }
+    )
+
+
+class _ColumnsFrame:
+    """Minimal frame of another library, a dict of numpy arrays."""
+
+    def __init__(self, columns: Dict[Hashable, np.ndarray]) -> None:
+        self.columns = columns
+
+
+class _ColumnsAdapter(FrameAdapter):
+    agg_funcs = ("count", "sum")
+
+    def matches(self, frame: Any) -> bool:
+        return isinstance(frame, _ColumnsFrame)
+
+    def shape(self, frame: Any) -> Tuple[int, int]:
+        return len(next(iter(frame.columns.values()))), len(frame.columns)
+
+    def column_names(self, frame: Any) -> List[Hashable]:
+        return list(frame.columns)
+
+    def dtypes(self, frame: Any) -> Dict[Hashable, Any]:
+        return {name: values.dtype for name, values in frame.columns.items()}
+
+    def slice(self, frame: Any, indices: Optional[list], columns: Optional[list]) -> Any:
+        rows = indices if indices is not None else slice(None)
+        return _ColumnsFrame({k: v[rows] for k, v in frame.columns.items() if columns is None or k in columns})
+
+    def aggregate(self, frame: Any, func_names: List[str]) -> pd.DataFrame:
+        funcs = {"count": lambda v: np.count_nonzero(~np.isnan(v)), "sum": np.nansum}
+        return pd.DataFrame({k: [funcs[f](v) for f in func_names] for k, v in frame.columns.items()}, index=func_names)
+
+    def to_pandas(self, frame: Any) -> pd.DataFrame:
+        return pd.DataFrame(frame.columns)
+
+
+def test_registered_adapter(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(adapters, "_ADAPTERS", list(adapters._ADAPTERS))
+    register_adapter(_ColumnsAdapter())
+    frame = _ColumnsFrame({"a": np.array([1.0, np.nan, 3.0]), "b": np.array([1.0, 2.0, 3.0])})
+    tracker = PipeLogger(agg_func=["count", "sum"], dtypes=True, shape=True, column_names=True, copy=True)
+
+    @tracker.track()
+    def _step(frame: _ColumnsFrame) -> _ColumnsFrame:
+        return _ColumnsFrame({"a": frame.columns["a"] * 2})
+
+    _step(frame)
+    tracker.log_frame(frame, key="sliced", indices=[0, 1], columns=["b"])
+    assert list(tracker.logs) == ["_step_#1", "_step_#2", "sliced"]
+    pd.testing.assert_frame_equal(tracker.logs["_step_#1"].agg, tracker.logs["_step_#1"].copy.agg(["count", "sum"]))
+    assert tracker.logs["_step_#2"].shape == (3, 1) and tracker.logs["_step_#2"].column_names == ["a"]
+    assert tracker.logs["sliced"].agg.to_dict() == {"b": {"count": 2, "sum": 3.0}}
+    assert tracker.logs["sliced"].dtypes == {"b": np.dtype(np.float64)}
+
+    with pytest.raises(ValueError):
+        tracker.log_frame(frame, agg_func=["mean"])
+    with pytest.raises(ValueError):
+        tracker.log_frame(frame, sample=2)
+    with pytest.raises(TypeError):
+        tracker.track()(lambda df: df)([1, 2])
+
+
+def test_log_arrow_table(df_mixed: pd.DataFrame) -> None:
+    pa = pytest.importorskip("pyarrow")
+    table = pa.Table.from_pandas(df_mixed, preserve_index=False)
+    tracker = PipeLogger(agg_func=_FUNCS, dtypes=True, shape=True, column_names=True)
+    result = tracker.log_frame(table, return_result=True)
+
+    assert result.shape == df_mixed.shape and result.column_names == list(df_mixed.columns)
+    assert result.dtypes == dict(zip(table.column_names, table.schema.types))
+    numeric = df_mixed[["float", "int", "bool"]]
+    expected = numeric.agg(tracker._parse_agg_func(_FUNCS))
+    pd.testing.assert_frame_equal(result.agg[numeric.columns], expected, check_dtype=False)
+    assert result.agg["str"].tolist()[:2] + result.agg["str"].tolist()[4:6] == [3, 1, "a", "c"]
+    assert result.agg["str"].loc[["sum", "mean", "std"]].isna().all()
+
+
+def test_log_polars_frame(df_mixed: pd.DataFrame) -> None:
+    pl = pytest.importorskip("polars")
+    frame = pl.from_pandas(df_mixed)
+    tracker = PipeLogger(agg_func=_FUNCS, dtypes=True, shape=True, column_names=True)
+    result = tracker.log_frame(frame, return_result=True)
+
+    assert result.shape == df_mixed.shape and result.column_names == list(df_mixed.columns)
+    assert result.dtypes == dict(zip(frame.columns, frame.dtypes))
+    numeric = df_mixed[["float", "int", "bool"]]
+    expected = numeric.agg(tracker._parse_agg_func(_FUNCS))
+    pd.testing.assert_frame_equal(result.agg[numeric.columns], expected, check_dtype=False)
+    assert result.agg["str"].tolist()[:2] + result.agg["str"].tolist()[4:6] == [3, 1, "a", "c"]
+    assert result.agg["str"].loc[["sum", "mean", "std"]].isna().all()
@@ -0,0 +1,62 @@
+import gc
+
+import numpy as np
+import pandas as pd
+
+from pipelog import PipeLogger
+from pipelog.agg_cache import ColumnAggCache
+from pipelog.agg_engine import aggregate
+
+
+def test_unchanged_columns_are_reused() -> None:
+    kwargs = dict(agg_func=["count", "nans", "min"])
+    tracker = PipeLogger(**kwargs, agg_cache=100)
+    expected = PipeLogger(**kwargs)
+    df = pd.DataFrame({"a": np.arange(1_000.0), "b": np.arange(1_000), "c": np.arange(1_000).astype(str)})
+
+    for step in range(3):
+        tracker.log_frame(df)
+        # Aggregating without the cache consolidates the blocks of a frame, which moves its columns
+        expected.log_frame(df.copy())
+        df[f"new_{step}"] = float(step)
+
+    # Each added column is only aggregated in the log after it was added
+    assert tracker._agg_cache.misses == 3 + 1 + 1
+    assert tracker._agg_cache.hits == 3 + 4
+    pd.testing.assert_frame_equal(tracker.logs.agg(), expected.logs.agg())
+
+    # Renamed columns share their buffers, and get their new name. Only the last added column is new.
+    renamed = df.rename(columns={"a": "x"}, copy=False)
+    tracker.log_frame(renamed)
+    pd.testing.assert_frame_equal(tracker.logs[-1].agg, aggregate(renamed, tracker._parse_agg_func(kwargs["agg_func"])))
+    assert tracker._agg_cache.misses == 6
+
+
+def test_changed_and_freed_columns_are_not_reused() -> None:
+    cache = ColumnAggCache(max_size=2)
+    func_list = ["sum", "max"]
+    df = pd.DataFrame({"a": np.arange(100), "b": np.arange(100), "c": np.arange(100)})
+    cache.aggregate(df, func_list)
+    assert len(cache) == 2
+
+    # The first value is always part of the sampled fingerprint
+    df.iloc[0, 2] = 1_000
+    pd.testing.assert_frame_equal(cache.aggregate(df, func_list), aggregate(df, func_list))
+    assert cache.hits == 1
+
+    del df
+    gc.collect()
+    df = pd.DataFrame({"a": np.arange(100), "b": np.arange(100), "c": np.arange(100)})
+    pd.testing.assert_frame_equal(cache.aggregate(df, func_list), aggregate(df, func_list))
+    assert cache.hits == 1
+
+
+def test_columns_pandas_can_not_aggregate() -> None:
+    cache = ColumnAggCache()
+    df = pd.DataFrame({"a": np.arange(10.0), "s": list("abcdefghij")})
+    func_list = ["mean"]
+
+    expected = aggregate(df, func_list)
+    pd.testing.assert_frame_equal(cache.aggregate(df, func_list), expected)
+    df["b"] = 1.0
+    pd.testing.assert_frame_equal(cache.aggregate(df, func_list), aggregate(df, func_list))
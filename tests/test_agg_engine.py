@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipelog import PipeLogger
+from pipelog.agg_engine import AggState, aggregate, group_aggregate, required_stats, resolve_func_names
+
+
+@pytest.fixture
+def df_wide() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n_rows = 10_000
+    df = pd.DataFrame(
+        {
+            "f_1": rng.normal(size=n_rows),
+            "i_1": rng.integers(-100, 100, size=n_rows),
+            "str": rng.choice(["a", "b", None], size=n_rows),
+            "f_2": rng.uniform(size=n_rows),
+            "i_2": rng.integers(0, 5, size=n_rows),
+            "f_nan": np.full(n_rows, np.nan),
+            "i_32": rng.integers(0, 5, size=n_rows).astype(np.int32),
+        }
+    )
+    df.loc[::7, "f_1"] = np.nan
+    return df
+
+
+@pytest.mark.parametrize(
+    "func_list",
+    [
+        ["min", "max"],
+        ["sum"],
+        ["count", "nans", "notnans"],
+        ["mean", "std", "var"],
+        ["nans", "sum", "mean", "max"],
+        ["min", "max", "mean", "nans"],
+    ],
+)
+def test_fused_agg_equals_pandas_agg(tracker: PipeLogger, df_wide: pd.DataFrame, func_list: list) -> None:
+    parsed = tracker._parse_agg_func(func_list)
+    assert resolve_func_names(parsed) == func_list
+
+    numeric = df_wide.drop(columns=["str"])
+    pd.testing.assert_frame_equal(aggregate(numeric, parsed), numeric.agg(parsed))
+
+
+def test_fused_agg_keeps_column_order_of_mixed_frames(tracker: PipeLogger, df_wide: pd.DataFrame) -> None:
+    parsed = tracker._parse_agg_func(["count", "nans", "max"])
+    pd.testing.assert_frame_equal(aggregate(df_wide, parsed), df_wide.agg(parsed))
+
+
+def test_unfusable_funcs_fall_back_to_pandas(tracker: PipeLogger, df_num: pd.DataFrame) -> None:
+    for func in (["median"], [lambda x: x.quantile(0.2)], {"float": ["min"]}):
+        parsed = tracker._parse_agg_func(func)
+        assert resolve_func_names(parsed) is None
+        pd.testing.assert_frame_equal(aggregate(df_num, parsed), df_num.agg(parsed))
+
+
+@pytest.mark.parametrize("by", [["i_2"], ["str", "i_2"]])
+def test_group_agg_equals_agg_of_each_group(tracker: PipeLogger, df_wide: pd.DataFrame, by: list) -> None:
+    parsed = tracker._parse_agg_func(["count", "nans", "sum", "mean", "max", lambda x: x.quantile(0.2)])
+    df = df_wide.drop(columns=["str"] if "str" not in by else [])
+    result = group_aggregate(df, by, parsed)
+
+    # Groups are numbered in order of first occurrence, like the groups of the result
+    codes = df.groupby(by, sort=False, dropna=False).ngroup().to_numpy()
+    assert result.index.get_level_values(0).nunique(dropna=False) == codes.max() + 1
+    for code in range(codes.max() + 1):
+        expected = df[codes == code].drop(columns=by).agg(parsed)
+        actual = result.iloc[code * len(parsed) : (code + 1) * len(parsed)].droplevel(0)
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_agg_state_merge_equals_full_state() -> None:
+    rng = np.random.default_rng(1)
+    values = rng.normal(size=(1_000, 3))
+    values[::3, 0] = np.nan
+    values[:, 2] = np.nan
+    columns = pd.Index(["a", "b", "c"])
+    func_names = ["count", "sum", "mean", "min", "max", "std", "var"]
+    stats = required_stats(func_names)
+
+    merged = AggState.from_values(values[:0], columns, stats)
+    for start, stop in ((0, 10), (10, 400), (400, 401), (401, 1_000)):
+        merged = merged.merge(AggState.from_values(values[start:stop], columns, stats))
+
+    expected = pd.DataFrame(values, columns=columns).agg(func_names)
+    pd.testing.assert_frame_equal(merged.finalize(func_names), expected)
+    assert list(merged.finalize(["nans"]).loc["nans"]) == [334, 0, 1_000]
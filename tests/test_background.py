@@ -0,0 +1,70 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from pipelog import PipeLogger
+
+
+def test_background_logs_equal_blocking_logs(df_all_types: pd.DataFrame) -> None:
+    kwargs = dict(agg_func=["count", "nans"], dtypes=True, shape=True, column_names=True, copy=True)
+    tracker = PipeLogger(**kwargs)
+    tracker_bg = PipeLogger(**kwargs, background=True, max_workers=2)
+
+    for df in (df_all_types, df_all_types.iloc[:2], df_all_types.assign(float=1.0)):
+        tracker.log_frame(df)
+        tracker_bg.log_frame(df)
+
+    for key in tracker.logs:
+        assert tracker_bg.logs[key] == tracker.logs[key]
+    pd.testing.assert_frame_equal(tracker_bg.logs.agg(), tracker.logs.agg())
+    pd.testing.assert_frame_equal(tracker_bg.logs.dtypes(), tracker.logs.dtypes())
+    tracker_bg.close()
+
+
+def test_log_frame_does_not_block(df_num: pd.DataFrame) -> None:
+    release = threading.Event()
+
+    def _blocking_sum(s: pd.Series) -> float:
+        release.wait()
+        return s.sum()
+
+    tracker = PipeLogger(agg_func=[_blocking_sum], shape=True, column_names=True, dtypes=True, background=True)
+    result = tracker.log_frame(df_num, return_result=True)
+
+    # Metadata is available right away, values that are computed in the background are not.
+    assert result.is_pending
+    assert repr(result) == "FrameLog(<pending>)"
+    assert tracker.logs.shape().shape == (1, 2)
+    assert tracker.logs.column_names().shape == (1, 3)
+
+    # Changing the frame's columns does not change the log
+    df_num["float"] = 0.0
+    release.set()
+    assert list(result.agg.loc["_blocking_sum"]) == [6.0, 6.0, 6.0]
+    assert not result.is_pending
+    tracker.close()
+
+
+def test_background_errors_are_raised_on_access(df_num: pd.DataFrame) -> None:
+    def _fail(s: pd.Series) -> float:
+        raise ZeroDivisionError
+
+    tracker = PipeLogger(agg_func=[_fail], background=True)
+    tracker.log_frame(df_num)
+    with pytest.raises(ZeroDivisionError):
+        tracker.logs[0].agg
+    tracker.close()
+
+
+def test_background_tracking(df_num: pd.DataFrame) -> None:
+    tracker = PipeLogger(agg_func="sum", background=True)
+
+    @tracker.track()
+    def _double(df: pd.DataFrame) -> pd.DataFrame:
+        return df * 2
+
+    df_num.pipe(_double)
+    result = tracker.logs.agg()
+    assert list(result.loc[("_double_#2", "sum")]) == [12, 12, 12]
+    tracker.close()
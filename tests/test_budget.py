@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipelog import PipeLogger
+from pipelog.budget import CHEAP, FULL, SAMPLED, SKIPPED, OverheadBudget, frame_work
+
+
+def test_budget_steps_down_and_recovers() -> None:
+    budget = OverheadBudget(0.5)
+    work = frame_work(10_000, 10, sample_rows=100)
+
+    # Levels with unknown cost are tried, so each one is measured once it is needed
+    assert budget.choose(work) == FULL
+    budget.record(FULL, work[FULL], 1.0)
+    assert budget.choose(work) == SAMPLED
+    budget.record(SAMPLED, work[SAMPLED], 0.5)
+    assert budget.choose(work) == CHEAP
+    budget.record(CHEAP, work[CHEAP], 0.5)
+    assert budget.choose(work) == SKIPPED
+    assert budget.spent == 2.0
+
+    # After enough time without logging, the budget allows all values again
+    budget._start -= 10
+    assert budget.allowance() == pytest.approx(3.0, abs=0.1)
+    assert budget.choose(work) == FULL
+
+    with pytest.raises(ValueError):
+        OverheadBudget(0)
+
+
+class _Clock:
+    """Clock that only moves when the test sets it, so logs cost no time."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_logger_marks_fidelity_of_logs() -> None:
+    df = pd.DataFrame(np.random.default_rng(0).normal(size=(2_000, 5)))
+    clock = _Clock()
+    budget = OverheadBudget(0.1, clock=clock)
+    tracker = PipeLogger(agg_func=["count", "sum", "mean"], row_hashes=True, budget=budget, budget_sample=100)
+
+    # Full logs cost 1s, sampled ones 0.1s and cheap ones 0.01s
+    work = frame_work(*df.shape, sample_rows=100)
+    for fidelity, seconds in ((FULL, 1.0), (SAMPLED, 0.1), (CHEAP, 0.01)):
+        budget.record(fidelity, work[fidelity], seconds)
+
+    # The allowance grows with the time spent in the pipeline itself, 1.11s are spent already
+    for now in (0.0, 12.0, 14.0, 30.0):
+        clock.now = now
+        tracker.log_frame(df)
+
+    logs = list(tracker.logs.values())
+    assert [log.fidelity for log in logs] == [SKIPPED, CHEAP, SAMPLED, FULL]
+    assert logs[0].shape is None and logs[0].column_names is None
+    assert logs[1].agg is None and logs[1].shape == df.shape and logs[1].dtypes is not None
+    assert logs[2].sample_size == 100 and logs[2].agg_bounds is not None and logs[2].row_hashes is None
+    assert logs[3].agg is not None and logs[3].sample_size is None and logs[3].row_hashes is not None
+
+    tracker.reset()
+    assert budget.spent == 0 and budget.rate(FULL) is None
+    assert tracker.log_frame(df, return_result=True).fidelity == FULL
+    assert PipeLogger().log_frame(df, return_result=True).fidelity is None
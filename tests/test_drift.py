@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from pipelog import PipeLogger
+from pipelog.drift import AGG, COLUMN_ADDED, COLUMN_REMOVED, DTYPE, LOG_ADDED, LOG_REMOVED, SHAPE, compare
+
+_KWARGS = dict(agg_func=["count", "mean", "max"], dtypes=True, shape=True, column_names=True)
+
+
+def test_compare_runs() -> None:
+    yesterday, today = PipeLogger(**_KWARGS), PipeLogger(**_KWARGS)
+    yesterday.log_frame(pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}), key="load")
+    yesterday.log_frame(pd.DataFrame({"a": [1.5, 2.0], "c": [1, 2]}), key="clean")
+    yesterday.log_frame(pd.DataFrame({"a": [1]}), key="dropped_step")
+    today.log_frame(pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]}), key="load")
+    today.log_frame(pd.DataFrame({"a": [1, 2], "d": [1, 2]}), key="clean")
+    today.log_frame(pd.DataFrame({"a": [1]}), key="new_step")
+
+    changes = compare(yesterday.logs, today.logs)
+    assert changes["score"].is_monotonic_decreasing
+    found = {(row.log_key, row.col_name, row.change, row.stat) for row in changes.itertuples()}
+    assert found == {
+        ("dropped_step", None, LOG_REMOVED, None),
+        ("new_step", None, LOG_ADDED, None),
+        ("clean", "a", DTYPE, None),
+        ("clean", "d", COLUMN_ADDED, None),
+        ("clean", "c", COLUMN_REMOVED, None),
+        ("clean", "a", AGG, "mean"),
+        ("load", "a", AGG, "count"),
+        ("load", "a", AGG, "mean"),
+        ("load", "a", AGG, "max"),
+        ("load", "b", AGG, "count"),
+        ("load", None, SHAPE, "n_rows"),
+    }
+
+    mean = changes[(changes["change"] == AGG) & (changes["stat"] == "mean") & (changes["log_key"] == "load")]
+    assert mean[["a", "b", "delta"]].values.tolist() == [[1.5, 2.0, 0.5]]
+    assert mean["score"].item() == 0.5 / 3.5
+
+    assert len(compare(yesterday.logs, yesterday.logs)) == 0
+    assert set(compare(yesterday.logs, PipeLogger().logs)["change"]) == {LOG_REMOVED}
+
+
+def test_compare_values_that_turned_missing() -> None:
+    yesterday, today = PipeLogger(**_KWARGS), PipeLogger(**_KWARGS)
+    yesterday.log_frame(pd.DataFrame({"a": [1.0, 2.0]}), key="step")
+    today.log_frame(pd.DataFrame({"a": [np.nan, np.nan]}), key="step")
+
+    changes = compare(yesterday.logs, today.logs).set_index("stat")
+    assert changes.loc["mean", "score"] == 1.0 and np.isnan(changes.loc["mean", "b"])
+    assert changes.loc["count", "delta"] == -2
+
+
+def test_compare_logs_without_shapes() -> None:
+    yesterday, today = PipeLogger(agg_func=["mean"]), PipeLogger(agg_func=["mean"])
+    yesterday.log_frame(pd.DataFrame({"a": [1.0, 2.0]}), key="step")
+    today.log_frame(pd.DataFrame({"a": [1.0, 4.0]}), key="step")
+
+    assert list(compare(yesterday.logs, today.logs)["stat"]) == ["mean"]
@@ -1,8 +1,14 @@
+import pickle
+
 import numpy as np
 import pandas as pd
+import pytest
 
 from pipelog import PipeLogger
 from pipelog.frame_log import (
+    FrameLog,
+    FrameLogCollection,
+    FrameLogView,
     _COL_NAME,
     _LOG_KEY,
     _AGG_FUNC_NAME,
@@ -102,3 +108,182 @@ def test_frame_log_collection_column_names(df_num: pd.DataFrame) -> None:
     expected.columns.name = _COL_NAME
 
     pd.testing.assert_frame_equal(result, expected)
+
+
+def test_frame_log_collection_positional_access() -> None:
+    logs = FrameLogCollection()
+    for i in range(10):
+        logs.append(FrameLog(shape=(i, 1)))
+
+    assert logs[3].shape == (3, 1)
+    assert logs[-1].shape == (9, 1)
+    assert logs.position("df_4") == 4
+    with pytest.raises(IndexError):
+        logs[10]
+
+    # Positions follow removed and moved entries
+    del logs["df_0"]
+    logs.pop("df_1")
+    logs.move_to_end("df_2")
+    assert logs[0].shape == (3, 1)
+    assert logs[-1].shape == (2, 1)
+    assert logs.position("df_2") == 7
+
+    logs.append(FrameLog(shape=(10, 1)))
+    assert logs[-1].shape == (10, 1)
+    assert list(logs) == [f"df_{i}" for i in (3, 4, 5, 6, 7, 8, 9, 2, 10)]
+
+
+def test_frame_log_collection_slices_are_views(df_num: pd.DataFrame) -> None:
+    tracker = PipeLogger(shape=True)
+    for _ in range(5):
+        tracker.log_frame(df_num)
+
+    view = tracker.logs[1:4]
+    assert isinstance(view, FrameLogView)
+    assert list(view) == ["df_1", "df_2", "df_3"]
+    assert view[0] is tracker.logs[1]
+    assert view[-1] is tracker.logs["df_3"]
+    assert "df_2" in view and "df_0" not in view and "df_4" not in view
+    with pytest.raises(KeyError):
+        view["df_4"]
+
+    assert list(view[::2]) == ["df_1", "df_3"]
+    assert list(tracker.logs[::-2]) == ["df_4", "df_2", "df_0"]
+    assert dict(view) == {k: tracker.logs[k] for k in ("df_1", "df_2", "df_3")}
+
+    expected = tracker.logs.shape().iloc[1:4]
+    pd.testing.assert_frame_equal(view.shape(), expected)
+
+
+def test_frame_log_collection_sparse_column_names(df_num: pd.DataFrame) -> None:
+    tracker = PipeLogger(column_names=True)
+    tracker.log_frame(df_num, key="one")
+    tracker.log_frame(df_num.drop(columns="int"), key="two")
+    tracker.log_frame(df_num.rename(columns={"float": 0}), key="three")
+
+    result = tracker.logs.column_names(sparse=True)
+    assert all(isinstance(dtype, pd.SparseDtype) for dtype in result.dtypes)
+    assert result.columns.tolist() == ["float", "int", "int_pd", 0]
+
+    expected = tracker.logs.column_names()
+    pd.testing.assert_frame_equal(result.sparse.to_dense(), expected)
+    assert expected.loc["two"].tolist() == [True, False, True, False]
+    assert expected.loc["three"].tolist() == [False, True, True, True]
+
+
+def test_frame_log_collection_views_are_updated_incrementally(df_num: pd.DataFrame) -> None:
+    tracker = PipeLogger(agg_func=["sum", "min"], dtypes=True, shape=True, column_names=True)
+    frames = [df_num, df_num[["int"]], df_num.assign(new=1.0), df_num.iloc[:1], df_num[["int_pd", "float"]]]
+    views = ("agg", "dtypes", "shape", "column_names")
+
+    def _assert_views_equal_rebuilt() -> None:
+        # Slices don't cache their views, so they are built from all entries
+        for view in views:
+            pd.testing.assert_frame_equal(getattr(tracker.logs, view)(), getattr(tracker.logs[:], view)())
+        pd.testing.assert_frame_equal(tracker.logs.agg(agg_func_first=True), tracker.logs[:].agg(agg_func_first=True))
+
+    for df in frames:
+        tracker.log_frame(df)
+        _assert_views_equal_rebuilt()
+
+    # Removing and overwriting entries drops the cached views
+    del tracker.logs["df_2"]
+    _assert_views_equal_rebuilt()
+    tracker.logs["df_0"] = tracker.logs["df_3"]
+    _assert_views_equal_rebuilt()
+
+
+def test_frame_log_collection_views_are_cached(df_num: pd.DataFrame) -> None:
+    tracker = PipeLogger(agg_func="sum", shape=True)
+    tracker.log_frame(df_num)
+    tracker.log_frame(df_num)
+    tracker.logs.agg()
+    first_log = tracker.logs[0]
+    tracker.logs.agg()
+
+    # Cached views are not rebuilt, and appending only builds the view of the new entry
+    first_log._agg = None
+    assert list(tracker.logs.agg().loc["df_0"].loc["sum"]) == [6, 6, 6]
+    tracker.log_frame(df_num * 2)
+    assert list(tracker.logs.agg().loc["df_2"].loc["sum"]) == [12, 12, 12]
+
+    # Changing the result does not change the cache
+    tracker.logs.shape().columns = ["a", "b"]
+    assert list(tracker.logs.shape().columns) == [_N_ROWS, _N_COLS]
+
+
+def test_frame_log_metadata_is_stored_compactly(df_num: pd.DataFrame) -> None:
+    tracker = PipeLogger(dtypes=True, shape=True, column_names=True)
+    for i in range(100):
+        tracker.log_frame(df_num.iloc[:i])
+    tracker.log_frame(df_num[["int", "float"]])
+
+    logs = tracker.logs
+    assert not hasattr(logs[0], "__dict__")
+    # Logs of the same schema share its id instead of holding their own dicts and lists
+    assert len({log._dtypes for log in logs.values()}) == 2
+    assert len({log._column_names for log in logs.values()}) == 2
+    assert logs[0].dtypes == dict(df_num.dtypes)
+    assert logs[-1].column_names == ["int", "float"]
+
+    shapes = logs.shape()
+    assert list(shapes[_N_ROWS]) == [min(i, 3) for i in range(100)] + [3]
+    assert list(logs.dtypes().columns) == list(df_num.columns)
+    assert logs.dtypes().loc["df_100", "int_pd"] is np.nan
+
+    # Pickled logs hold the values, not the ids of the process
+    assert pickle.loads(pickle.dumps(logs[-1])) == logs[-1]
+
+
+def test_agg_view_with_logs_without_agg(df_num: pd.DataFrame) -> None:
+    tracker = PipeLogger(agg_func=["sum"], shape=True)
+    tracker.log_frame(df_num)
+    expected_first = tracker.logs.agg()
+
+    # Extending the cached view with logs without aggregations keeps it as it is
+    tracker.logs.append(FrameLog(shape=(1, 1)))
+    pd.testing.assert_frame_equal(tracker.logs.agg(), expected_first)
+    tracker.log_frame(df_num.assign(new=1))
+    extended = tracker.logs.agg()
+
+    rebuilt = FrameLogCollection(tracker.logs)
+    pd.testing.assert_frame_equal(extended, rebuilt.agg())
+    assert list(extended.index.get_level_values(_LOG_KEY)) == ["df_0", "df_2"]
+    assert FrameLogCollection({"a": FrameLog(shape=(1, 1))}).agg().empty
+
+
+def test_agg_func_first_view_is_extended(df_num: pd.DataFrame) -> None:
+    tracker = PipeLogger(agg_func=["sum", "min"])
+    tracker.log_frame(df_num)
+    tracker.logs.agg(agg_func_first=True)
+    tracker.log_frame(df_num, agg_func=["min", "max", "sum"])
+    tracker.logs.append(FrameLog(shape=(1, 1)))
+    tracker.log_frame(df_num.iloc[:1])
+
+    result = tracker.logs.agg(agg_func_first=True)
+    pd.testing.assert_frame_equal(result, FrameLogCollection(tracker.logs).agg(agg_func_first=True))
+    assert list(result.index) == [
+        ("sum", "df_0"),
+        ("sum", "df_1"),
+        ("sum", "df_3"),
+        ("min", "df_0"),
+        ("min", "df_1"),
+        ("min", "df_3"),
+        ("max", "df_1"),
+    ]
+
+
+def test_agg_func_first_keeps_log_order(df_num: pd.DataFrame) -> None:
+    tracker = PipeLogger(agg_func=["sum", "min"])
+    for _ in range(10):
+        tracker.log_frame(df_num)
+    tracker.logs.agg(agg_func_first=True)
+    for _ in range(10):
+        tracker.log_frame(df_num)
+
+    cached = tracker.logs.agg(agg_func_first=True)
+    cold = FrameLogCollection(tracker.logs).agg(agg_func_first=True)
+    pd.testing.assert_frame_equal(cached, cold)
+    keys = [f"df_{i}" for i in range(20)]
+    assert list(cold.index) == [("sum", k) for k in keys] + [("min", k) for k in keys]
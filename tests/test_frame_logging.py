@@ -3,7 +3,7 @@ import pandas as pd
 import pytest
 
 from pipelog import PipeLogger
-from pipelog.frame_log import FrameLog, _NEW_LOG_KEY
+from pipelog.frame_log import FrameLog, FrameLogCollection, _NEW_LOG_KEY
 
 
 def test_default_attributes(tracker: PipeLogger) -> None:
@@ -159,3 +159,39 @@ def test_log_colums(tracker: PipeLogger, df_all_types: pd.DataFrame) -> None:
     cols = df_all_types.columns[:3]
     result_2 = tracker.log_frame(df_all_types, column_names=True, return_result=True, indices=idx, columns=cols)
     assert result_2.column_names == list(df_all_types.columns)
+
+
+def test_log_agg_per_group(df_num: pd.DataFrame) -> None:
+    df = df_num.assign(tenant=["a", "b", "a"])
+    tracker = PipeLogger(agg_func=["count", "sum"])
+    tracker.log_frame(df, key="all")
+    view = tracker.logs.agg()
+    tracker.log_frame(df, key="tenants", groupby="tenant", columns=["float"])
+
+    # The cached view gets the group level as well, which is None for logs without groups
+    agg = tracker.logs.agg()
+    assert agg.index.names == ["log_key", "group", "agg_func"]
+    pd.testing.assert_frame_equal(agg.loc["all"].droplevel(0), view.loc["all"], check_dtype=False)
+    pd.testing.assert_series_equal(
+        agg.loc["tenants", "float"], pd.Series([2.0, 4.0, 1.0, 2.0], index=agg.loc["tenants"].index, name="float")
+    )
+    assert list(tracker.logs.agg(agg_func_first=True).index.get_level_values("agg_func")) == ["count"] * 3 + ["sum"] * 3
+
+    with pytest.raises(ValueError):
+        tracker.log_frame(df, groupby="tenant", sample=2)
+
+
+@pytest.mark.parametrize("grouped_first", [False, True])
+def test_group_level_of_extended_views(df_num: pd.DataFrame, grouped_first: bool) -> None:
+    df = df_num.assign(shard=[1, 2, 1])
+    tracker = PipeLogger(agg_func=["sum"])
+    tracker.log_frame(df, groupby="shard" if grouped_first else None)
+    tracker.logs.agg()
+    tracker.log_frame(df, groupby="shard")
+    tracker.log_frame(df)
+
+    # Integer groups are neither cast to float by logs without groups, nor by extending the cached view
+    agg = tracker.logs.agg()
+    pd.testing.assert_frame_equal(agg, FrameLogCollection(tracker.logs).agg())
+    assert agg.index.levels[1].dtype == object
+    assert [group for group in agg.index.get_level_values("group") if not pd.isna(group)][-2:] == [1, 2]
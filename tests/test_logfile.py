@@ -0,0 +1,70 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipelog import PipeLogger
+from pipelog.frame_log import FrameLogCollection
+from pipelog.logfile import StoredValue
+
+
+def _assert_same_logs(logs: FrameLogCollection, expected: FrameLogCollection) -> None:
+    assert list(logs) == list(expected)
+    for key in expected:
+        assert logs[key] == expected[key], key
+
+
+def test_save_and_open_log_file(tmp_path: str, df_all_types: pd.DataFrame) -> None:
+    tracker = PipeLogger(agg_func=["count", "max"], dtypes=True, shape=True, column_names=True, copy=True)
+    tracker.log_frame(df_all_types, row_hashes=True)
+    tracker.log_frame(df_all_types.iloc[:2], key="part", sample=1)
+    path = os.path.join(tmp_path, "logs")
+    tracker.logs.save(path)
+
+    # Only the index is read, payloads are read when they are accessed
+    logs = FrameLogCollection.open(path)
+    assert isinstance(logs[0]._agg, StoredValue) and isinstance(logs[0]._copy, StoredValue)
+    assert logs[0].shape == df_all_types.shape
+    _assert_same_logs(logs, tracker.logs)
+    pd.testing.assert_frame_equal(logs.agg(), tracker.logs.agg())
+    pd.testing.assert_frame_equal(logs.dtypes(), tracker.logs.dtypes())
+
+    with pytest.raises(ValueError):
+        logs.save(path)
+    other = os.path.join(tmp_path, "other")
+    os.makedirs(other)
+    with open(os.path.join(other, "index.bin"), "wb") as f:
+        f.write(b"\x00" * 8)
+    with pytest.raises(ValueError):
+        FrameLogCollection.open(other)
+
+
+def test_logger_streams_logs_into_log_file(tmp_path: str, df_num: pd.DataFrame) -> None:
+    path = os.path.join(tmp_path, "logs")
+    tracker = PipeLogger(agg_func=["count", "sum"], shape=True, dtypes=True, background=True, log_file=path)
+
+    @tracker.track()
+    def _step(df: pd.DataFrame) -> pd.DataFrame:
+        return df.assign(new=1)
+
+    df_num.pipe(_step)
+    list(tracker.log_chunks([df_num, df_num], key="chunks", agg_func=["count"]))
+    tracker.log_frame(pd.DataFrame({"a": np.arange(10)}), key="removed")
+    del tracker.logs["removed"]
+    tracker.logs.move_to_end("_step_#1")
+    tracker.wait()
+
+    # Entries are readable while the logger keeps writing
+    _assert_same_logs(FrameLogCollection.open(path), tracker.logs)
+    tracker.log_frame(df_num, key="last")
+    tracker.wait()
+    _assert_same_logs(FrameLogCollection.open(path), tracker.logs)
+
+    # A truncated last record of an interrupted write is ignored
+    with open(os.path.join(path, "index.bin"), "ab") as f:
+        f.write(b"\x40\x00\x00\x00\x00\x00\x00\x00partial")
+    _assert_same_logs(FrameLogCollection.open(path), tracker.logs)
+
+    tracker.reset()
+    assert len(FrameLogCollection.open(path)) == 0
@@ -0,0 +1,81 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipelog import PipeLogger, wire
+from pipelog.frame_log import FrameLogCollection
+from pipelog.merge import combine_agg, merge_logs
+
+_AGG_FUNC = ["count", "nans", "sum", "min", "max", "mean", "std", "var", "approx_nunique"]
+
+
+def _frame(seed: int, n_rows: int = 500) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "float": rng.normal(size=n_rows),
+            "int": rng.integers(0, 100, size=n_rows),
+            "str": rng.choice(["a", "b", "c"], size=n_rows),
+        },
+        index=np.arange(n_rows) + seed * n_rows,
+    )
+    df.loc[df.index[::9], "float"] = np.nan
+    return df
+
+
+def _worker(seed: int) -> bytes:
+    tracker = PipeLogger(agg_func=_AGG_FUNC, shape=True, dtypes=True, column_names=True, row_hashes="content")
+
+    @tracker.track()
+    def _step(df: pd.DataFrame) -> pd.DataFrame:
+        return df[df["int"] > 10]
+
+    _frame(seed).pipe(_step)
+    tracker.log_frame(_frame(seed), key=f"partition_{seed}")
+    return wire.dumps(tracker.logs)
+
+
+def test_wire_format_round_trip(df_all_types: pd.DataFrame) -> None:
+    tracker = PipeLogger(agg_func=["count", "max"], dtypes=True, shape=True, copy=True, row_hashes=True, sample=2)
+    tracker.log_frame(df_all_types)
+    tracker.log_frame(df_all_types.iloc[:2], key="part")
+
+    logs = wire.loads(wire.dumps(tracker.logs, copy=True))
+    assert list(logs) == list(tracker.logs)
+    for key in logs:
+        assert logs[key] == tracker.logs[key]
+
+    assert wire.loads(wire.dumps(tracker.logs))[0].copy is None
+    with pytest.raises(ValueError):
+        wire.loads(wire.pickle.dumps((wire.WIRE_VERSION + 1, [])))
+
+
+def test_merge_worker_logs_from_processes() -> None:
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        dumped = list(executor.map(_worker, [0, 1, 2]))
+
+    logs = merge_logs(FrameLogCollection(), [wire.loads(data) for data in dumped], combine=True)
+    assert list(logs) == ["_step_#1", "_step_#2", "partition_0", "partition_1", "partition_2"]
+
+    # Worker logs of the same key are combined into the log of the concatenated partitions
+    expected = PipeLogger(agg_func=_AGG_FUNC, shape=True, dtypes=True, column_names=True, row_hashes="content")
+    expected.log_frame(pd.concat([_frame(seed) for seed in range(3)]))
+    combined, full = logs["_step_#1"], expected.logs[0]
+    assert combined.shape == full.shape
+    assert combined.row_hashes == full.row_hashes
+    pd.testing.assert_frame_equal(combined.agg.drop("approx_nunique"), full.agg.drop("approx_nunique"))
+    assert combined.agg.loc["approx_nunique"].equals(full.agg.loc["approx_nunique"])
+
+    # Without combining, keys are kept unique in a deterministic order
+    logs = merge_logs(FrameLogCollection(), [wire.loads(data) for data in dumped])
+    assert list(logs)[:4] == ["_step_#1", "_step_#2", "partition_0", "_step_#1@1"]
+
+
+def test_combine_agg_needs_mergeable_functions() -> None:
+    df = _frame(0)
+    a, b = df.agg(["median"]), df.agg(["median"])
+    assert combine_agg(a, b) is None
+    assert combine_agg(df.agg(["mean"]), df.agg(["mean"])) is None
+    assert combine_agg(df.agg(["count", "sum"]), df[["int"]].agg(["count", "sum"])) is None
@@ -0,0 +1,39 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipelog import PipeLogger
+from pipelog.agg_engine import aggregate, parallel_aggregate
+
+
+@pytest.fixture
+def df_wide() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(2_000, 200)), columns=[f"f_{i}" for i in range(200)])
+    df["int"] = rng.integers(0, 10, size=2_000)
+    df["str"] = rng.choice(["a", "b"], size=2_000)
+    return df
+
+
+@pytest.mark.parametrize("func_list", [["count", "mean", "std"], ["count", "median"], ["sum", "min"]])
+def test_parallel_aggregate_equals_aggregate(df_wide: pd.DataFrame, func_list: list) -> None:
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        result = parallel_aggregate(df_wide, func_list, executor, n_chunks=4)
+        # Too narrow frames are aggregated at once
+        narrow = parallel_aggregate(df_wide.iloc[:, :10], func_list, executor, n_chunks=4)
+    pd.testing.assert_frame_equal(result, aggregate(df_wide, func_list))
+    pd.testing.assert_frame_equal(narrow, aggregate(df_wide.iloc[:, :10], func_list))
+
+
+def test_n_jobs_logs_equal_serial_logs(df_wide: pd.DataFrame) -> None:
+    tracker = PipeLogger(agg_func=["nans", "mean", "max"], n_jobs=3, agg_cache=1_000)
+    expected = PipeLogger(agg_func=["nans", "mean", "max"])
+    tracker.log_frame(df_wide)
+    expected.log_frame(df_wide)
+
+    assert tracker._agg_executor is not None
+    pd.testing.assert_frame_equal(tracker.logs.agg(), expected.logs.agg())
+    tracker.close()
+    assert tracker._agg_executor is None
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipelog import PipeLogger
+from pipelog.row_diff import RowHashes, locate
+from pipelog.storage import DiskStore
+
+
+def test_row_diff_of_tracked_function() -> None:
+    df = pd.DataFrame({"a": np.arange(10), "b": list("abcdefghij")}, index=np.arange(10) * 10)
+    tracker = PipeLogger(row_hashes="content")
+
+    @tracker.track()
+    def _filter_and_update(df: pd.DataFrame) -> pd.DataFrame:
+        df = df[df["a"] % 3 != 0].copy()
+        df.loc[[20, 50], "b"] = "z"
+        return pd.concat([df, pd.DataFrame({"a": [100], "b": ["new"]}, index=[1_000])])
+
+    df_out = df.pipe(_filter_and_update)
+    diff = tracker.logs.row_diff("_filter_and_update_#1", "_filter_and_update_#2")
+
+    assert list(locate(df_out.index, diff.added)) == [1_000]
+    assert sorted(locate(df.index, diff.dropped)) == [0, 30, 60, 90]
+    assert sorted(locate(df.index, diff.modified)) == [20, 50]
+
+    # Without content hashes only added and dropped rows are known
+    tracker.log_frame(df, row_hashes=True)
+    assert tracker.logs.row_diff(-1, 1).modified is None
+    assert len(tracker.logs.row_diff(-1, 0).added) == 0
+
+
+def test_row_hashes_are_required_and_spillable(df_num: pd.DataFrame) -> None:
+    tracker = PipeLogger(shape=True)
+    tracker.log_frame(df_num)
+    tracker.log_frame(df_num, row_hashes="index")
+    with pytest.raises(ValueError):
+        tracker.logs.row_diff(0, 1)
+    with pytest.raises(ValueError):
+        tracker.log_frame(df_num, row_hashes="rows")
+
+    store = DiskStore(min_nbytes=0)
+    hashes = RowHashes.from_frame(pd.DataFrame({"a": np.arange(100)}), content=True)
+    expected = RowHashes(hashes.index.copy(), hashes.content.copy())
+    hashes.spill(store)
+    assert len(store) == 2
+    assert hashes == expected
+    assert hashes != RowHashes(expected.index)
+
+    # Unhashable values only skip the content
+    assert RowHashes.from_frame(pd.DataFrame({"a": [[1], [2]]}), content=True).content is None
+
+
+def test_row_diff_with_duplicated_labels() -> None:
+    df = pd.DataFrame({"a": [1, 2, 3, 4]}, index=[0, 0, 1, 2])
+    df_out = pd.concat([df, pd.DataFrame({"a": [5, 6]}, index=[7, 8])])
+    df_out.iloc[1, 0] = 20
+    tracker = PipeLogger(row_hashes="content")
+    tracker.log_frame(df)
+    tracker.log_frame(df_out)
+    tracker.log_frame(df.iloc[1:])
+
+    diff = tracker.logs.row_diff(0, 1)
+    assert sorted(locate(df_out.index, diff.added)) == [7, 8]
+    assert len(diff.dropped) == 0
+    # Duplicated labels are matched in order, so only the second row with label 0 is modified
+    assert list(diff.modified) == list(RowHashes.from_frame(df.iloc[:1]).index)
+
+    diff = tracker.logs.row_diff(0, 2)
+    assert list(locate(df.index, diff.dropped)) == [0, 0] and len(diff.dropped) == 1
+    assert len(diff.added) == 0
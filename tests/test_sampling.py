@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipelog import PipeLogger
+from pipelog.frame_log import _LOWER, _UPPER
+from pipelog.sampling import FixedSizeSampler, FractionSampler, ReservoirSampler, parse_sample
+
+
+@pytest.fixture
+def df_large() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n_rows = 100_000
+    df = pd.DataFrame({"normal": rng.normal(10, 2, size=n_rows), "int": rng.integers(0, 10, size=n_rows)})
+    df.loc[df.index % 4 == 0, "normal"] = np.nan
+    return df
+
+
+def test_parse_sample() -> None:
+    assert parse_sample(None) is None
+    assert isinstance(parse_sample(100), FixedSizeSampler)
+    assert isinstance(parse_sample(0.1), FractionSampler)
+    sampler = ReservoirSampler(10)
+    assert parse_sample(sampler) is sampler
+
+    for invalid in (True, "10"):
+        with pytest.raises(TypeError):
+            parse_sample(invalid)
+    for invalid in (0, 1.5):
+        with pytest.raises(ValueError):
+            parse_sample(invalid)
+
+
+def test_sampled_stats_are_within_bounds(df_large: pd.DataFrame) -> None:
+    sampler = FixedSizeSampler(5_000, random_state=1)
+    tracker = PipeLogger(agg_func=["count", "nans", "sum", "mean", "max"], sample=sampler)
+    result = tracker.log_frame(df_large, shape=True, return_result=True)
+
+    assert result.sample_size == 5_000
+    assert result.shape == df_large.shape
+
+    expected = df_large.agg(tracker._parse_agg_func(["count", "nans", "sum", "mean"]))
+    for name in expected.index:
+        lower = result.agg_bounds.loc[(name, _LOWER)]
+        upper = result.agg_bounds.loc[(name, _UPPER)]
+        assert (lower <= expected.loc[name]).all() and (expected.loc[name] <= upper).all(), name
+        assert (lower <= result.agg.loc[name]).all() and (result.agg.loc[name] <= upper).all(), name
+
+    # Bounds are only logged for statistics that support them
+    assert "max" not in result.agg_bounds.index.get_level_values(0)
+
+
+def test_sampling_all_rows_is_exact(df_num: pd.DataFrame) -> None:
+    tracker = PipeLogger(agg_func=["nans", "sum", "mean"])
+    expected = tracker.log_frame(df_num, return_result=True)
+    result = tracker.log_frame(df_num, sample=1.0, return_result=True)
+
+    assert result.sample_size == len(df_num)
+    pd.testing.assert_frame_equal(result.agg, expected.agg)
+    pd.testing.assert_frame_equal(
+        result.agg_bounds.xs(_LOWER, level=1), result.agg_bounds.xs(_UPPER, level=1), check_names=False
+    )
+
+
+def test_sampled_copy_and_fraction(df_large: pd.DataFrame) -> None:
+    tracker = PipeLogger(sample=0.01, copy=True)
+    result = tracker.log_frame(df_large, return_result=True)
+
+    assert result.sample_size == len(result.copy) == 1_000
+    assert result.copy.index.is_monotonic_increasing
+    pd.testing.assert_frame_equal(result.copy, df_large.loc[result.copy.index])
+
+
+def test_reservoir_sampler_over_chunks(df_large: pd.DataFrame) -> None:
+    sampler = ReservoirSampler(500, random_state=0)
+    for start in range(0, len(df_large), 10_000):
+        reservoir = sampler.update(df_large.iloc[start : start + 10_000])
+
+    assert len(reservoir) == 500
+    assert reservoir.index.is_unique
+
+    # log_chunks keeps the reservoir of all chunks and extrapolates its aggregations
+    tracker = PipeLogger(agg_func=["count", "sum", "median"], copy=True)
+    chunks = (df_large.iloc[start : start + 10_000] for start in range(0, len(df_large), 10_000))
+    list(tracker.log_chunks(chunks, key="stream", sample=sampler))
+    result = tracker.logs["stream"]
+    assert result.sample_size == len(result.copy) == 500
+    assert result.agg.loc["count", "int"] == len(df_large)
+    lower, upper = result.agg_bounds.loc[("sum", _LOWER)], result.agg_bounds.loc[("sum", _UPPER)]
+    assert (lower <= df_large.sum()).all() and (df_large.sum() <= upper).all()
+
+    with pytest.raises(ValueError):
+        tracker.log_chunks([df_large], sample=0.1)
+    # Rows of all chunks should end up in the reservoir
+    assert reservoir.index.min() < 10_000 and reservoir.index.max() >= 90_000
+
+
+def test_sampled_timedelta_columns() -> None:
+    df = pd.DataFrame({"delta": pd.to_timedelta(np.arange(100), unit="s"), "int": np.arange(100)})
+    result = PipeLogger(agg_func=["count", "max"], sample=10).log_frame(df, return_result=True)
+
+    assert result.agg.loc["count", "delta"] == 100
+    assert ("count", _LOWER) in result.agg_bounds.index
+
+
+def test_sampled_sums_of_bools_are_extrapolated() -> None:
+    df = pd.DataFrame({"bool": np.arange(1_000) % 4 == 0, "str": ["a"] * 1_000})
+    tracker = PipeLogger(agg_func=["sum"], sample=FixedSizeSampler(100, random_state=0))
+    result = tracker.log_frame(df, return_result=True)
+
+    assert result.agg.loc["sum", "bool"] > 100
+    lower, upper = result.agg_bounds.loc[("sum", _LOWER), "bool"], result.agg_bounds.loc[("sum", _UPPER), "bool"]
+    assert lower <= 250 <= upper
+    assert pd.isna(result.agg.loc["sum", "str"])
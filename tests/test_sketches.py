@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipelog import PipeLogger
+from pipelog.sketches import HyperLogLog, KLLSketch
+from pipelog.streaming import ChunkAggregator
+
+
+def test_hyper_log_log_estimates_and_merges() -> None:
+    values = pd.Series(np.random.default_rng(0).integers(0, 20_000, size=100_000)).astype(str)
+    values[::10] = None
+    sketch = HyperLogLog.from_values(values)
+
+    assert float(sketch) == pytest.approx(values.nunique(), rel=0.05)
+    assert sketch.registers.nbytes == 2 ** 12
+
+    # Merging is exact, the sketch of two halves equals the sketch of all values
+    merged = HyperLogLog.from_values(values[:30_000]).merge(HyperLogLog.from_values(values[30_000:]))
+    assert merged == sketch
+    assert HyperLogLog.from_values(pd.Series([1, 2, 2, None])).estimate() == pytest.approx(2, abs=0.01)
+
+
+def test_kll_sketch_estimates_and_merges() -> None:
+    values = np.random.default_rng(0).normal(size=100_000)
+    qs = [0.0, 0.01, 0.25, 0.5, 0.75, 0.99, 1.0]
+    sketch = KLLSketch.from_values(values)
+    merged = KLLSketch()
+    for i in range(0, len(values), 7_000):
+        merged = merged.merge(KLLSketch.from_values(values[i : i + 7_000]))
+
+    # Quantiles are compared by their rank, which is what the sketch bounds
+    for estimate in (sketch, merged):
+        assert estimate.n == len(values)
+        assert sum(len(level) for level in estimate.levels) < 3 * estimate.k
+        ranks = np.searchsorted(np.sort(values), estimate.quantile(qs)) / len(values)
+        np.testing.assert_allclose(ranks, qs, atol=0.02)
+    assert sketch.quantile(0) == values.min() and sketch.quantile(1) == values.max()
+    assert np.isnan(KLLSketch().quantile(0.5))
+    with pytest.raises(TypeError):
+        KLLSketch.from_values(pd.Series(["a"]))
+
+
+def test_sketches_as_agg_func(df_all_types: pd.DataFrame) -> None:
+    tracker = PipeLogger(agg_func=["approx_nunique", "approx_quantiles", "count"])
+    tracker.log_frame(df_all_types)
+    agg = tracker.logs[0].agg
+
+    assert list(agg.index) == ["approx_nunique", "approx_quantiles", "count"]
+    assert isinstance(agg.loc["approx_nunique", "str_obj"], HyperLogLog)
+    assert float(agg.loc["approx_nunique", "int"]) == pytest.approx(3, abs=0.01)
+    assert agg.loc["approx_quantiles", "float"].quantile(0.5) == 2
+
+
+def test_streamed_sketches_equal_sketches_of_the_concatenation() -> None:
+    df = pd.DataFrame({"int": np.arange(1_000) % 37, "str": (np.arange(1_000) % 11).astype(str)})
+    func_list = PipeLogger._parse_agg_func(["sum", "approx_nunique", "max"])
+    aggregator = ChunkAggregator(func_list)
+    for i in range(0, len(df), 128):
+        aggregator.update(df.iloc[i : i + 128])
+
+    pd.testing.assert_frame_equal(aggregator.result(), df.agg(func_list))
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipelog import PipeLogger
+from pipelog.slicing import IndexerCache
+
+
+def _loc_slice(df: pd.DataFrame, indices: list, columns: list) -> pd.DataFrame:
+    cols = df.columns.intersection(pd.Index(columns)) if columns is not None else df.columns
+    idx = df.index.intersection(pd.Index(indices)) if indices is not None else df.index
+    return df.loc[idx, cols]
+
+
+@pytest.mark.parametrize(
+    "indices, columns",
+    [([5, 3, 99, 7], None), (None, ["c", "a", "missing"]), ([7, 0, 3], ["b"]), ([], []), (None, ["a", "b", "c"])],
+)
+def test_slice_equals_loc_of_intersection(indices: list, columns: list) -> None:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"a": rng.normal(size=10), "b": np.arange(10), "c": list("abcdefghij")})
+    df.index = rng.permutation(10)
+    pd.testing.assert_frame_equal(IndexerCache().slice(df, indices, columns), _loc_slice(df, indices, columns))
+
+
+def test_indexers_are_reused_for_views_of_the_same_index() -> None:
+    df = pd.DataFrame({"a": np.arange(1000.0), "b": np.arange(1000)}, index=np.arange(1000) * 7)
+    cache = IndexerCache()
+    watch = [70, 7, 140, 1]
+    rows = cache.positions(df.index, watch)
+    assert list(rows) == [1, 10, 20] and (cache.hits, cache.misses) == (0, 1)
+
+    assert cache.positions(df.assign(c=1).index, list(watch)) is rows
+    assert cache.positions(df.copy(deep=False).index, watch) is rows
+    assert cache.hits == 2
+    # Filtered frames have a new index, as do equal indexes that were created separately
+    cache.positions(df[df["a"] > 5].index, watch)
+    cache.positions(pd.Index(df.index.to_numpy()), watch)
+    watch.append(14)
+    assert list(cache.positions(df.index, watch)) == [1, 2, 10, 20]
+    assert cache.misses == 4
+
+    # Selecting columns of all rows doesn't copy them
+    sliced = cache.slice(df, columns=["b"])
+    assert np.shares_memory(sliced["b"].to_numpy(), df["b"].to_numpy())
+
+
+def test_slice_non_unique_index() -> None:
+    df = pd.DataFrame({"a": [1, 2, 3, 4]}, index=["x", "y", "x", "z"])
+    pd.testing.assert_frame_equal(IndexerCache().slice(df, ["x", "z"]), df.iloc[[0, 2, 3]])
+
+
+def test_logger_slices_with_cached_indexers(df_num: pd.DataFrame) -> None:
+    tracker = PipeLogger(indices=[0, 2], columns=["float", "int"], agg_func=["sum"], copy=True)
+    for _ in range(3):
+        tracker.log_frame(df_num)
+    assert tracker._indexers.misses == 2 and tracker._indexers.hits == 4
+    pd.testing.assert_frame_equal(tracker.logs[0].copy, df_num.iloc[[0, 2], :2])
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from pipelog import PipeLogger
+from pipelog.frame_log import FrameLog
+
+
+def test_unchanged_columns_are_shared(tracker: PipeLogger, df_all_types: pd.DataFrame) -> None:
+    tracker.log_frame(df_all_types, copy=True)
+    df_2 = df_all_types.assign(new_col=1.0).drop(columns=["int"])
+    tracker.log_frame(df_2, copy=True)
+
+    snapshot_1, snapshot_2 = tracker.logs[0]._copy, tracker.logs[1]._copy
+    blocks_1 = dict(zip(snapshot_1.columns, snapshot_1.blocks))
+    blocks_2 = dict(zip(snapshot_2.columns, snapshot_2.blocks))
+    for col in df_2.columns.drop("new_col"):
+        assert blocks_1[col] is blocks_2[col], f"Block of unchanged column '{col}' is not shared"
+
+    pd.testing.assert_frame_equal(tracker.logs[0].copy, df_all_types)
+    pd.testing.assert_frame_equal(tracker.logs[1].copy, df_2)
+
+
+def test_changed_rows_are_stored_as_patch(tracker: PipeLogger) -> None:
+    df = pd.DataFrame({"a": np.arange(1_000, dtype=np.float64), "b": pd.date_range("2021", periods=1_000)})
+    df.loc[::10, "a"] = np.nan
+    tracker.log_frame(df, copy=True)
+
+    df_2 = df.copy()
+    df_2.loc[[1, 2, 3], "a"] = -1.0
+    df_2.loc[5, "b"] = pd.NaT
+    tracker.log_frame(df_2, copy=True)
+
+    for block, base in zip(tracker.logs[1]._copy.blocks, tracker.logs[0]._copy.blocks):
+        assert block.base is base
+    assert list(tracker.logs[1]._copy.blocks[0].positions) == [1, 2, 3]
+    assert list(tracker.logs[1]._copy.blocks[1].positions) == [5]
+
+    pd.testing.assert_frame_equal(tracker.logs[0].copy, df)
+    pd.testing.assert_frame_equal(tracker.logs[1].copy, df_2)
+
+
+def test_snapshots_are_independent_of_changes(tracker: PipeLogger, df_num: pd.DataFrame) -> None:
+    expected = df_num.copy()
+    tracker.log_frame(df_num, copy=True)
+
+    df_num.loc[0, "float"] = 100.0
+    result = tracker.logs[0].copy
+    pd.testing.assert_frame_equal(result, expected)
+
+    result.loc[0, "int"] = 100
+    pd.testing.assert_frame_equal(tracker.logs[0].copy, expected)
+
+
+def test_frame_log_with_snapshot_equals_frame_log_with_copy(tracker: PipeLogger, df_num: pd.DataFrame) -> None:
+    result = tracker.log_frame(df_num, copy=True, return_result=True)
+    assert result == FrameLog(copy=df_num.copy())
+    assert repr(result) == "FrameLog(copy=DataFrame(...))"
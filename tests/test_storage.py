@@ -0,0 +1,76 @@
+import gc
+import os
+
+import numpy as np
+import pandas as pd
+
+from pipelog import PipeLogger
+from pipelog.storage import DiskStore, SpilledValue
+
+
+def test_spilled_logs_are_loaded_on_access(tmp_path: str, df_all_types: pd.DataFrame) -> None:
+    store = DiskStore(path=str(tmp_path), min_nbytes=0)
+    tracker = PipeLogger(agg_func=["count", "nans"], copy=True, store=store)
+    expected = PipeLogger(agg_func=["count", "nans"], copy=True)
+
+    for df in (df_all_types, df_all_types.iloc[:2], df_all_types.assign(float=0.0)):
+        tracker.log_frame(df)
+        expected.log_frame(df)
+
+    assert len(os.listdir(tmp_path)) > 0
+    assert all(isinstance(log._agg, SpilledValue) for log in tracker.logs.values())
+    assert all(block.is_lazy for log in tracker.logs.values() for block in log._copy.blocks)
+
+    for key in expected.logs:
+        assert tracker.logs[key] == expected.logs[key]
+    for result, expected_log in zip(tracker.logs[1:].values(), expected.logs[1:].values()):
+        assert result == expected_log
+    pd.testing.assert_frame_equal(tracker.logs.agg(), expected.logs.agg())
+
+
+def test_disk_store_cache_is_bounded() -> None:
+    values = [np.full(1_000, i, dtype=np.int64) for i in range(10)]
+    store = DiskStore(max_cache_bytes=3 * values[0].nbytes, min_nbytes=0)
+    handles = [store.spill(v) for v in values]
+
+    for handle, v in zip(handles, values):
+        np.testing.assert_array_equal(handle.materialize(), v)
+
+    assert len(store) == 10
+    assert len(store._cache) == 3
+    assert store._cache_bytes <= store.max_cache_bytes
+
+    # Recently used values are taken from the cache
+    assert handles[-1].materialize() is handles[-1].materialize()
+
+
+def test_small_values_stay_in_memory_and_temporary_store_is_removed() -> None:
+    store = DiskStore(min_nbytes=1_000)
+    small = pd.DataFrame({"a": [1, 2]})
+    assert store.spill(small) is small
+    assert isinstance(store.spill(pd.DataFrame({"a": np.arange(1_000)})), SpilledValue)
+
+    path = store.path
+    assert os.path.isdir(path)
+    store.close()
+    assert not os.path.exists(path)
+
+
+def test_files_are_removed_with_their_handles(tmp_path: str) -> None:
+    store = DiskStore(path=str(tmp_path), min_nbytes=0)
+    tracker = PipeLogger(agg_func=["count"], store=store, background=True)
+    tracker.log_frame(pd.DataFrame({"a": np.arange(100)}), key="a")
+    tracker.logs["a"].wait()
+    handle = store.spill(np.arange(10))
+    handle.materialize()
+
+    n_files = len(store)
+    assert n_files == 2 and len(store._cache) == 1
+    del handle
+    gc.collect()
+    assert len(store) == n_files - 1
+    assert len(store._cache) == 0 and store._cache_bytes == 0
+
+    del tracker.logs["a"]
+    gc.collect()
+    assert len(store) == 0
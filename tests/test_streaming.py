@@ -0,0 +1,100 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipelog import PipeLogger
+from pipelog.streaming import ChunkAggregator
+
+
+def _chunks(df: pd.DataFrame, size: int) -> list:
+    return [df.iloc[i : i + size] for i in range(0, len(df), size)]
+
+
+def test_chunk_aggregator_equals_aggregating_the_concatenation() -> None:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "float": rng.normal(size=1_000),
+            "int": rng.integers(-100, 100, size=1_000),
+            "int_pd": pd.array(rng.integers(0, 10, size=1_000), dtype="Int64"),
+            "bool": rng.random(1_000) > 0.5,
+        }
+    )
+    df.loc[::7, "float"] = np.nan
+    df.loc[::11, "int_pd"] = pd.NA
+
+    func_list = PipeLogger._parse_agg_func(["count", "nans", "sum", "min", "max"])
+    aggregator = ChunkAggregator(func_list)
+    for chunk in _chunks(df, 99):
+        aggregator.update(chunk)
+    pd.testing.assert_frame_equal(aggregator.result(), df.agg(func_list))
+
+    numeric = df[["float", "int"]]
+    func_list = PipeLogger._parse_agg_func(["mean", "std", "var", "notnans"])
+    aggregator = ChunkAggregator(func_list)
+    for chunk in _chunks(numeric, 99):
+        aggregator.update(chunk)
+    pd.testing.assert_frame_equal(aggregator.result(), numeric.agg(func_list))
+
+
+def test_chunk_aggregator_rejects_unmergeable_input(df_num: pd.DataFrame) -> None:
+    with pytest.raises(ValueError):
+        ChunkAggregator(["median"])
+
+    with pytest.raises(ValueError):
+        ChunkAggregator(["mean"]).update(df_num)
+
+    aggregator = ChunkAggregator(["sum"])
+    aggregator.update(df_num)
+    with pytest.raises(ValueError):
+        aggregator.update(df_num.astype(str))
+    with pytest.raises(ValueError):
+        aggregator.update(df_num.rename(columns={"int": "other"}))
+
+
+def test_log_chunks_equals_logging_the_concatenation(df_num: pd.DataFrame) -> None:
+    df = pd.concat([df_num] * 4, ignore_index=True)
+    kwargs = dict(agg_func=["count", "nans", "sum", "max"], columns=["int", "float"], shape=True, dtypes=True)
+    kwargs.update(column_names=True)
+    tracker = PipeLogger(**kwargs)
+    expected = PipeLogger(**kwargs)
+    expected.log_frame(df, key="stream")
+
+    stream = tracker.log_chunks(_chunks(df, 5), key="stream")
+    assert len(tracker.logs) == 0
+
+    # The log is kept up to date while the chunks are consumed
+    first = next(stream)
+    pd.testing.assert_frame_equal(first, df.iloc[:5])
+    assert tracker.logs["stream"].shape == (5, 3)
+    assert list(tracker.logs.agg().loc[("stream", "count")]) == [5, 5]
+
+    rest = list(stream)
+    assert len(rest) == 2
+    assert tracker.logs["stream"] == expected.logs["stream"]
+    pd.testing.assert_frame_equal(tracker.logs.agg(), expected.logs.agg())
+
+
+def test_log_chunks_upcasts_int_columns_with_missing_values_in_later_chunks() -> None:
+    lines = ["a,b,c"] + [f"{i},{i * 0.5},x{i}" for i in range(10)] + ["10,,x10", ",5.5,x11", "12,6.0,"]
+    text = "\n".join(lines)
+    kwargs = dict(agg_func=["count", "nans", "sum", "min", "max", "mean", "std"], columns=["a", "b"], dtypes=True)
+    tracker = PipeLogger(**kwargs)
+    expected = PipeLogger(**kwargs)
+
+    # The first chunks infer int64 for a, the last ones float64
+    chunks = list(tracker.log_chunks(pd.read_csv(io.StringIO(text), chunksize=5), key="csv"))
+    assert chunks[0]["a"].dtype == np.int64 and chunks[-1]["a"].dtype == np.float64
+    expected.log_frame(pd.read_csv(io.StringIO(text)), key="csv")
+
+    assert tracker.logs["csv"].dtypes == expected.logs["csv"].dtypes
+    pd.testing.assert_frame_equal(tracker.logs.agg(), expected.logs.agg())
+
+    # Chunks of float64 columns that happen to have no missing values are aggregated as float64 as well
+    aggregator = ChunkAggregator(PipeLogger._parse_agg_func(kwargs["agg_func"]))
+    for chunk in reversed(chunks):
+        aggregator.update(chunk[["a", "b"]])
+    concatenated = pd.concat(chunks[::-1])[["a", "b"]]
+    pd.testing.assert_frame_equal(aggregator.result(), concatenated.agg(aggregator.func_list))
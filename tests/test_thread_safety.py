@@ -0,0 +1,155 @@
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
+
+import pandas as pd
+import pytest
+
+from pipelog import PipeLogger
+from pipelog.frame_log import FrameLog, ThreadSafeFrameLogCollection
+
+_N_THREADS = 16
+_N_LOGS = 100
+
+
+@pytest.fixture(autouse=True)
+def _contention() -> Iterator[None]:
+    # Switching threads much more often than by default makes races likely
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def _run_threads(target: Callable[[int], None], n_threads: int = _N_THREADS) -> None:
+    """Run target(i) on n_threads threads, which all start at once."""
+    barrier = threading.Barrier(n_threads)
+    errors = []
+
+    def _start(i: int) -> None:
+        barrier.wait()
+        try:
+            target(i)
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=_start, args=(i,)) for i in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+def test_concurrent_logs_and_reads() -> None:
+    tracker = PipeLogger(agg_func=["max"], shape=True, thread_safe=True)
+    done = threading.Event()
+    n_reads = []
+
+    def _log(thread: int) -> None:
+        for i in range(_N_LOGS):
+            # Every other log has a key of its own, the others get default keys
+            tracker.log_frame(pd.DataFrame({"thread": [thread], "i": [i]}), key=f"{thread}_{i}" if i % 2 else None)
+
+    def _read() -> None:
+        while not done.is_set():
+            n_reads.append(len(tracker.logs.agg()))
+
+    reader = threading.Thread(target=_read)
+    reader.start()
+    _run_threads(_log)
+    done.set()
+    reader.join()
+
+    logs = tracker.logs
+    assert len(logs) == _N_THREADS * _N_LOGS == len(set(logs)) and n_reads == sorted(n_reads)
+    assert sum(key.startswith("df_") for key in logs) == len(logs) // 2
+
+    agg = logs.agg().xs("max", level="agg_func")
+    pd.testing.assert_frame_equal(logs.agg(), logs._build_agg(list(logs)))
+    pd.testing.assert_frame_equal(logs.shape(), logs._build_shape(list(logs)))
+    # The logs of each thread are in the order they were logged
+    for _, thread_agg in agg.groupby("thread", sort=False):
+        assert thread_agg["i"].tolist() == list(range(_N_LOGS))
+        named = thread_agg.index[1::2]
+        assert list(named) == [f"{thread_agg['thread'].iloc[0]}_{i}" for i in range(1, _N_LOGS, 2)]
+
+
+def test_concurrent_appends_of_the_same_key() -> None:
+    logs = ThreadSafeFrameLogCollection()
+    added, collisions = [], []
+
+    def _append(thread: int) -> None:
+        for i in range(_N_LOGS):
+            try:
+                added.append(logs.append(FrameLog(shape=(thread, i)), key=f"key_{i}"))
+            except KeyError:
+                collisions.append(i)
+
+    _run_threads(_append)
+    assert sorted(added) == sorted(f"key_{i}" for i in range(_N_LOGS))
+    assert list(logs) == sorted(added, key=logs.position)
+    assert len(collisions) == (_N_THREADS - 1) * _N_LOGS
+
+    # Default keys skip keys that were given explicitly, removed keys can be used again
+    assert logs.append(FrameLog(), key="df_1") == "df_1"
+    assert logs.append(FrameLog()) not in added + ["df_1"]
+    del logs["key_0"]
+    assert logs.append(FrameLog(), key="key_0") == "key_0"
+
+
+def test_track_on_a_thread_pool(df_num: pd.DataFrame) -> None:
+    tracker = PipeLogger(agg_func=["sum"], dtypes=True, background=True, max_workers=4, thread_safe=True)
+
+    def _make_step(i: int) -> Callable[[pd.DataFrame], pd.DataFrame]:
+        def _step(df: pd.DataFrame) -> pd.DataFrame:
+            return df * 2
+
+        # Each tracked function logs under keys of its own name
+        _step.__name__ = f"step_{i}"
+        return tracker.track()(_step)
+
+    steps = [_make_step(i) for i in range(100)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda step: step(df_num), steps))
+    tracker.wait()
+
+    assert len(tracker.logs) == 200 and len(tracker.logs.dtypes()) == 200
+    sums = tracker.logs.agg().xs("sum", level="agg_func")["float"]
+    for i in range(100):
+        assert (sums[f"step_{i}_#1"], sums[f"step_{i}_#2"]) == (6.0, 12.0)
+        assert tracker.logs.position(f"step_{i}_#1") < tracker.logs.position(f"step_{i}_#2")
+
+
+class _StallingKeys(dict):
+    """Reserved keys of a collection, where reserving the key "slow" waits until released."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.stalled, self.release = threading.Event(), threading.Event()
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        if key == "slow":
+            self.stalled.set()
+            self.release.wait(timeout=10)
+        return super().setdefault(key, default)
+
+
+def test_merge_waits_for_entries_with_lower_sequence_numbers() -> None:
+    logs = ThreadSafeFrameLogCollection()
+    logs._reserved = _StallingKeys()
+    slow = threading.Thread(target=logs.append, args=(FrameLog(),), kwargs={"key": "slow"})
+    slow.start()
+    try:
+        # "slow" took its sequence number first, but is appended after "fast"
+        assert logs._reserved.stalled.wait(timeout=10)
+        logs.append(FrameLog(), key="fast")
+        assert list(logs) == [] and len(logs) == 0
+    finally:
+        logs._reserved.release.set()
+        slow.join()
+    assert list(logs) == ["slow", "fast"]
+    logs.append(FrameLog())
+    assert list(logs) == ["slow", "fast", "df_0"]
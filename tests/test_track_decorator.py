@@ -1,3 +1,8 @@
+import asyncio
+import threading
+import time
+import tracemalloc
+
 from pipelog.pipe_tracker import FrameLog
 import pandas as pd
 import pytest
@@ -42,3 +47,97 @@ def test_decorator_exceptions(tracker: PipeLogger, df_all_types: pd.DataFrame) -
         _func_3(5, df_all_types)
     with pytest.raises(TypeError):
         _func_3(arg_1=5, df=df_all_types)
+
+
+def test_tracking_logs_step_timings(df_num: pd.DataFrame) -> None:
+    tracker = PipeLogger(shape=True)
+
+    @tracker.track()
+    def _sleep(df: pd.DataFrame) -> pd.DataFrame:
+        time.sleep(0.01)
+        return df
+
+    @tracker.track()
+    def _allocate(df: pd.DataFrame) -> pd.DataFrame:
+        return pd.concat([df] * 1000)
+
+    df_num.pipe(_sleep).pipe(_allocate)
+    assert tracker.logs["_sleep_#1"].timing is None
+    assert tracker.logs["_sleep_#2"].timing.wall_time >= 0.01
+    assert tracker.logs["_sleep_#2"].timing.peak_memory is None
+
+    timings = tracker.logs.timings()
+    assert list(timings.index) == ["_sleep_#2", "_allocate_#2"]
+    assert list(timings.columns) == ["wall_time", "cpu_time", "peak_memory"]
+    assert timings["peak_memory"].isna().all()
+    assert timings.loc["_sleep_#2", "wall_time"] > timings.loc["_sleep_#2", "cpu_time"]
+
+    # Peak memory is opt-in, and the cached view is extended with new timings
+    tracker.trace_memory = True
+
+    @tracker.track()
+    def _allocate_traced(df: pd.DataFrame) -> pd.DataFrame:
+        return pd.concat([df] * 1000)
+
+    df_num.pipe(_allocate_traced)
+    timings = tracker.logs.timings()
+    assert len(timings) == 3
+    assert timings.iloc[-1]["peak_memory"] > df_num.memory_usage().sum() * 1000
+    assert not tracemalloc.is_tracing()
+
+
+def test_tracking_coroutine_functions(df_num: pd.DataFrame) -> None:
+    agg_threads = set()
+
+    def _max(df: pd.DataFrame) -> pd.Series:
+        agg_threads.add(threading.get_ident())
+        return df.max()
+
+    tracker = PipeLogger(agg_func=[_max], shape=True)
+
+    @tracker.track()
+    async def _step(df: pd.DataFrame, i: int) -> pd.DataFrame:
+        await asyncio.sleep(0.01)
+        # Changes after the step was called don't show up in the log of its input
+        df.loc[0, "float"] = 100.0
+        return df.assign(step=i)
+
+    async def _run() -> list:
+        # Concurrent calls of the same step log under keys of their own, in the order they started
+        outputs = await asyncio.gather(*(_step(df_num.copy(), i) for i in range(10)))
+        return outputs + [threading.get_ident()]
+
+    *outputs, loop_thread = asyncio.run(_run())
+    assert [df["step"].iloc[0] for df in outputs] == list(range(10))
+    assert len(tracker.logs) == 20 and loop_thread not in agg_threads
+    for i in range(10):
+        df_1, df_2 = tracker.logs[f"_step_#{2 * i + 1}"], tracker.logs[f"_step_#{2 * i + 2}"]
+        assert df_1.agg.loc["_max", "float"] == 3.0 and df_2.agg.loc["_max", "float"] == 100.0
+        assert df_2.shape == (3, 4) and df_2.timing.wall_time >= 0.01 and df_1.timing is None
+
+    @tracker.track()
+    async def _no_frame(df: pd.DataFrame) -> int:
+        return 5
+
+    with pytest.raises(TypeError):
+        asyncio.run(_no_frame(df_num))
+
+
+def test_tracing_memory_of_concurrent_coroutines(df_num: pd.DataFrame) -> None:
+    tracker = PipeLogger(shape=True, trace_memory=True)
+
+    @tracker.track()
+    async def _step(df: pd.DataFrame, delay: float) -> pd.DataFrame:
+        out = pd.concat([df] * 1000)
+        await asyncio.sleep(delay)
+        return out
+
+    async def _run() -> None:
+        # The first call is done while the second one is still traced
+        await asyncio.gather(_step(df_num, 0.01), _step(df_num, 0.05))
+
+    asyncio.run(_run())
+    peaks = tracker.logs.timings()["peak_memory"]
+    assert list(peaks.index) == ["_step_#2", "_step_#4"]
+    assert (peaks > df_num.memory_usage().sum() * 1000).all()
+    assert not tracemalloc.is_tracing()